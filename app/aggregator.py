@@ -0,0 +1,191 @@
+# aggregator.py - Incremental summary statistics over result rows
+import math
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Score thresholds of the export's Confidence_Category column
+HIGH_SCORE = 0.8
+MEDIUM_SCORE = 0.6
+
+
+def confidence_bucket(score: float) -> str:
+    """'High' / 'Medium' / 'Low', the same buckets as the export's Confidence_Category"""
+    return 'High' if score > HIGH_SCORE else 'Medium' if score > MEDIUM_SCORE else 'Low'
+
+
+class ResultAggregator:
+    """
+    Running summary of result rows, updated in O(1) per row
+
+    - counts per sentiment, model, confidence label, confidence bucket and aspect
+    - per-aspect sentiment tallies
+    - running mean / variance of Score (Welford), min, max and high-confidence count
+    - the set of distinct reviews
+
+    summary() and performance_metrics() return what create_ml_summary_stats
+    and calculate_ml_performance_metrics compute from a DataFrame, without
+    looking at the rows again. Counts are identical; the Score mean / std are
+    equal within floating-point rounding (Welford vs pandas), so compare them
+    with math.isclose, not ==.
+    """
+
+    def __init__(self, rows: Optional[Iterable[Dict]] = None):
+        self.total_aspects = 0
+        self.reviews = set()
+        self.columns = set()
+        self.sentiment_counts: Counter = Counter()
+        self.model_counts: Counter = Counter()
+        self.confidence_counts: Counter = Counter()
+        self.confidence_buckets: Counter = Counter()
+        self.aspect_counts: Counter = Counter()
+        self.aspect_sentiments: Dict[str, Counter] = defaultdict(Counter)
+        self.high_confidence_count = 0
+        self.score_count = 0
+        self.score_mean = 0.0
+        self._score_m2 = 0.0
+        self.min_score = math.inf
+        self.max_score = -math.inf
+        if rows is not None:
+            self.add_many(rows)
+
+    def add(self, row: Dict):
+        """Fold one result row into the running statistics"""
+        self.total_aspects += 1
+        self.columns.update(row)
+
+        if 'Review' in row:
+            self.reviews.add(row['Review'])
+        sentiment = row.get('Sentiment')
+        if sentiment is not None:
+            self.sentiment_counts[sentiment] += 1
+        if row.get('ML_Model') is not None:
+            self.model_counts[row['ML_Model']] += 1
+        if row.get('Confidence') is not None:
+            self.confidence_counts[row['Confidence']] += 1
+        aspect = row.get('Aspect')
+        if aspect is not None:
+            self.aspect_counts[aspect] += 1
+            if sentiment is not None:
+                self.aspect_sentiments[aspect][sentiment] += 1
+
+        score = row.get('Score')
+        if score is not None:
+            # Welford's update: numerically stable mean and sum of squared deviations
+            self.score_count += 1
+            delta = score - self.score_mean
+            self.score_mean += delta / self.score_count
+            self._score_m2 += delta * (score - self.score_mean)
+            self.min_score = min(self.min_score, score)
+            self.max_score = max(self.max_score, score)
+            if score > HIGH_SCORE:
+                self.high_confidence_count += 1
+            self.confidence_buckets[confidence_bucket(score)] += 1
+
+    def add_many(self, rows: Iterable[Dict]):
+        for row in rows:
+            self.add(row)
+
+    def merge(self, other: "ResultAggregator"):
+        """Combine another aggregator into this one (e.g. from parallel workers)"""
+        self.total_aspects += other.total_aspects
+        self.reviews |= other.reviews
+        self.columns |= other.columns
+        self.sentiment_counts.update(other.sentiment_counts)
+        self.model_counts.update(other.model_counts)
+        self.confidence_counts.update(other.confidence_counts)
+        self.confidence_buckets.update(other.confidence_buckets)
+        self.aspect_counts.update(other.aspect_counts)
+        for aspect, counts in other.aspect_sentiments.items():
+            self.aspect_sentiments[aspect].update(counts)
+        self.high_confidence_count += other.high_confidence_count
+        self.min_score = min(self.min_score, other.min_score)
+        self.max_score = max(self.max_score, other.max_score)
+
+        # Chan et al. pairwise combination of the Welford states
+        count = self.score_count + other.score_count
+        if count:
+            delta = other.score_mean - self.score_mean
+            self._score_m2 += other._score_m2 + delta * delta * self.score_count * other.score_count / count
+            self.score_mean += delta * other.score_count / count
+        self.score_count = count
+
+    def __len__(self) -> int:
+        return self.total_aspects
+
+    @property
+    def score_std(self) -> float:
+        """Sample standard deviation (ddof=1, like pandas); NaN below two scores"""
+        if self.score_count < 2:
+            return math.nan
+        return math.sqrt(self._score_m2 / (self.score_count - 1))
+
+    @staticmethod
+    def _ranked(counts: Counter) -> Dict:
+        """Counts most common first, ties in first-seen order (like value_counts)"""
+        return dict(counts.most_common())
+
+    def top_aspects(self, n: int = 5) -> List[Tuple[str, int]]:
+        return self.aspect_counts.most_common(n)
+
+    def summary(self) -> Dict:
+        """
+        create_ml_summary_stats over all rows added so far
+        (avg_confidence / confidence_std equal within floating-point rounding)
+        """
+        if not self.total_aspects:
+            return {}
+
+        total = self.total_aspects
+        sentiment_counts = self._ranked(self.sentiment_counts)
+        ml_stats = {}
+        if 'ML_Model' in self.columns:
+            ml_stats['model_usage'] = self._ranked(self.model_counts)
+        if 'Score' in self.columns:
+            ml_stats['avg_confidence'] = self.score_mean if self.score_count else math.nan
+            ml_stats['confidence_std'] = self.score_std
+            ml_stats['high_confidence_count'] = self.high_confidence_count
+        if 'Confidence' in self.columns:
+            ml_stats['confidence_distribution'] = self._ranked(self.confidence_counts)
+
+        return {
+            'total_reviews': len(self.reviews) if 'Review' in self.columns else 0,
+            'total_aspects': total,
+            'sentiment_counts': sentiment_counts,
+            'sentiment_percentages': {
+                sentiment: (count / total) * 100
+                for sentiment, count in sentiment_counts.items()
+            },
+            'ml_statistics': ml_stats
+        }
+
+    def performance_metrics(self) -> Dict:
+        """
+        calculate_ml_performance_metrics over all rows added so far
+        (confidence mean / std equal within floating-point rounding)
+        """
+        if not self.total_aspects:
+            return {}
+
+        metrics = {}
+        if 'Score' in self.columns:
+            metrics['confidence_stats'] = {
+                'mean': float(self.score_mean) if self.score_count else math.nan,
+                'std': float(self.score_std),
+                'min': float(self.min_score) if self.score_count else math.nan,
+                'max': float(self.max_score) if self.score_count else math.nan,
+                'high_confidence_ratio': self.high_confidence_count / self.total_aspects
+            }
+        if 'ML_Model' in self.columns:
+            model_counts = self._ranked(self.model_counts)
+            metrics['model_distribution'] = model_counts
+            metrics['primary_model'] = next(iter(model_counts), None)
+        if 'Sentiment' in self.columns:
+            total = self.total_aspects
+            metrics['sentiment_distribution'] = {
+                sentiment: {
+                    'count': int(count),
+                    'percentage': float((count / total) * 100)
+                }
+                for sentiment, count in self._ranked(self.sentiment_counts).items()
+            }
+        return metrics
@@ -3,13 +3,68 @@ import requests
 import re
 import time
 import random
-from typing import List, Tuple, Optional, Dict
+import asyncio
+import importlib.util
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterator, List, Tuple, Optional, Dict
 from urllib.parse import urlparse, parse_qs, unquote
 import os
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
 import warnings
 warnings.filterwarnings("ignore")
 
+try:
+    from . import patterns
+    from .profiling import profiled
+except ImportError:
+    import patterns
+    from profiling import profiled
+
+# ScraperAPI endpoint (overridable, e.g. to point tests at a local stub server)
+SCRAPERAPI_ENDPOINT = os.getenv('SCRAPERAPI_ENDPOINT', 'http://api.scraperapi.com/')
+
+# How long a key check stays valid before the API is asked again (seconds)
+KEY_STATUS_TTL = float(os.getenv('SCRAPERAPI_KEY_TTL', '600'))
+# Failed checks expire sooner, so a transient error doesn't force demo mode for long
+KEY_FAILURE_TTL = float(os.getenv('SCRAPERAPI_KEY_FAILURE_TTL', '30'))
+
+# Default number of product pages fetched at the same time
+DEFAULT_CONCURRENCY = int(os.getenv('SCRAPER_CONCURRENCY', '8'))
+
+# Reviews Amazon shows per review page, and a hard cap on pages per product
+REVIEWS_PER_PAGE = 10
+MAX_REVIEW_PAGES = int(os.getenv('SCRAPER_MAX_REVIEW_PAGES', '500'))
+
+# Extra attempts for a review page that fails (HTTP error, timeout), and the
+# initial backoff between them (seconds, doubled after each attempt)
+PAGE_RETRIES = int(os.getenv('SCRAPER_PAGE_RETRIES', '2'))
+PAGE_RETRY_BACKOFF = float(os.getenv('SCRAPER_PAGE_RETRY_BACKOFF', '1.0'))
+
+# Review pages in a row that may still fail after their retries before the
+# crawl gives up (the API or the product is down, not one flaky page)
+MAX_FAILED_PAGES = int(os.getenv('SCRAPER_MAX_FAILED_PAGES', '2'))
+
+_session = None
+_session_lock = threading.Lock()
+_key_status_cache: Dict[str, Tuple[float, Tuple[bool, str]]] = {}
+
+class NoReviewsFound(Exception):
+    """The page loaded fine but holds no reviews (e.g. past the last review page)"""
+
+def get_http_session(pool_size: int = DEFAULT_CONCURRENCY) -> requests.Session:
+    """Shared requests session, so connections to ScraperAPI are pooled and reused"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(pool_size, 1))
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
 def get_scraperapi_key():
     """Get API key from environment or Streamlit secrets"""
     try:
@@ -25,7 +80,7 @@ def check_scraperapi_status():
         return "No API key found"
     
     try:
-        response = requests.get(
+        response = get_http_session().get(
             f"http://api.scraperapi.com/account?api_key={api_key}",
             timeout=10
         )
@@ -53,8 +108,8 @@ def test_scraperapi_key() -> Tuple[bool, str]:
             'url': test_url
         }
         
-        response = requests.get(
-            'http://api.scraperapi.com/', 
+        response = get_http_session().get(
+            SCRAPERAPI_ENDPOINT, 
             params=params, 
             timeout=15
         )
@@ -75,6 +130,30 @@ def test_scraperapi_key() -> Tuple[bool, str]:
     except Exception as e:
         return False, f"Unexpected error: {str(e)}"
 
+def get_scraperapi_key_status(ttl: float = None) -> Tuple[bool, str]:
+    """
+    test_scraperapi_key with the result cached for `ttl` seconds
+    - Avoids a full extra HTTP round-trip on every scrape
+    - A failed check is only cached for KEY_FAILURE_TTL seconds (at most `ttl`)
+    """
+    ttl = KEY_STATUS_TTL if ttl is None else ttl
+    api_key = get_scraperapi_key()
+    now = time.monotonic()
+    
+    cached = _key_status_cache.get(api_key)
+    if cached:
+        checked_at, (working, _) = cached
+        if now - checked_at < (ttl if working else min(ttl, KEY_FAILURE_TTL)):
+            return cached[1]
+    
+    status = test_scraperapi_key()
+    _key_status_cache[api_key] = (now, status)
+    return status
+
+def clear_key_status_cache():
+    """Forget cached key checks (e.g. after changing the key)"""
+    _key_status_cache.clear()
+
 def convert_to_review_url(url: str) -> Tuple[str, str]:
     """Convert Amazon product URL to WORKING review URL format"""
     if not url or not isinstance(url, str):
@@ -91,18 +170,8 @@ def convert_to_review_url(url: str) -> Tuple[str, str]:
     # Extract product ID using multiple patterns
     product_id = None
     
-    patterns = [
-        r'/dp/([A-Z0-9]{10})',
-        r'/product/([A-Z0-9]{10})',
-        r'/gp/product/([A-Z0-9]{10})',
-        r'/product-reviews/([A-Z0-9]{10})',
-        r'/([A-Z0-9]{10})(?:/|$)',
-        r'asin=([A-Z0-9]{10})',
-        r'productId=([A-Z0-9]{10})',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url, re.IGNORECASE)
+    for pattern in patterns.PRODUCT_ID_PATTERNS:
+        match = pattern.search(url)
         if match:
             product_id = match.group(1).upper()
             print(f"✅ Found product ID: {product_id}")
@@ -114,7 +183,7 @@ def convert_to_review_url(url: str) -> Tuple[str, str]:
         path_segments = [seg for seg in parsed_url.path.split('/') if seg]
         
         for segment in path_segments:
-            if len(segment) == 10 and re.match(r'^[A-Z0-9]{10}$', segment, re.IGNORECASE):
+            if len(segment) == 10 and patterns.PRODUCT_ID_SEGMENT.match(segment):
                 product_id = segment.upper()
                 print(f"✅ Found product ID in path: {product_id}")
                 break
@@ -142,8 +211,8 @@ def get_reviews_from_amazon(url: str, max_reviews: int = 10) -> List[str]:
     """
     Get reviews from Amazon using the WORKING method
     """
-    # Check if API is available
-    api_working, api_message = test_scraperapi_key()
+    # Check if API is available (cached, not a round-trip per call)
+    api_working, api_message = get_scraperapi_key_status()
     
     if not api_working:
         print(f"🧪 Using demo mode: {api_message}")
@@ -165,8 +234,11 @@ def get_reviews_from_amazon(url: str, max_reviews: int = 10) -> List[str]:
         except ValueError as e:
             return [f"Error: URL conversion failed - {str(e)}"]
         
-        # Use the WORKING scraping method
-        reviews = _scrape_with_working_config(review_url, max_reviews)
+        # Use the WORKING scraping method (paginated when one page is not enough)
+        if max_reviews <= REVIEWS_PER_PAGE:
+            reviews = _scrape_with_working_config(review_url, max_reviews)
+        else:
+            reviews = list(iter_review_pages(review_url, product_id, max_reviews))
         
         if reviews and len(reviews) > 0:
             # Check if we got actual reviews (not error messages)
@@ -183,6 +255,7 @@ def get_reviews_from_amazon(url: str, max_reviews: int = 10) -> List[str]:
         print(f"💥 Error in get_reviews_from_amazon: {str(e)}")
         return [f"Error: {str(e)}"]
 
+@profiled("scrape_with_working_config", size_arg=None)
 def _scrape_with_working_config(review_url: str, max_reviews: int) -> List[str]:
     """Use the PROVEN WORKING configuration"""
     api_key = get_scraperapi_key()
@@ -204,8 +277,8 @@ def _scrape_with_working_config(review_url: str, max_reviews: int) -> List[str]:
     print(f"   Settings: render=true, wait=8000, premium=true")
     
     try:
-        response = requests.get(
-            'http://api.scraperapi.com/',
+        response = get_http_session().get(
+            SCRAPERAPI_ENDPOINT,
             params=params,
             timeout=120  # Allow time for rendering and loading
         )
@@ -220,7 +293,7 @@ def _scrape_with_working_config(review_url: str, max_reviews: int) -> List[str]:
                 return reviews
             else:
                 print("⚠️ No reviews extracted from HTML")
-                raise Exception("Page loaded but no reviews found")
+                raise NoReviewsFound("Page loaded but no reviews found")
         else:
             raise Exception(f"ScraperAPI: HTTP {response.status_code}")
             
@@ -228,39 +301,251 @@ def _scrape_with_working_config(review_url: str, max_reviews: int) -> List[str]:
         print(f"❌ ScraperAPI failed: {str(e)}")
         raise e
 
+def review_page_urls(review_url: str, product_id: str, max_pages: int) -> List[str]:
+    """
+    Review page URLs for a product, in page order
+    Every page, page 1 included, comes from the /product-reviews/ listing on the
+    domain of review_url with one sort order, so pages neither overlap nor skip reviews
+    """
+    netloc = urlparse(review_url).netloc
+    return [
+        f"https://{netloc}/product-reviews/{product_id}/?pageNumber={page}&sortBy=recent"
+        for page in range(1, max_pages + 1)
+    ]
+
+def _fetch_review_page(page_url: str, max_reviews: int,
+                       stop: Optional[threading.Event] = None) -> Optional[List[str]]:
+    """
+    Reviews on one page
+    - An empty list when the page loads but has no reviews
+    - None when the page still fails after PAGE_RETRIES retries, or when `stop`
+      is set while it waits to retry
+    """
+    stop = stop or threading.Event()
+    for attempt in range(PAGE_RETRIES + 1):
+        try:
+            return _scrape_with_working_config(page_url, max_reviews)
+        except NoReviewsFound:
+            return []
+        except Exception as e:
+            print(f"⚠️ Review page failed ({page_url}), attempt {attempt + 1}: {e}")
+            if attempt < PAGE_RETRIES and stop.wait(PAGE_RETRY_BACKOFF * 2 ** attempt):
+                break
+    return None
+
+def iter_review_pages(review_url: str, product_id: str, max_reviews: int,
+                      concurrency: int = DEFAULT_CONCURRENCY,
+                      max_pages: Optional[int] = None) -> Iterator[str]:
+    """
+    Crawl review pages concurrently and stream reviews as each page arrives
+    - Up to `concurrency` pages are in flight; the next page is requested as one finishes
+    - Stops requesting pages after a page that loads without reviews (past the
+      last page) or once max_reviews reviews have been yielded
+    - A page that keeps failing is skipped; after MAX_FAILED_PAGES such pages in a
+      row (as pages finish) the crawl stops with the reviews collected so far
+    - Reviews are de-duplicated across pages by their first 100 characters
+    """
+    if max_pages is None:
+        max_pages = -(-max_reviews // REVIEWS_PER_PAGE) + 1  # one spare page for duplicates
+    max_pages = max(1, min(max_pages, MAX_REVIEW_PAGES))
+    concurrency = max(1, concurrency)
+    get_http_session(pool_size=concurrency)
+    
+    pages = iter(review_page_urls(review_url, product_id, max_pages))
+    seen = set()
+    yielded = 0
+    failed_pages = 0
+    exhausted = False
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="review-pages")
+    stop = threading.Event()  # ends the retries of pages still in flight once the crawl is over
+    in_flight = set()
+    
+    try:
+        for page_url in pages:
+            in_flight.add(executor.submit(_fetch_review_page, page_url, max_reviews, stop))
+            if len(in_flight) >= concurrency:
+                break
+        
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                page_reviews = future.result()
+                if page_reviews is None:
+                    failed_pages += 1
+                    if failed_pages >= MAX_FAILED_PAGES:
+                        print(f"🛑 {failed_pages} review pages in a row failed, "
+                              f"stopping the crawl with {yielded} reviews")
+                        return
+                    page_reviews = []
+                else:
+                    failed_pages = 0
+                    exhausted = exhausted or not page_reviews
+                
+                for review in page_reviews:
+                    key = review[:100]
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    yield review
+                    yielded += 1
+                    if yielded >= max_reviews:
+                        return
+                
+                # Keep the pipeline full until the last page is reached
+                if not exhausted:
+                    next_page = next(pages, None)
+                    if next_page is not None:
+                        in_flight.add(executor.submit(_fetch_review_page, next_page, max_reviews, stop))
+    finally:
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def iter_reviews_from_amazon(url: str, max_reviews: int = 100,
+                             concurrency: int = DEFAULT_CONCURRENCY) -> Iterator[str]:
+    """
+    Streaming version of get_reviews_from_amazon
+    Yields reviews page by page so analysis can start before the crawl finishes
+    """
+    api_working, api_message = get_scraperapi_key_status()
+    
+    if not api_working:
+        print(f"🧪 Using demo mode: {api_message}")
+        yield from get_sample_reviews()[:max_reviews]
+        return
+    
+    review_url, product_id = convert_to_review_url(url)
+    for review in iter_review_pages(review_url, product_id, max_reviews, concurrency=concurrency):
+        if not _is_error_message(review) and len(review) > 50:
+            yield review
+
+async def fetch_reviews_async(urls: List[str], max_reviews: int = 10,
+                              concurrency: int = DEFAULT_CONCURRENCY) -> Dict[str, List[str]]:
+    """
+    Fetch reviews for many product URLs concurrently
+    - The API key is validated once (and cached) before any fetch starts,
+      in a worker thread
+    - At most `concurrency` requests are in flight, over the pooled session
+    
+    Returns:
+        Dict mapping each URL to its reviews, in input order
+    """
+    concurrency = max(1, concurrency)
+    get_http_session(pool_size=concurrency)
+    
+    # The check is a blocking HTTP request: keep it off the event loop
+    loop = asyncio.get_running_loop()
+    api_working, api_message = await loop.run_in_executor(None, get_scraperapi_key_status)
+    if not api_working:
+        print(f"🧪 ScraperAPI unavailable ({api_message}): all {len(urls)} URLs get demo reviews")
+    
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="scraper") as executor:
+        async def fetch(url: str) -> List[str]:
+            async with semaphore:
+                return await loop.run_in_executor(executor, get_reviews_from_amazon, url, max_reviews)
+        
+        unique_urls = list(dict.fromkeys(urls))
+        results = await asyncio.gather(*(fetch(url) for url in unique_urls))
+    
+    return dict(zip(unique_urls, results))
+
+def fetch_reviews_concurrently(urls: List[str], max_reviews: int = 10,
+                               concurrency: int = DEFAULT_CONCURRENCY) -> Dict[str, List[str]]:
+    """Synchronous wrapper around fetch_reviews_async for scripts and batch jobs"""
+    return asyncio.run(fetch_reviews_async(urls, max_reviews=max_reviews, concurrency=concurrency))
+
+def _default_html_parser() -> str:
+    """Fastest installed parser backend: selectolax, then lxml, then the stdlib html.parser"""
+    for module in ('selectolax', 'lxml'):
+        if importlib.util.find_spec(module) is not None:
+            return module
+    return 'html.parser'
+
+# Parser for review pages ('selectolax', 'lxml' or 'html.parser'), overridable for debugging
+HTML_PARSER = os.getenv('SCRAPER_HTML_PARSER') or _default_html_parser()
+
+# Review containers, as SoupStrainer attribute filters; the class attribute is
+# still one string while parsing, so match the class as a whole word
+REVIEW_CONTAINERS = {
+    'review-body': {'data-hook': 'review-body'},
+    'review-text': {'class': re.compile(r'(?:^|\s)review-text(?:\s|$)')},
+}
+
+# ✅ PROVEN WORKING SELECTORS (from our successful test) and the container each lives in
+REVIEW_SELECTORS = [
+    ('[data-hook="review-body"] span', 'review-body'),  # Primary working selector
+    ('[data-hook="review-body"]', 'review-body'),       # Alternative working selector
+    ('.review-text', 'review-text'),                    # Backup working selector
+]
+
+def _review_region(html: str, marker: str) -> str:
+    """
+    The part of the page the review containers can be in
+    Everything before the tag holding the first mention of the marker is skipped
+    (unless that mention sits inside a <script>); '' when the marker never appears
+    """
+    position = html.find(marker)
+    if position < 0:
+        return ''
+    tag_start = html.rfind('<', 0, position)
+    if tag_start < 0 or html.rfind('<script', 0, tag_start) > html.rfind('</script', 0, tag_start):
+        return html
+    return html[tag_start:]
+
+def _iter_review_elements(html: str, parser: Optional[str] = None) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Yield (selector, element texts) for each review selector, in order
+    - selectolax parses the page once in C and runs the selectors on it
+    - BeautifulSoup backends only build the review container subtrees (SoupStrainer),
+      each container kind at most once, and only when the selector is reached
+    """
+    parser = parser or HTML_PARSER
+    
+    if parser == 'selectolax':
+        from selectolax.parser import HTMLParser
+        tree = HTMLParser(html)
+        for selector, _ in REVIEW_SELECTORS:
+            yield selector, [node.text(strip=True) for node in tree.css(selector)]
+        return
+    
+    soups = {}
+    for selector, container in REVIEW_SELECTORS:
+        if container not in soups:
+            region = _review_region(html, container)
+            soups[container] = (
+                BeautifulSoup(region, parser, parse_only=SoupStrainer(attrs=REVIEW_CONTAINERS[container]))
+                if region else None
+            )
+        soup = soups[container]
+        yield selector, [element.get_text(strip=True) for element in soup.select(selector)] if soup else []
+
+@profiled("extract_reviews_from_html")
 def _extract_reviews_from_html(html: str, max_reviews: int) -> List[str]:
     """Extract reviews using the PROVEN WORKING selectors"""
-    soup = BeautifulSoup(html, 'html.parser')
     reviews = []
+    seen = set()
     
-    print("🔍 Extracting reviews with PROVEN working selectors...")
-    
-    # ✅ PROVEN WORKING SELECTORS (from our successful test)
-    working_selectors = [
-        '[data-hook="review-body"] span',  # Primary working selector
-        '[data-hook="review-body"]',       # Alternative working selector  
-        '.review-text',                    # Backup working selector
-    ]
+    print(f"🔍 Extracting reviews with PROVEN working selectors ({HTML_PARSER})...")
     
-    for i, selector in enumerate(working_selectors):
+    for i, (selector, texts) in enumerate(_iter_review_elements(html)):
         if len(reviews) >= max_reviews:
             break
             
-        print(f"🔍 Trying proven selector {i+1}/{len(working_selectors)}: {selector}")
-        review_elements = soup.select(selector)
-        print(f"📊 Found {len(review_elements)} elements")
+        print(f"🔍 Trying proven selector {i+1}/{len(REVIEW_SELECTORS)}: {selector}")
+        print(f"📊 Found {len(texts)} elements")
         
-        for element in review_elements:
+        for review_text in texts:
             if len(reviews) >= max_reviews:
                 break
             
-            review_text = element.get_text(strip=True)
-            
             if review_text and len(review_text) > 50:
                 cleaned_review = _clean_review_text(review_text)
                 if cleaned_review and len(cleaned_review) > 30:
-                    # Avoid duplicates
-                    if not any(cleaned_review[:100] in existing[:100] for existing in reviews):
+                    # Avoid duplicates (same first 100 characters)
+                    key = cleaned_review[:100]
+                    if key not in seen:
+                        seen.add(key)
                         reviews.append(cleaned_review)
                         print(f"✅ Extracted review {len(reviews)}: {cleaned_review[:80]}...")
         
@@ -277,41 +562,13 @@ def _clean_review_text(text: str) -> str:
         return ""
     
     # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = patterns.WHITESPACE.sub(' ', text).strip()
     
     # Remove common Amazon artifacts
-    artifacts = [
-        r'Read more.*$',
-        r'Was this review helpful.*$',
-        r'\d+ people found this helpful',
-        r'Verified Purchase',
-        r'Vine Customer Review',
-        r'Top \d+ Reviewer',
-        r'By .* on .*',
-        r'Color:.*?Size:.*?(?=\s|$)',
-        r'Style:.*?(?=\s|$)',
-        r'Pattern Name:.*?(?=\s|$)',
-        r'Size:.*?(?=\s|$)',
-        r'Color:.*?(?=\s|$)',
-        r'The media could not be loaded.',
-        r'See all photos',
-        r'Videos for this product',
-        r'Click to expand',
-        r'Images in this review',
-        r'Helpful.*Report.*$',
-        r'Report abuse',
-        r'Translate review to English',
-        r'Show more',
-        r'Show less',
-        r'…Read more',
-        r'Read full review',
-    ]
-    
-    for artifact in artifacts:
-        text = re.sub(artifact, '', text, flags=re.IGNORECASE)
+    text = patterns.remove_artifacts(text)
     
     # Remove extra spaces and return
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = patterns.WHITESPACE.sub(' ', text).strip()
     
     return text if len(text) > 20 else ""
 
@@ -1,52 +1,111 @@
 # aspect_extractor.py - Enhanced version (no additional dependencies)
-import re
-from typing import List, Dict
+from bisect import bisect_right
+from typing import List, Dict, NamedTuple, Optional, Set, Tuple
 from collections import Counter
+from functools import lru_cache
 
-def extract_aspects(text: str) -> List[str]:
+try:
+    from . import patterns
+    from .keyword_matcher import KeywordMatcher
+    from .tokenizer import TokenArray, tokenize
+    from .profiling import profiled
+except ImportError:
+    import patterns
+    from keyword_matcher import KeywordMatcher
+    from tokenizer import TokenArray, tokenize
+    from profiling import profiled
+
+# Domain-specific aspects and the keywords that signal them
+DOMAIN_ASPECTS = {
+    # Audio/Electronics - Enhanced
+    'anc': ['anc', 'active noise cancellation', 'noise cancelling', 'noise canceling', 'noise reduction'],
+    'audio quality': ['audio', 'sound quality', 'bass', 'treble', 'audio quality', 'sound', 'music quality'],
+    'connectivity': ['connectivity', 'connection', 'connecting', 'bluetooth', 'wifi', 'wireless', 'pairing'],
+    'compatibility': ['compatible', 'compatibility', 'works with', 'support', 'macbook', 'iphone', 'android'],
+    'battery': ['battery', 'battery life', 'charging', 'power', 'charge'],
+    'build quality': ['build', 'construction', 'material', 'build quality', 'durability', 'solid', 'sturdy'],
+    'design': ['design', 'look', 'appearance', 'aesthetic', 'style', 'color', 'size'],
+    
+    # Service aspects - Enhanced
+    'warranty': ['warranty', 'guarantee', 'coverage', 'expired', 'coverage expired'],
+    'seller': ['seller', 'vendor', 'amazon', 'fake seller', 'refurbished'],
+    'delivery': ['delivery', 'shipping', 'arrived', 'packaging', 'box'],
+    'customer service': ['customer service', 'support', 'help', 'response'],
+    
+    # Quality aspects - Enhanced
+    'value': ['value', 'price', 'money', 'worth', 'cost', 'value for money'],
+    'performance': ['performance', 'speed', 'fast', 'slow', 'working', 'functioning'],
+    'features': ['feature', 'function', 'functionality', 'option', 'settings'],
+    'usability': ['easy to use', 'user friendly', 'interface', 'setup', 'installation']
+}
+
+# Product-specific aspects: (trigger terms, [(aspect, keywords that signal it)])
+PRODUCT_ASPECTS = [
+    # Electronics-specific aspects
+    (('headphone', 'earphone', 'speaker', 'audio', 'music'),
+     [(aspect, (aspect,)) for aspect in ['bass', 'treble', 'volume', 'clarity', 'anc', 'noise', 'comfort']]),
+    
+    # Phone/Device connectivity
+    (('iphone', 'samsung', 'macbook', 'phone', 'laptop'),
+     [(aspect, (aspect,)) for aspect in ['pairing', 'connection', 'compatibility', 'bluetooth']]),
+    
+    # Service-related (Amazon, delivery, etc.) - also matched by 4-letter stem
+    (('amazon', 'seller', 'delivery', 'shipping'),
+     [(aspect, (aspect, aspect[:4])) for aspect in ['authenticity', 'packaging', 'timing', 'condition']]),
+]
+
+# Built once at import: a single pass finds every keyword from both tables
+_KEYWORD_MATCHER = KeywordMatcher(
+    [keyword for keywords in DOMAIN_ASPECTS.values() for keyword in keywords] +
+    [term for triggers, candidates in PRODUCT_ASPECTS
+     for term in list(triggers) + [keyword for _, keywords in candidates for keyword in keywords]]
+)
+
+# Common tech acronyms and terms
+TECH_KEYWORDS = frozenset([
+    'anc', 'bluetooth', 'wifi', 'usb', 'hdmi', 'aux', 'nfc', 'apt-x',
+    'bass', 'treble', 'frequency', 'hz', 'db', 'watts', 'ohm',
+    'led', 'lcd', 'oled', 'amoled', 'retina', 'hd', 'uhd', '4k',
+    'cpu', 'gpu', 'ram', 'storage', 'ssd', 'hdd', 'gb', 'tb',
+    'ios', 'android', 'windows', 'mac', 'linux'
+])
+
+# Words that signal an opinion, and the filters for the words around them
+SENTIMENT_INDICATORS = frozenset([
+    'good', 'bad', 'great', 'terrible', 'excellent', 'poor', 'amazing', 'awful',
+    'love', 'hate', 'disappointed', 'satisfied', 'happy', 'unhappy', 'pleased',
+    'impressed', 'shocked', 'surprised', 'expected', 'unexpected', 'works', 'broken'
+])
+_CONTEXT_STOP_WORDS = frozenset(['this', 'that', 'they', 'very', 'really', 'much', 'with', 'from', 'about', 'when', 'what', 'where', 'which'])
+_ASPECT_HINTS = ('qual', 'serv', 'deliver', 'pack', 'connect', 'batter', 'audio', 'sound', 'price', 'valu', 'design', 'build')
+
+@profiled("extract_aspects")
+def extract_aspects(text: str, tokens: Optional[TokenArray] = None) -> List[str]:
     """
     Enhanced aspect extraction for complex reviews
     Handles technical terms, acronyms, and contextual aspects
+    
+    Pass `tokens` from tokenize(text) to share one tokenization pass with
+    analyze_aspect_sentiment_context.
     """
     if not text or len(text) < 10:
         return []
     
-    text_lower = text.lower()
+    if tokens is None:
+        tokens = tokenize(text)
+    text_lower = tokens.lower
     found_aspects = []
     
-    # 1. ENHANCED DOMAIN-SPECIFIC ASPECTS
-    domain_aspects = {
-        # Audio/Electronics - Enhanced
-        'anc': ['anc', 'active noise cancellation', 'noise cancelling', 'noise canceling', 'noise reduction'],
-        'audio quality': ['audio', 'sound quality', 'bass', 'treble', 'audio quality', 'sound', 'music quality'],
-        'connectivity': ['connectivity', 'connection', 'connecting', 'bluetooth', 'wifi', 'wireless', 'pairing'],
-        'compatibility': ['compatible', 'compatibility', 'works with', 'support', 'macbook', 'iphone', 'android'],
-        'battery': ['battery', 'battery life', 'charging', 'power', 'charge'],
-        'build quality': ['build', 'construction', 'material', 'build quality', 'durability', 'solid', 'sturdy'],
-        'design': ['design', 'look', 'appearance', 'aesthetic', 'style', 'color', 'size'],
-        
-        # Service aspects - Enhanced
-        'warranty': ['warranty', 'guarantee', 'coverage', 'expired', 'coverage expired'],
-        'seller': ['seller', 'vendor', 'amazon', 'fake seller', 'refurbished'],
-        'delivery': ['delivery', 'shipping', 'arrived', 'packaging', 'box'],
-        'customer service': ['customer service', 'support', 'help', 'response'],
-        
-        # Quality aspects - Enhanced
-        'value': ['value', 'price', 'money', 'worth', 'cost', 'value for money'],
-        'performance': ['performance', 'speed', 'fast', 'slow', 'working', 'functioning'],
-        'features': ['feature', 'function', 'functionality', 'option', 'settings'],
-        'usability': ['easy to use', 'user friendly', 'interface', 'setup', 'installation']
-    }
+    # Every domain and product keyword found in one pass over the text
+    found_keywords = _KEYWORD_MATCHER.find(text_lower)
     
-    # Check domain-specific aspects
-    for aspect, keywords in domain_aspects.items():
-        for keyword in keywords:
-            if keyword in text_lower:
-                found_aspects.append(aspect)
-                break
+    # 1. ENHANCED DOMAIN-SPECIFIC ASPECTS
+    for aspect, keywords in DOMAIN_ASPECTS.items():
+        if not found_keywords.isdisjoint(keywords):
+            found_aspects.append(aspect)
     
     # 2. TECHNICAL TERMS AND ACRONYMS
-    technical_aspects = _extract_technical_terms(text_lower)
+    technical_aspects = _extract_technical_terms(tokens)
     found_aspects.extend(technical_aspects)
     
     # 3. PATTERN-BASED EXTRACTION (Enhanced)
@@ -54,11 +113,11 @@ def extract_aspects(text: str) -> List[str]:
     found_aspects.extend(pattern_aspects)
     
     # 4. CONTEXTUAL ASPECT EXTRACTION
-    context_aspects = _extract_context_aspects(text_lower)
+    context_aspects = _extract_context_aspects(tokens)
     found_aspects.extend(context_aspects)
     
     # 5. PRODUCT-SPECIFIC EXTRACTION
-    product_aspects = _extract_product_specific(text_lower)
+    product_aspects = _extract_product_specific(found_keywords)
     found_aspects.extend(product_aspects)
     
     # Clean and deduplicate
@@ -66,131 +125,66 @@ def extract_aspects(text: str) -> List[str]:
     
     return cleaned_aspects[:12]  # Return top 12 most relevant
 
-def _extract_technical_terms(text: str) -> List[str]:
+def _extract_technical_terms(tokens: TokenArray) -> List[str]:
     """Extract technical terms, acronyms, and product features"""
     technical_terms = []
+    is_acronym = patterns.ACRONYM.match
     
-    # Common tech acronyms and terms
-    tech_keywords = [
-        'anc', 'bluetooth', 'wifi', 'usb', 'hdmi', 'aux', 'nfc', 'apt-x',
-        'bass', 'treble', 'frequency', 'hz', 'db', 'watts', 'ohm',
-        'led', 'lcd', 'oled', 'amoled', 'retina', 'hd', 'uhd', '4k',
-        'cpu', 'gpu', 'ram', 'storage', 'ssd', 'hdd', 'gb', 'tb',
-        'ios', 'android', 'windows', 'mac', 'linux'
-    ]
-    
-    words = text.split()
-    for word in words:
-        # Clean word
-        clean_word = re.sub(r'[^\w]', '', word.lower())
-        
+    for word, clean_word in zip(tokens.words, tokens.clean):
         # Check if it's a tech term
-        if clean_word in tech_keywords:
+        if clean_word in TECH_KEYWORDS:
             technical_terms.append(clean_word)
         
         # Check for acronyms (2-5 uppercase letters)
-        if re.match(r'^[A-Z]{2,5}$', word):
+        if is_acronym(word):
             technical_terms.append(word.lower())
     
     return technical_terms
 
 def _extract_pattern_aspects(text: str) -> List[str]:
     """Extract aspects using enhanced linguistic patterns"""
-    patterns = [
-        # "the X is/was Y" pattern
-        (r'the\s+(\w+)\s+(?:is|was|seems|looks|feels)\s+(?:good|bad|great|terrible|excellent|poor|amazing|awful|not|very)', 1),
-        
-        # "X quality/problem/issue" pattern
-        (r'(\w+)\s+(?:quality|problem|issue|trouble|performance|feature)', 1),
-        
-        # "poor/good/bad/excellent X" pattern  
-        (r'(?:poor|good|bad|excellent|great|terrible|amazing|awful|no|zero)\s+(\w+)', 1),
-        
-        # "X is/was not working/functioning" pattern
-        (r'(\w+)\s+(?:is|was)\s+(?:not\s+)?(?:working|functioning|good|bad|terrible|great)', 1),
-        
-        # "no X" or "lack of X" pattern
-        (r'(?:no|lack\s+of|zero|missing)\s+(\w+)', 1),
-        
-        # "X settings/options" pattern
-        (r'(\w+)\s+(?:settings|options|features|functions)', 1),
-        
-        # "connected to X" or "works with X" pattern
-        (r'(?:connected\s+to|works\s+with|compatible\s+with)\s+(\w+)', 1),
-        
-        # Brand/Product patterns
-        (r'(iphone|samsung|macbook|galaxy|note|boat|apple|sony|bose)\s*(\w+)?', 1),
-    ]
-    
     found_aspects = []
     
-    for pattern, group_num in patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
+    for pattern, group_num in patterns.ASPECT_PATTERNS:
+        for match in pattern.finditer(text):
             aspect = match.group(group_num)
             if len(aspect) > 2 and aspect not in {'this', 'that', 'they', 'very', 'really', 'much', 'with', 'from'}:
                 found_aspects.append(aspect.lower())
     
     return found_aspects
 
-def _extract_context_aspects(text: str) -> List[str]:
+def _extract_context_aspects(tokens: TokenArray) -> List[str]:
     """Extract aspects based on sentiment context and nearby words"""
-    sentiment_indicators = [
-        'good', 'bad', 'great', 'terrible', 'excellent', 'poor', 'amazing', 'awful',
-        'love', 'hate', 'disappointed', 'satisfied', 'happy', 'unhappy', 'pleased',
-        'impressed', 'shocked', 'surprised', 'expected', 'unexpected', 'works', 'broken'
-    ]
-    
     found_aspects = []
-    words = text.split()
+    clean = tokens.clean
     
-    for i, word in enumerate(words):
-        clean_word = re.sub(r'[^\w]', '', word.lower())
-        
-        if clean_word in sentiment_indicators:
+    for i, clean_word in enumerate(clean):
+        if clean_word in SENTIMENT_INDICATORS:
             # Look for nouns in the surrounding context (±4 words)
             start = max(0, i - 4)
-            end = min(len(words), i + 5)
-            context_words = words[start:end]
+            end = min(len(clean), i + 5)
             
-            for ctx_word in context_words:
-                clean_ctx = re.sub(r'[^\w]', '', ctx_word.lower())
-                
+            for clean_ctx in clean[start:end]:
                 # Check if it's a potential aspect (filter out common words)
                 if (len(clean_ctx) > 3 and 
-                    clean_ctx not in sentiment_indicators and
-                    clean_ctx not in ['this', 'that', 'they', 'very', 'really', 'much', 'with', 'from', 'about', 'when', 'what', 'where', 'which']):
+                    clean_ctx not in SENTIMENT_INDICATORS and
+                    clean_ctx not in _CONTEXT_STOP_WORDS):
                     
                     # Boost likelihood if it contains aspect-related substrings
-                    if any(indicator in clean_ctx for indicator in 
-                          ['qual', 'serv', 'deliver', 'pack', 'connect', 'batter', 'audio', 'sound', 'price', 'valu', 'design', 'build']):
+                    if any(indicator in clean_ctx for indicator in _ASPECT_HINTS):
                         found_aspects.append(clean_ctx)
     
     return found_aspects
 
-def _extract_product_specific(text: str) -> List[str]:
+def _extract_product_specific(found_keywords: Set[str]) -> List[str]:
     """Extract product-specific aspects based on the review content"""
     product_aspects = []
     
-    # Electronics-specific aspects
-    if any(term in text for term in ['headphone', 'earphone', 'speaker', 'audio', 'music']):
-        audio_aspects = ['bass', 'treble', 'volume', 'clarity', 'anc', 'noise', 'comfort']
-        for aspect in audio_aspects:
-            if aspect in text:
-                product_aspects.append(aspect)
-    
-    # Phone/Device connectivity
-    if any(term in text for term in ['iphone', 'samsung', 'macbook', 'phone', 'laptop']):
-        connectivity_aspects = ['pairing', 'connection', 'compatibility', 'bluetooth']
-        for aspect in connectivity_aspects:
-            if aspect in text:
-                product_aspects.append(aspect)
-    
-    # Service-related (Amazon, delivery, etc.)
-    if any(term in text for term in ['amazon', 'seller', 'delivery', 'shipping']):
-        service_aspects = ['authenticity', 'packaging', 'timing', 'condition']
-        for aspect in service_aspects:
-            if any(keyword in text for keyword in [aspect, f'{aspect[:4]}']):
+    for triggers, candidates in PRODUCT_ASPECTS:
+        if found_keywords.isdisjoint(triggers):
+            continue
+        for aspect, keywords in candidates:
+            if not found_keywords.isdisjoint(keywords):
                 product_aspects.append(aspect)
     
     return product_aspects
@@ -204,7 +198,7 @@ def _clean_and_prioritize(aspects: List[str], original_text: str) -> List[str]:
     cleaned = []
     for aspect in aspects:
         if isinstance(aspect, str):
-            clean_aspect = re.sub(r'[^\w\s]', '', aspect.lower().strip())
+            clean_aspect = patterns.NON_WORD_OR_SPACE.sub('', aspect.lower().strip())
             if len(clean_aspect) > 2:
                 cleaned.append(clean_aspect)
     
@@ -263,89 +257,215 @@ def _clean_and_prioritize(aspects: List[str], original_text: str) -> List[str]:
     
     return [aspect for aspect, score in scored_aspects]
 
+# Business categories and the aspect terms that belong to them, in priority order
+ASPECT_CATEGORIES = {
+    'Audio & Sound': ['anc', 'audio quality', 'bass', 'sound', 'audio', 'noise', 'volume', 'music', 'treble', 'clarity'],
+    'Connectivity': ['connectivity', 'connection', 'bluetooth', 'wireless', 'pairing', 'compatible', 'compatibility', 'wifi', 'usb'],
+    'Build & Design': ['build quality', 'build', 'material', 'durability', 'design', 'size', 'weight', 'comfort', 'construction'],
+    'Performance': ['performance', 'speed', 'functionality', 'reliability', 'battery', 'battery life', 'working', 'functioning'],
+    'Value & Pricing': ['price', 'value', 'value for money', 'money worth', 'good value', 'great value', 'cost', 'expensive', 'worth'],
+    'Service & Support': ['service', 'support', 'customer service', 'customer support', 'seller', 'amazon', 'help', 'response'],
+    'Delivery & Packaging': ['delivery', 'shipping', 'packaging', 'delivery time', 'fast delivery', 'slow delivery', 'box', 'arrived'],
+    'Warranty & Authenticity': ['warranty', 'guarantee', 'coverage', 'expired', 'fake', 'refurbished', 'authentic', 'coverage expired'],
+    'Device Compatibility': ['iphone', 'samsung', 'macbook', 'android', 'ios', 'windows', 'mac', 'galaxy', 'note', 'pro']
+}
+
+_CATEGORY_NAMES = list(ASPECT_CATEGORIES)
+
+# An aspect belongs to the first category with a term that contains it or is
+# contained in it. Terms found inside the aspect come from one matcher pass;
+# "aspect inside a term" is one substring search per category over its terms
+# joined with a separator that never occurs in aspects.
+_CATEGORY_TERM_MATCHER = KeywordMatcher(term for terms in ASPECT_CATEGORIES.values() for term in terms)
+_TERM_CATEGORY_INDEX: Dict[str, int] = {}
+for _index, _terms in enumerate(ASPECT_CATEGORIES.values()):
+    for _term in _terms:
+        _TERM_CATEGORY_INDEX.setdefault(_term, _index)
+_CATEGORY_TERM_TEXT = ['\0'.join(terms) for terms in ASPECT_CATEGORIES.values()]
+
+
+def _category_of(aspect: str) -> str:
+    if '\0' in aspect:
+        # The joined-term shortcut can't be used; apply the rule directly
+        for category, terms in ASPECT_CATEGORIES.items():
+            if any(term in aspect or aspect in term for term in terms):
+                return category
+        return 'Other'
+
+    contained = _CATEGORY_TERM_MATCHER.find(aspect)
+    best = min((_TERM_CATEGORY_INDEX[term] for term in contained), default=len(_CATEGORY_NAMES))
+    for index in range(best):
+        if aspect in _CATEGORY_TERM_TEXT[index]:
+            return _CATEGORY_NAMES[index]
+    return _CATEGORY_NAMES[best] if best < len(_CATEGORY_NAMES) else 'Other'
+
+# Every category term is looked up exactly, without any scanning
+_EXACT_CATEGORIES: Dict[str, str] = {term: _category_of(term) for term in _TERM_CATEGORY_INDEX}
+
+
+@lru_cache(maxsize=65536)
+def get_aspect_category(aspect: str) -> str:
+    """
+    Business category of a single aspect ('Other' when nothing matches)
+    Exact term lookup first, then the precomputed substring index; memoized per aspect
+    """
+    category = _EXACT_CATEGORIES.get(aspect)
+    return category if category is not None else _category_of(aspect)
+
 def get_aspect_categories(aspects: List[str]) -> Dict[str, List[str]]:
     """
     Enhanced categorization with more specific categories
     """
-    categories = {
-        'Audio & Sound': ['anc', 'audio quality', 'bass', 'sound', 'audio', 'noise', 'volume', 'music', 'treble', 'clarity'],
-        'Connectivity': ['connectivity', 'connection', 'bluetooth', 'wireless', 'pairing', 'compatible', 'compatibility', 'wifi', 'usb'],
-        'Build & Design': ['build quality', 'build', 'material', 'durability', 'design', 'size', 'weight', 'comfort', 'construction'],
-        'Performance': ['performance', 'speed', 'functionality', 'reliability', 'battery', 'battery life', 'working', 'functioning'],
-        'Value & Pricing': ['price', 'value', 'value for money', 'money worth', 'good value', 'great value', 'cost', 'expensive', 'worth'],
-        'Service & Support': ['service', 'support', 'customer service', 'customer support', 'seller', 'amazon', 'help', 'response'],
-        'Delivery & Packaging': ['delivery', 'shipping', 'packaging', 'delivery time', 'fast delivery', 'slow delivery', 'box', 'arrived'],
-        'Warranty & Authenticity': ['warranty', 'guarantee', 'coverage', 'expired', 'fake', 'refurbished', 'authentic', 'coverage expired'],
-        'Device Compatibility': ['iphone', 'samsung', 'macbook', 'android', 'ios', 'windows', 'mac', 'galaxy', 'note', 'pro']
-    }
-    
-    categorized = {category: [] for category in categories.keys()}
+    categorized = {category: [] for category in _CATEGORY_NAMES}
     categorized['Other'] = []
     
     for aspect in aspects:
-        found_category = False
-        for category, category_aspects in categories.items():
-            if any(cat_aspect in aspect or aspect in cat_aspect for cat_aspect in category_aspects):
-                categorized[category].append(aspect)
-                found_category = True
-                break
-        
-        if not found_category:
-            categorized['Other'].append(aspect)
+        categorized[get_aspect_category(aspect)].append(aspect)
     
     # Remove empty categories
     return {k: v for k, v in categorized.items() if v}
 
-def analyze_aspect_sentiment_context(text: str, aspect: str) -> str:
+class AspectContext(NamedTuple):
+    """Context text for an aspect and its character span in the review"""
+    text: str
+    start: int
+    end: int
+
+class AspectContextIndex:
+    """
+    Per-review index from aspect keywords to the sentences that mention them
+    
+    Built in a single pass over the review, after which the context of every
+    aspect is a lookup instead of a re-split and rescan of the text.
+    """
+    
+    def __init__(self, text: str, aspects: List[str], tokens: Optional[TokenArray] = None):
+        self.text = text
+        self.tokens = tokens if tokens is not None else tokenize(text)
+        self._sentence_ids: Dict[str, List[int]] = {}
+        
+        keywords = {keyword for aspect in aspects for keyword in _get_aspect_keywords(aspect)}
+        if self.tokens.aligned:
+            self._index_keywords(keywords)
+        else:
+            # Lowercasing changed the text length, so offsets into the lowercased
+            # text do not line up with sentences; test each sentence instead
+            self._scan_sentences(keywords)
+    
+    def _index_keywords(self, keywords: Set[str]):
+        """Locate every keyword occurrence once and map it to its sentence"""
+        lower = self.tokens.lower
+        positions = _CONTEXT_MATCHER.find_positions(lower)
+        
+        # Aspects outside the static keyword table are located with str.find
+        for keyword in keywords - set(positions):
+            if keyword in _CONTEXT_MATCHER or patterns.SENTENCE_SPLIT.search(keyword):
+                continue  # not in the review, or can never fit inside one sentence
+            if not keyword:
+                positions[keyword] = [start for start, _ in self.tokens.sentence_spans]
+                continue
+            found = []
+            start = lower.find(keyword)
+            while start != -1:
+                found.append(start)
+                start = lower.find(keyword, start + 1)
+            if found:
+                positions[keyword] = found
+        
+        sentence_starts = [start for start, _ in self.tokens.sentence_spans]
+        for keyword in keywords:
+            if keyword in positions:
+                self._sentence_ids[keyword] = sorted({
+                    bisect_right(sentence_starts, start) - 1 for start in positions[keyword]
+                })
+    
+    def _scan_sentences(self, keywords: Set[str]):
+        """Fallback: test every keyword against every lowercased sentence"""
+        for sentence_id, sentence in enumerate(self.tokens.sentences()):
+            sentence_lower = sentence.lower()
+            for keyword in keywords:
+                if keyword in sentence_lower:
+                    self._sentence_ids.setdefault(keyword, []).append(sentence_id)
+    
+    def lookup(self, aspect: str) -> AspectContext:
+        """Context for an aspect with its (start, end) character span in the review"""
+        text = self.text
+        sentence_ids = set()
+        for keyword in _get_aspect_keywords(aspect):
+            sentence_ids.update(self._sentence_ids.get(keyword, ()))
+        
+        if sentence_ids:
+            # Return the most informative sentence (usually the longest)
+            best = None
+            for sentence_id in sorted(sentence_ids):
+                start, end = self.tokens.sentence_spans[sentence_id]
+                sentence = text[start:end]
+                start += len(sentence) - len(sentence.lstrip())
+                end = start + len(sentence.strip())
+                if best is None or end - start > best[1] - best[0]:
+                    best = (start, end)
+            return AspectContext(text[best[0]:best[1]], best[0], best[1])
+        
+        # If no direct mention, look for contextual mentions
+        words = self.tokens.words
+        if aspect in words:
+            aspect_index = words.index(aspect)
+            # Get surrounding context (±10 words)
+            start = max(0, aspect_index - 10)
+            end = min(len(words), aspect_index + 11)
+            return AspectContext(' '.join(words[start:end]), self.tokens.starts[start], self.tokens.ends[end - 1])
+        
+        return AspectContext(text, 0, len(text))
+    
+    def span(self, aspect: str) -> Tuple[int, int]:
+        """Character span of an aspect's context, without building the string"""
+        context = self.lookup(aspect)
+        return context.start, context.end
+
+def build_aspect_context_index(text: str, aspects: List[str], tokens: Optional[TokenArray] = None) -> AspectContextIndex:
+    """Index a review once so every aspect's context becomes a lookup"""
+    return AspectContextIndex(text, aspects, tokens)
+
+@profiled("analyze_aspect_sentiment_context")
+def analyze_aspect_sentiment_context(text: str, aspect: str, tokens: Optional[TokenArray] = None,
+                                     index: Optional[AspectContextIndex] = None,
+                                     return_offsets: bool = False):
     """
     Enhanced context extraction for aspects
+    
+    Pass `index` from build_aspect_context_index(text, aspects) when looking up
+    several aspects of the same review, or `tokens` from tokenize(text) to reuse
+    the review's tokenization. With return_offsets=True an AspectContext
+    (text, start, end) is returned instead of the plain string.
     """
-    sentences = re.split(r'[.!?]+', text)
-    
-    # Find sentences containing the aspect or related terms
-    relevant_sentences = []
-    aspect_keywords = _get_aspect_keywords(aspect)
-    
-    for sentence in sentences:
-        sentence_lower = sentence.lower()
-        if any(keyword in sentence_lower for keyword in aspect_keywords):
-            relevant_sentences.append(sentence.strip())
-    
-    if relevant_sentences:
-        # Return the most informative sentence (usually the longest)
-        return max(relevant_sentences, key=len)
-    
-    # If no direct mention, look for contextual mentions
-    words = text.lower().split()
-    if aspect in words:
-        aspect_index = words.index(aspect)
-        # Get surrounding context (±10 words)
-        start = max(0, aspect_index - 10)
-        end = min(len(words), aspect_index + 11)
-        context_words = words[start:end]
-        return ' '.join(context_words)
-    
-    return text
+    if index is None:
+        index = AspectContextIndex(text, [aspect], tokens)
+    
+    context = index.lookup(aspect)
+    return context if return_offsets else context.text
+
+# Related keywords for an aspect to improve context detection
+ASPECT_CONTEXT_KEYWORDS = {
+    'anc': ['anc', 'noise cancellation', 'noise cancelling', 'active noise'],
+    'audio quality': ['audio', 'sound', 'music', 'quality'],
+    'bass': ['bass', 'low frequency', 'deep sound'],
+    'connectivity': ['connection', 'connect', 'pair', 'bluetooth'],
+    'battery': ['battery', 'charge', 'power', 'lasting'],
+    'warranty': ['warranty', 'guarantee', 'coverage', 'expired'],
+    'seller': ['seller', 'vendor', 'fake', 'refurbished'],
+    'delivery': ['delivery', 'shipping', 'arrived', 'package'],
+    'compatibility': ['compatible', 'works with', 'support'],
+    'build quality': ['build', 'construction', 'material', 'quality'],
+    'design': ['design', 'look', 'appearance', 'style'],
+    'value': ['value', 'price', 'money', 'worth', 'cost'],
+    'performance': ['performance', 'speed', 'working', 'function']
+}
+
+_CONTEXT_MATCHER = KeywordMatcher(keyword for keywords in ASPECT_CONTEXT_KEYWORDS.values() for keyword in keywords)
 
 def _get_aspect_keywords(aspect: str) -> List[str]:
     """Get related keywords for an aspect to improve context detection"""
-    keyword_map = {
-        'anc': ['anc', 'noise cancellation', 'noise cancelling', 'active noise'],
-        'audio quality': ['audio', 'sound', 'music', 'quality'],
-        'bass': ['bass', 'low frequency', 'deep sound'],
-        'connectivity': ['connection', 'connect', 'pair', 'bluetooth'],
-        'battery': ['battery', 'charge', 'power', 'lasting'],
-        'warranty': ['warranty', 'guarantee', 'coverage', 'expired'],
-        'seller': ['seller', 'vendor', 'fake', 'refurbished'],
-        'delivery': ['delivery', 'shipping', 'arrived', 'package'],
-        'compatibility': ['compatible', 'works with', 'support'],
-        'build quality': ['build', 'construction', 'material', 'quality'],
-        'design': ['design', 'look', 'appearance', 'style'],
-        'value': ['value', 'price', 'money', 'worth', 'cost'],
-        'performance': ['performance', 'speed', 'working', 'function']
-    }
-    
-    return keyword_map.get(aspect, [aspect])
+    return ASPECT_CONTEXT_KEYWORDS.get(aspect, [aspect])
 
 # Test function for the specific review
 def test_with_sample_review():
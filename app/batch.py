@@ -0,0 +1,222 @@
+# batch.py - Headless batch runner for the aspect sentiment pipeline
+#
+#   python -m app.batch data/sample_reviews.txt -o results.csv
+#   python -m app.batch reviews.jsonl --text-field body -o results.jsonl
+#   cat reviews.txt | python -m app.batch - > results.csv
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+import time
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple
+
+try:
+    from .parallel import DEFAULT_CHUNK_SIZE, ParallelAnalyzer
+    from .pipeline import SCORING_MODES, analyze_review
+    from .utils import create_ml_export_data, format_time
+except ImportError:
+    from parallel import DEFAULT_CHUNK_SIZE, ParallelAnalyzer
+    from pipeline import SCORING_MODES, analyze_review
+    from utils import create_ml_export_data, format_time
+
+INPUT_FORMATS = ('jsonl', 'csv', 'txt')
+OUTPUT_FORMATS = ('csv', 'jsonl')
+
+# Field names tried (in order) when --text-field is not given
+DEFAULT_TEXT_FIELDS = ('review', 'Review', 'text', 'body', 'content')
+
+
+def _detect_format(path: str, default: str) -> str:
+    """Format from the file extension (.jsonl/.ndjson, .csv, anything else is text)"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.jsonl', '.ndjson', '.json'):
+        return 'jsonl'
+    if extension in ('.csv', '.tsv'):
+        return 'csv'
+    return default
+
+
+def review_text_from_record(record: dict, text_field: Optional[str] = None) -> str:
+    """Review text of a JSONL/CSV record: text_field, else the first non-empty default field"""
+    if text_field:
+        return record.get(text_field) or ''
+    for field in DEFAULT_TEXT_FIELDS:
+        if record.get(field):
+            return record[field]
+    return ''
+
+
+def read_reviews(handle: TextIO, input_format: str, name: str = "stdin",
+                 text_field: Optional[str] = None, source_field: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Stream (source, review) pairs from an open file
+    - txt: one review per non-empty line
+    - jsonl: one JSON object per line, review text in text_field
+    - csv: header row, review text in the text_field column
+    Source defaults to "<name>:<line or record number>"
+    """
+    if input_format == 'csv':
+        dialect = 'excel-tab' if name.lower().endswith('.tsv') else 'excel'
+        records = ((number, record) for number, record in enumerate(csv.DictReader(handle, dialect=dialect), 1))
+    elif input_format == 'jsonl':
+        records = ((number, json.loads(line)) for number, line in enumerate(handle, 1) if line.strip())
+    else:
+        records = ((number, line) for number, line in enumerate(handle, 1))
+
+    for number, record in records:
+        if isinstance(record, dict):
+            review = str(review_text_from_record(record, text_field)).strip()
+            source = str(record.get(source_field) or '') if source_field else ''
+        else:
+            review = record.strip()
+            source = ''
+        if review:
+            yield source or f"{name}:{number}", review
+
+
+def iter_results(reviews: Iterable[Tuple[str, str]], context_chars: Optional[int] = None,
+                 scoring: Optional[str] = None) -> Iterator[List[dict]]:
+    """Run the pipeline on each (source, review) and yield its result rows"""
+    for source, review in reviews:
+        yield analyze_review(review, source=source, context_chars=context_chars, scoring=scoring).rows
+
+
+class ExportWriter:
+    """Append export rows to CSV or JSONL in chunks, with the create_ml_export_data columns"""
+
+    def __init__(self, handle: TextIO, output_format: str = 'csv', include_metadata: bool = True,
+                 header: bool = True):
+        self.handle = handle
+        self.output_format = output_format
+        self.include_metadata = include_metadata
+        self.header = header  # False when appending to a CSV that already has one
+        self.rows_written = 0
+        self.timestamp = time.strftime('%Y-%m-%d %H:%M:%S')  # one Analysis_Timestamp for the whole run
+
+    def write(self, rows: List[dict]):
+        if not rows:
+            return
+        export_df = create_ml_export_data(rows, include_metadata=self.include_metadata, timestamp=self.timestamp)
+        if self.output_format == 'jsonl':
+            # Some pandas versions end the last record with a newline, others don't
+            self.handle.write(export_df.to_json(orient='records', lines=True, force_ascii=False).rstrip('\n') + '\n')
+        else:
+            export_df.to_csv(self.handle, index=False, header=self.header and self.rows_written == 0, lineterminator='\n')
+        self.handle.flush()
+        self.rows_written += len(export_df)
+
+
+def run_batch(inputs: List[str], output: TextIO, input_format: str = 'auto', output_format: str = 'csv',
+              text_field: Optional[str] = None, source_field: Optional[str] = None,
+              include_metadata: bool = True, chunk_size: int = 500, limit: Optional[int] = None,
+              context_chars: Optional[int] = None, progress_every: int = 1000, log: Optional[TextIO] = None,
+              workers: int = 1, task_chunk_size: int = DEFAULT_CHUNK_SIZE, scoring: Optional[str] = None) -> dict:
+    """
+    Analyze every review in the input files and stream the rows to output
+    - workers > 1 spreads reviews over a process pool (0 = one per core),
+      task_chunk_size reviews per task; output order is unchanged
+    - scoring picks analyze_review's scoring mode; the rows are the same in both
+    Returns throughput stats: reviews, rows, seconds, reviews_per_second
+    """
+    log = log or sys.stderr
+    writer = ExportWriter(output, output_format, include_metadata)
+    pending = []
+    reviews_done = 0
+    start_time = time.time()
+
+    def all_reviews():
+        for path in inputs:
+            file_format = input_format if input_format != 'auto' else _detect_format(path, 'txt')
+            if path == '-':
+                yield from read_reviews(sys.stdin, file_format, "stdin", text_field, source_field)
+                continue
+            with open(path, encoding='utf-8', newline='' if file_format == 'csv' else None) as handle:
+                yield from read_reviews(handle, file_format, os.path.basename(path), text_field, source_field)
+
+    reviews = all_reviews()
+    engine = ParallelAnalyzer(workers, task_chunk_size, context_chars=context_chars,
+                              scoring=scoring) if workers != 1 else None
+    results = engine.imap(reviews) if engine else iter_results(reviews, context_chars, scoring)
+    try:
+        for rows in results:
+            reviews_done += 1
+            pending.extend(rows)
+            if len(pending) >= chunk_size:
+                writer.write(pending)
+                pending = []
+            if progress_every and reviews_done % progress_every == 0:
+                elapsed = time.time() - start_time
+                print(f"📊 {reviews_done} reviews, {writer.rows_written + len(pending)} aspects "
+                      f"({reviews_done / elapsed:.1f} reviews/s)", file=log)
+            if limit is not None and reviews_done >= limit:
+                break
+    finally:
+        reviews.close()
+        if engine:
+            engine.close()
+    writer.write(pending)
+
+    elapsed = time.time() - start_time
+    stats = {
+        'reviews': reviews_done,
+        'rows': writer.rows_written,
+        'seconds': elapsed,
+        'reviews_per_second': reviews_done / elapsed if elapsed > 0 else 0.0,
+    }
+    print(f"🎉 Analyzed {stats['reviews']} reviews -> {stats['rows']} aspect rows in {format_time(elapsed)} "
+          f"({stats['reviews_per_second']:.1f} reviews/s)", file=log)
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.batch",
+        description="Run aspect-based sentiment analysis over review files without the Streamlit app"
+    )
+    parser.add_argument('inputs', nargs='+', help="Review files (JSONL, CSV or one review per line); '-' reads stdin")
+    parser.add_argument('-o', '--output', default='-', help="Output file (.csv or .jsonl); default stdout as CSV")
+    parser.add_argument('--input-format', choices=('auto',) + INPUT_FORMATS, default='auto',
+                        help="Input format; 'auto' uses the file extension (default)")
+    parser.add_argument('--output-format', choices=OUTPUT_FORMATS,
+                        help="Output format; default from the output extension, else CSV")
+    parser.add_argument('--text-field', help=f"JSONL key / CSV column with the review text "
+                                             f"(default: first of {', '.join(DEFAULT_TEXT_FIELDS)})")
+    parser.add_argument('--source-field', help="JSONL key / CSV column used as the Source value")
+    parser.add_argument('--no-metadata', action='store_true', help="Skip the export metadata columns")
+    parser.add_argument('--chunk-size', type=int, default=500, help="Rows buffered per write (default 500)")
+    parser.add_argument('--limit', type=int, help="Stop after this many reviews")
+    parser.add_argument('--context-chars', type=int, help="Shorten stored contexts to this many characters")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes (default 1; 0 uses one per CPU core)")
+    parser.add_argument('--task-chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Reviews sent to a worker per task (default {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument('--scoring', choices=SCORING_MODES,
+                        help="Score each aspect context (context) or each unique sentence once (sentence)")
+    parser.add_argument('--progress-every', type=int, default=1000,
+                        help="Report throughput every N reviews on stderr (0 disables)")
+    args = parser.parse_args(argv)
+
+    output_format = args.output_format or ('jsonl' if _detect_format(args.output, 'csv') == 'jsonl' else 'csv')
+    if args.output == '-':
+        output = sys.stdout
+    else:
+        output = open(args.output, 'w', encoding='utf-8', newline='' if output_format == 'csv' else None)
+
+    # Pipeline modules report progress with print(); keep stdout for the results
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            run_batch(args.inputs, output, args.input_format, output_format,
+                      text_field=args.text_field, source_field=args.source_field,
+                      include_metadata=not args.no_metadata, chunk_size=max(1, args.chunk_size),
+                      limit=args.limit, context_chars=args.context_chars, progress_every=args.progress_every,
+                      workers=args.workers, task_chunk_size=args.task_chunk_size, scoring=args.scoring)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+# keyword_matcher.py - Single-pass multi-keyword matching (no additional dependencies)
+import re
+from typing import Dict, Iterable, List, Set
+
+
+def _build_trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Build a regex alternation shaped like a trie
+    Shared prefixes are factored out, so each text position is rejected
+    after one character comparison instead of one per keyword
+    """
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}  # end-of-keyword marker
+
+    def build(node: Dict) -> str:
+        is_end = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Quantifiers are greedy, so the longest keyword at a position wins
+        return f'(?:{body})?' if is_end else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick style keyword matcher built on one compiled regex
+
+    `find(text)` returns exactly the keywords for which `keyword in text`
+    is True, but scans the text once instead of once per keyword.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(dict.fromkeys(k for k in keywords if k))
+        self._pattern = None
+        if self.keywords:
+            # Zero-width lookahead reports a match at every position, overlaps included
+            self._pattern = re.compile('(?=(' + _build_trie_pattern(self.keywords) + '))')
+
+        # Only the longest keyword at each position is reported, so expand every
+        # hit to all keywords it contains (e.g. 'battery life' -> 'battery', 'life')
+        self._contained = {
+            keyword: frozenset(other for other in self.keywords if other in keyword)
+            for keyword in self.keywords
+        }
+        # Keywords that start where a longer hit starts (e.g. 'battery' in 'battery life')
+        self._prefixes = {
+            keyword: tuple(other for other in self.keywords if keyword.startswith(other))
+            for keyword in self.keywords
+        }
+
+    def find(self, text: str) -> Set[str]:
+        """Return the set of keywords that occur anywhere in text"""
+        if not text or self._pattern is None:
+            return set()
+
+        found = set()
+        for keyword in set(self._pattern.findall(text)):
+            found |= self._contained[keyword]
+        return found
+
+    def find_positions(self, text: str) -> Dict[str, List[int]]:
+        """Map every keyword found in text to the start offsets of its occurrences"""
+        positions: Dict[str, List[int]] = {}
+        if not text or self._pattern is None:
+            return positions
+
+        prefixes = self._prefixes
+        for match in self._pattern.finditer(text):
+            start = match.start()
+            for keyword in prefixes[match.group(1)]:
+                positions.setdefault(keyword, []).append(start)
+        return positions
+
+    def __contains__(self, keyword: str) -> bool:
+        return keyword in self._contained
+
+    def __len__(self) -> int:
+        return len(self.keywords)
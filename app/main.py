@@ -7,10 +7,24 @@ import os
 load_dotenv()
 
 # Import our modules
-from sentiment import analyze_sentiment, get_model_info
-from aspect_extractor import extract_aspects, get_aspect_categories, analyze_aspect_sentiment_context
-from amazon_scraper import get_reviews_from_amazon, test_scraperapi_key, get_sample_reviews
-from utils import colored_chip, format_time, display_ml_metrics, create_ml_export_data
+from sentiment import get_analyzer, get_model_info
+from aspect_extractor import get_aspect_categories
+from pipeline import BackgroundAnalysis, analyze_review
+from result_store import ResultStore
+from aggregator import ResultAggregator
+from amazon_scraper import get_reviews_from_amazon, get_scraperapi_key_status, get_sample_reviews
+from utils import colored_chip, format_time, display_ml_metrics, create_ml_export_data, display_diagnostics
+
+
+@st.cache_resource(show_spinner=False)
+def load_analyzer():
+    """One sentiment analyzer (and result cache) shared by every session and rerun"""
+    return get_analyzer()
+
+@st.cache_data(max_entries=1000, show_spinner=False)
+def analyze_review_cached(review: str, source: str):
+    """Pipeline result for one review; reruns with the same text skip the analysis"""
+    return analyze_review(review, source=source)
 
 
 def ensure_secrets():
@@ -131,7 +145,8 @@ with st.sidebar:
     # ScraperAPI Status
     st.markdown("#### 🌐 Amazon Scraper")
     try:
-        api_working, api_message = test_scraperapi_key()
+        # Cached per key in amazon_scraper (failed checks only briefly)
+        api_working, api_message = get_scraperapi_key_status()
         if api_working:
             st.markdown('<p class="status-good">✅ ScraperAPI Ready</p>', unsafe_allow_html=True)
             st.caption("🚀 Can scrape Amazon reviews")
@@ -160,8 +175,32 @@ with st.sidebar:
             st.warning("No results yet! Analyze some reviews first.")
 
 # Initialize session state
+load_analyzer()
 if 'all_results' not in st.session_state:
-    st.session_state.all_results = []
+    st.session_state.all_results = ResultStore()
+if 'result_stats' not in st.session_state:
+    st.session_state.result_stats = ResultAggregator(st.session_state.all_results)
+if 'recorded_reviews' not in st.session_state:
+    st.session_state.recorded_reviews = set()
+
+def record_results(key, rows):
+    """
+    Store the result rows of one analyzed review, once
+    Reruns show the same review again; key (source, review) keeps its rows from being added twice
+    """
+    if key in st.session_state.recorded_reviews:
+        return
+    st.session_state.recorded_reviews.add(key)
+    st.session_state.all_results.extend(rows)
+    st.session_state.result_stats.add_many(rows)
+
+def clear_results():
+    job = st.session_state.pop('bulk_job', None)
+    if job is not None:
+        job.cancel()
+    st.session_state.all_results = ResultStore()
+    st.session_state.result_stats = ResultAggregator()
+    st.session_state.recorded_reviews = set()
 
 # Main content with tabs for better organization
 tab1, tab2, tab3 = st.tabs(["Single Review Analysis", "Amazon Product Review Analyzer", "Results & Insights"])
@@ -207,9 +246,10 @@ with tab1:
         with st.spinner("🤖 AI is analyzing your review..."):
             start_time = time.time()
             
-            # Extract aspects and analyze sentiment
-            aspects = extract_aspects(user_review)
-            overall_sentiment = analyze_sentiment(user_review)
+            # Extract aspects and analyze sentiment (cached per review text)
+            analysis = analyze_review_cached(user_review, "Manual Input")
+            aspects = analysis.aspects
+            overall_sentiment = analysis.overall
             processing_time = time.time() - start_time
         
         # Results with better visual layout
@@ -263,13 +303,13 @@ with tab1:
                 st.markdown("---")
             
             # Aspect-wise analysis
-            for aspect in aspects:
-                context = analyze_aspect_sentiment_context(user_review, aspect)
-                aspect_sentiment = analyze_sentiment(context)
+            for row in analysis.rows:
+                aspect = row['Aspect']
+                context = row['Context']
                 
                 col1, col2 = st.columns([2, 1])
                 with col1:
-                    chip = colored_chip(aspect_sentiment['label'], aspect_sentiment['score'])
+                    chip = colored_chip(row['Sentiment'], row['Score'])
                     st.markdown(f"**{aspect.title()}**: {chip}", unsafe_allow_html=True)
                     
                     if context != user_review:
@@ -277,25 +317,16 @@ with tab1:
                 
                 with col2:
                     # Human-readable confidence
-                    conf = aspect_sentiment['confidence']
+                    conf = row['Confidence']
                     if conf == 'high':
                         st.caption("🎯 Very Confident")
                     elif conf == 'medium':
                         st.caption("📊 Moderately Confident")
                     else:
                         st.caption("❓ Less Confident")
-                
-                # Store results
-                st.session_state.all_results.append({
-                    "Source": "Manual Input",
-                    "Review": user_review,
-                    "Aspect": aspect,
-                    "Context": context,
-                    "Sentiment": aspect_sentiment['label'],
-                    "Score": aspect_sentiment['score'],
-                    "Confidence": aspect_sentiment['confidence'],
-                    "ML_Model": aspect_sentiment.get('model_used', 'Unknown')
-                })
+            
+            # Store results (once per review, not on every rerun)
+            record_results(("Manual Input", user_review), analysis.rows)
         else:
             st.info("💡 **Tip**: Try a review that mentions specific product features (quality, price, delivery, etc.) for better aspect analysis!")
 
@@ -331,7 +362,7 @@ with tab2:
         use_samples = st.button("Demo with Sample Reviews", use_container_width=True)
         
         st.markdown("### Settings")
-        max_reviews = st.slider("Max Reviews to Scrape", 3, 10, 5)
+        max_reviews = st.slider("Max Reviews to Scrape", 3, 100, 5)
         
         st.markdown("### What You'll Get")
         st.markdown("""
@@ -384,41 +415,46 @@ with tab2:
     else:
         reviews = []
 
+    # Start the bulk analysis in the background; a new set of reviews replaces the old job
+    job = st.session_state.get('bulk_job')
+    if reviews and (job is None or job.reviews != reviews):
+        if job is not None:
+            job.cancel()
+        job = BackgroundAnalysis(reviews, source_prefix="Amazon Review #", context_chars=100)
+        st.session_state.bulk_job = job
+
     # Process and display results
-    if reviews:
-        st.success(f"🎉 **Success!** Found {len(reviews)} reviews to analyze")
+    if job is not None:
+        st.success(f"🎉 **Success!** Found {len(job.reviews)} reviews to analyze")
         
         # Human insights for bulk analysis
         st.markdown("### Quick Business Insights")
+        insight_placeholder = st.empty()
+        progress_placeholder = st.empty()
+        
+        def show_insight(analyses):
+            """Quick sentiment preview from the reviews analyzed so far"""
+            quick_sentiments = [analysis.overall['label'] for analysis in analyses]
+            positive_count = quick_sentiments.count('POSITIVE')
+            negative_count = quick_sentiments.count('NEGATIVE')
+            
+            if positive_count > negative_count:
+                business_insight = f"🟢 **Looking Good!** {positive_count}/{len(quick_sentiments)} samples are positive. Customers seem happy!"
+            elif negative_count > positive_count:
+                business_insight = f"🟠 **Needs Attention!** {negative_count}/{len(quick_sentiments)} samples are negative. Check common complaints."
+            else:
+                business_insight = f"🟡 **Mixed Feedback** - Balanced opinions. Great opportunity for improvement!"
+            
+            insight_placeholder.markdown(f"{business_insight}")
         
-        # Quick sentiment preview
-        quick_sentiments = []
-        for review in reviews[:]:  # Quick analysis of first 3
-            sentiment = analyze_sentiment(review)
-            quick_sentiments.append(sentiment['label'])
-        
-        positive_count = quick_sentiments.count('POSITIVE')
-        negative_count = quick_sentiments.count('NEGATIVE')
-        
-        if positive_count > negative_count:
-            business_insight = f"🟢 **Looking Good!** {positive_count}/{len(quick_sentiments)} samples are positive. Customers seem happy!"
-        elif negative_count > positive_count:
-            business_insight = f"🟠 **Needs Attention!** {negative_count}/{len(quick_sentiments)} samples are negative. Check common complaints."
-        else:
-            business_insight = f"🟡 **Mixed Feedback** - Balanced opinions. Great opportunity for improvement!"
-        
-        st.markdown(f"{business_insight}")
-        # Process each review
-        all_review_results = []
-        
-        for i, review in enumerate(reviews, 1):
+        def show_review(i, analysis):
+            review = analysis.review
             with st.expander(f"📖 Review #{i} ({len(review)} characters)", expanded=i <= 2):
                 st.markdown("**📝 Customer Says:**")
                 st.write(f'"{review}"')
                 
-                # Analyze review
-                review_aspects = extract_aspects(review)
-                overall = analyze_sentiment(review)
+                review_aspects = analysis.aspects
+                overall = analysis.overall
                 
                 # Show results
                 col1, col2 = st.columns([2, 1])
@@ -432,29 +468,34 @@ with tab2:
                     st.markdown(f"**🏷️ What they talked about**: {', '.join([f'`{a}`' for a in review_aspects])}")
                     
                     # Detailed aspect analysis
-                    for aspect in review_aspects:
-                        context = analyze_aspect_sentiment_context(review, aspect)
-                        aspect_sentiment = analyze_sentiment(context)
-                        aspect_chip = colored_chip(aspect_sentiment['label'], aspect_sentiment['score'])
-                        
-                        st.markdown(f"└─ **{aspect.title()}**: {aspect_chip}", unsafe_allow_html=True)
-                        
-                        # Store results
-                        all_review_results.append({
-                            "Source": f"Amazon Review #{i}",
-                            "Review": review,
-                            "Aspect": aspect,
-                            "Context": context[:100] + "..." if len(context) > 100 else context,
-                            "Sentiment": aspect_sentiment['label'],
-                            "Score": aspect_sentiment['score'],
-                            "Confidence": aspect_sentiment['confidence'],
-                            "ML_Model": aspect_sentiment.get('model_used', 'Unknown')
-                        })
+                    for row in analysis.rows:
+                        aspect_chip = colored_chip(row['Sentiment'], row['Score'])
+                        st.markdown(f"└─ **{row['Aspect'].title()}**: {aspect_chip}", unsafe_allow_html=True)
                 else:
                     st.info("💭 This review doesn't mention specific product features")
-        
-        # Add to session state
-        st.session_state.all_results.extend(all_review_results)
+            
+            # Add to session state (once per review, however often the page reruns)
+            record_results((f"Amazon Review #{i}", review), analysis.rows)
+        
+        # Render each review as soon as the worker finishes it
+        shown = 0
+        while True:
+            finished = job.done
+            completed = job.completed
+            if completed > shown:
+                for i in range(shown, completed):
+                    show_review(i + 1, job.results[i])
+                shown = completed
+                show_insight(job.results[:shown])
+            if finished:
+                break
+            progress_placeholder.progress(shown / len(job.reviews),
+                                          text=f"🤖 Analyzed {shown}/{len(job.reviews)} reviews...")
+            time.sleep(0.2)
+        progress_placeholder.empty()
+        
+        if job.error is not None:
+            st.error(f"🚫 Analysis stopped after {shown} reviews: {job.error}")
 
 with tab3:
     if st.session_state.all_results:
@@ -462,16 +503,16 @@ with tab3:
         st.write("Your analyzed data with actionable business intelligence")
         st.write("")  # Add some spacing
         
-        df = pd.DataFrame(st.session_state.all_results)
+        stats = st.session_state.result_stats
         
         # Enhanced dashboard
-        display_ml_metrics(st.session_state.all_results)
+        display_ml_metrics(stats)
         
         # Business insights section
         st.markdown("### Business Intelligence")
         
-        sentiment_counts = df['Sentiment'].value_counts()
-        total = len(df)
+        sentiment_counts = pd.Series(stats.summary()['sentiment_counts'], dtype='int64')
+        total = stats.total_aspects
         
         col1, col2 = st.columns(2)
         
@@ -494,10 +535,9 @@ with tab3:
             st.markdown("#### Top Issues & Strengths")
             
             # Find most mentioned aspects
-            if 'Aspect' in df.columns:
-                top_aspects = df['Aspect'].value_counts().head(5)
+            if stats.aspect_counts:
                 st.markdown("**Most Discussed Features:**")
-                for aspect, count in top_aspects.items():
+                for aspect, count in stats.top_aspects(5):
                     percentage = (count / total) * 100
                     st.write(f"• **{aspect.title()}**: {count} mentions ({percentage:.1f}%)")
         
@@ -505,6 +545,7 @@ with tab3:
         st.markdown("### Detailed Results")
         
         # Enhanced table
+        df = st.session_state.all_results.to_frame()
         if 'ML_Model' in df.columns:
             display_df = df[['Source', 'Aspect', 'Sentiment', 'Score', 'Confidence', 'ML_Model']].copy()
         else:
@@ -531,8 +572,8 @@ with tab3:
         with col2:
             # Summary report
             summary_data = {
-                'Total_Reviews': [len(df['Review'].unique()) if 'Review' in df.columns else 0],
-                'Total_Aspects': [len(df)],
+                'Total_Reviews': [len(stats.reviews)],
+                'Total_Aspects': [stats.total_aspects],
                 'Positive_Sentiment': [sentiment_counts.get('POSITIVE', 0)],
                 'Negative_Sentiment': [sentiment_counts.get('NEGATIVE', 0)],
                 'Analysis_Date': [pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')]
@@ -548,7 +589,7 @@ with tab3:
         
         with col3:
             if st.button("Clear All Results", use_container_width=True):
-                st.session_state.all_results = []
+                clear_results()
                 st.success("✅ Results cleared!")
                 st.rerun()
     
@@ -562,6 +603,12 @@ with tab3:
         st.write("• Use the **Amazon Scraper** tab to analyze bulk reviews")
         st.write("• Click **'Demo with Sample Reviews'** for instant results")
 
+# Pipeline diagnostics, rendered last so they include this run's stages
+with st.sidebar:
+    st.divider()
+    with st.expander("📈 Pipeline Diagnostics"):
+        display_diagnostics()
+
 # Footer
 st.markdown("---")
 st.markdown("""
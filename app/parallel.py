@@ -0,0 +1,129 @@
+# parallel.py - Process-pool execution engine for bulk review analysis
+import multiprocessing
+import os
+import sys
+from collections import deque
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from . import sentiment
+    from .pipeline import analyze_review
+except ImportError:
+    import sentiment
+    from pipeline import analyze_review
+
+# Worker processes used when none are requested (0 or unset means one per core)
+DEFAULT_WORKERS = int(os.getenv('ANALYSIS_WORKERS', '0')) or os.cpu_count() or 1
+
+# Reviews sent to a worker per task; bigger chunks mean less IPC, smaller ones better balance
+DEFAULT_CHUNK_SIZE = int(os.getenv('ANALYSIS_CHUNK_SIZE', '64'))
+
+
+def _init_worker(model_type: str):
+    """
+    Pool initializer: runs once in every worker process
+    - builds the worker's MLSentimentAnalyzer (and its cache) a single time
+    - sends the modules' progress prints to stderr, leaving stdout to the parent
+    """
+    sys.stdout = sys.stderr
+    sentiment.analyzer = sentiment.MLSentimentAnalyzer(model_type, cache=sentiment.get_default_cache())
+
+
+def _analyze_chunk(chunk: List[Tuple[str, str]], context_chars: Optional[int],
+                   scoring: Optional[str] = None) -> List[List[dict]]:
+    """Task run in a worker: result rows for each (source, review) in the chunk"""
+    return [analyze_review(review, source=source, context_chars=context_chars, scoring=scoring).rows
+            for source, review in chunk]
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class ParallelAnalyzer:
+    """
+    Runs the review pipeline on a pool of worker processes
+    - each worker initializes its analyzer once (pool initializer), not per task
+    - reviews travel in chunks of chunk_size
+    - results come back in input order, and only a bounded number of chunks
+      is in flight, so arbitrarily long inputs stream through
+    - workers=1 runs in the current process without a pool
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 model_type: str = "auto", context_chars: Optional[int] = None,
+                 start_method: str = "spawn", scoring: Optional[str] = None):
+        self.workers = max(1, workers or DEFAULT_WORKERS)
+        self.chunk_size = max(1, chunk_size)
+        self.model_type = model_type
+        self.context_chars = context_chars
+        self.scoring = scoring
+        # Enough queued chunks to keep every worker busy while results are consumed
+        self.max_pending = self.workers * 2
+        self._pool = None
+        if self.workers > 1:
+            # spawn: workers never inherit the parent's analyzer or sqlite connection
+            context = multiprocessing.get_context(start_method)
+            self._pool = context.Pool(self.workers, initializer=_init_worker, initargs=(model_type,))
+
+    def imap(self, reviews: Iterable[Tuple[str, str]]) -> Iterator[List[dict]]:
+        """Yield the result rows of every (source, review), in input order"""
+        if self._pool is None:
+            if self.model_type != "auto" and sentiment.get_analyzer().model_type != self.model_type:
+                sentiment.analyzer = sentiment.MLSentimentAnalyzer(self.model_type, cache=sentiment.get_default_cache())
+            for chunk in _chunks(reviews, self.chunk_size):
+                yield from _analyze_chunk(chunk, self.context_chars, self.scoring)
+            return
+
+        pending = deque()
+        for chunk in _chunks(reviews, self.chunk_size):
+            pending.append(self._pool.apply_async(_analyze_chunk, (chunk, self.context_chars, self.scoring)))
+            if len(pending) >= self.max_pending:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+    def close(self):
+        """Stop the worker processes"""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def analyze_reviews_parallel(reviews: Iterable[Tuple[str, str]], workers: Optional[int] = None,
+                             chunk_size: int = DEFAULT_CHUNK_SIZE, context_chars: Optional[int] = None) -> List[dict]:
+    """Convenience wrapper: all result rows for (source, review) pairs, in input order"""
+    rows = []
+    with ParallelAnalyzer(workers, chunk_size, context_chars=context_chars) as engine:
+        for review_rows in engine.imap(reviews):
+            rows.extend(review_rows)
+    return rows
+
+
+if __name__ == "__main__":
+    import time
+    try:
+        from .amazon_scraper import get_sample_reviews
+    except ImportError:
+        from amazon_scraper import get_sample_reviews
+
+    samples = [(f"Sample #{i}", review) for i, review in enumerate(get_sample_reviews() * 50, 1)]
+    for worker_count in (1, DEFAULT_WORKERS):
+        start = time.time()
+        rows = analyze_reviews_parallel(samples, workers=worker_count)
+        elapsed = time.time() - start
+        print(f"⚡ {worker_count} worker(s): {len(samples)} reviews -> {len(rows)} rows "
+              f"in {elapsed:.2f}s ({len(samples) / elapsed:.0f} reviews/s)")
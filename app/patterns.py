@@ -0,0 +1,178 @@
+# patterns.py - Precompiled regex registry shared by the text-processing modules
+import re
+from typing import Dict, List, Tuple
+
+# ---------------------------------------------------------------------------
+# General text patterns
+# ---------------------------------------------------------------------------
+WHITESPACE = re.compile(r'\s+')
+TOKEN = re.compile(r'\S+')
+NON_WORD = re.compile(r'[^\w]')
+NON_WORD_OR_SPACE = re.compile(r'[^\w\s]')
+ACRONYM = re.compile(r'^[A-Z]{2,5}$')
+SENTENCE_SPLIT = re.compile(r'[.!?]+')
+
+# Excessive punctuation (kept to one mark, or an ellipsis for dots)
+REPEATED_EXCLAMATION = re.compile(r'[!]{2,}')
+REPEATED_QUESTION = re.compile(r'[?]{2,}')
+REPEATED_DOTS = re.compile(r'[.]{3,}')
+
+# ---------------------------------------------------------------------------
+# Aspect extraction patterns: (compiled pattern, capture group with the aspect)
+# ---------------------------------------------------------------------------
+ASPECT_PATTERNS: List[Tuple[re.Pattern, int]] = [
+    (re.compile(pattern, re.IGNORECASE), group)
+    for pattern, group in [
+        # "the X is/was Y" pattern
+        (r'the\s+(\w+)\s+(?:is|was|seems|looks|feels)\s+(?:good|bad|great|terrible|excellent|poor|amazing|awful|not|very)', 1),
+
+        # "X quality/problem/issue" pattern
+        (r'(\w+)\s+(?:quality|problem|issue|trouble|performance|feature)', 1),
+
+        # "poor/good/bad/excellent X" pattern
+        (r'(?:poor|good|bad|excellent|great|terrible|amazing|awful|no|zero)\s+(\w+)', 1),
+
+        # "X is/was not working/functioning" pattern
+        (r'(\w+)\s+(?:is|was)\s+(?:not\s+)?(?:working|functioning|good|bad|terrible|great)', 1),
+
+        # "no X" or "lack of X" pattern
+        (r'(?:no|lack\s+of|zero|missing)\s+(\w+)', 1),
+
+        # "X settings/options" pattern
+        (r'(\w+)\s+(?:settings|options|features|functions)', 1),
+
+        # "connected to X" or "works with X" pattern
+        (r'(?:connected\s+to|works\s+with|compatible\s+with)\s+(\w+)', 1),
+
+        # Brand/Product patterns
+        (r'(iphone|samsung|macbook|galaxy|note|boat|apple|sony|bose)\s*(\w+)?', 1),
+    ]
+]
+
+# ---------------------------------------------------------------------------
+# Amazon product URLs - tried in order, the first match holds the product ID
+# ---------------------------------------------------------------------------
+PRODUCT_ID_PATTERNS: List[re.Pattern] = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in [
+        r'/dp/([A-Z0-9]{10})',
+        r'/product/([A-Z0-9]{10})',
+        r'/gp/product/([A-Z0-9]{10})',
+        r'/product-reviews/([A-Z0-9]{10})',
+        r'/([A-Z0-9]{10})(?:/|$)',
+        r'asin=([A-Z0-9]{10})',
+        r'productId=([A-Z0-9]{10})',
+    ]
+]
+
+# A bare path segment that looks like a product ID
+PRODUCT_ID_SEGMENT = re.compile(r'^[A-Z0-9]{10}$', re.IGNORECASE)
+
+# ---------------------------------------------------------------------------
+# Contractions - one combined pattern, expansion looked up per match
+# ---------------------------------------------------------------------------
+CONTRACTIONS: Dict[str, str] = {
+    "won't": "will not",
+    "can't": "cannot",
+    "don't": "do not",
+    "doesn't": "does not",
+    "isn't": "is not",
+    "wasn't": "was not",
+    "weren't": "were not",
+    "haven't": "have not",
+    "hasn't": "has not",
+    "wouldn't": "would not",
+    "couldn't": "could not",
+    "shouldn't": "should not"
+}
+
+CONTRACTION_PATTERN = re.compile(
+    r'\b(?:' + '|'.join(re.escape(contraction) for contraction in CONTRACTIONS) + r')\b',
+    re.IGNORECASE
+)
+
+
+def _expand_contraction(match: re.Match) -> str:
+    return CONTRACTIONS[match.group(0).lower()]
+
+
+def expand_contractions(text: str) -> str:
+    """Expand every known contraction in a single pass"""
+    return CONTRACTION_PATTERN.sub(_expand_contraction, text)
+
+# ---------------------------------------------------------------------------
+# Amazon review artifacts - applied in list order, skipped when none is present
+# ---------------------------------------------------------------------------
+REVIEW_ARTIFACTS = [
+    r'Read more.*$',
+    r'Was this review helpful.*$',
+    r'\d+ people found this helpful',
+    r'Verified Purchase',
+    r'Vine Customer Review',
+    r'Top \d+ Reviewer',
+    r'By .* on .*',
+    r'Color:.*?Size:.*?(?=\s|$)',
+    r'Style:.*?(?=\s|$)',
+    r'Pattern Name:.*?(?=\s|$)',
+    r'Size:.*?(?=\s|$)',
+    r'Color:.*?(?=\s|$)',
+    r'The media could not be loaded.',
+    r'See all photos',
+    r'Videos for this product',
+    r'Click to expand',
+    r'Images in this review',
+    r'Helpful.*Report.*$',
+    r'Report abuse',
+    r'Translate review to English',
+    r'Show more',
+    r'Show less',
+    r'…Read more',
+    r'Read full review',
+]
+
+# "Read more..." and "Was this review helpful..." come first and cut off the
+# rest of the review, so one search for the earlier of them does both.
+TRUNCATION_PATTERN = re.compile(r'Read more|Was this review helpful', re.IGNORECASE)
+
+# The rest can overlap ("Size:MPattern Name:Single") or be glued back together
+# by an earlier removal ("ShowSee all photos less"), so they run one by one in
+# list order, exactly like the original substitutions
+SEQUENTIAL_ARTIFACTS: List[re.Pattern] = [
+    re.compile(artifact, re.IGNORECASE) for artifact in REVIEW_ARTIFACTS[2:]
+]
+
+
+def _combined_artifacts(artifacts: List[str]) -> re.Pattern:
+    """
+    One alternation of the artifacts
+    The leading character-class lookahead lets the regex engine skip positions
+    that cannot start any artifact before trying the alternatives one by one
+    """
+    first_chars = r'\d' + ''.join(sorted({
+        artifact[0].lower() for artifact in artifacts if not artifact.startswith('\\')
+    }))
+    return re.compile(
+        f'(?=[{first_chars}])(?:' + '|'.join(f'(?:{artifact})' for artifact in artifacts) + ')',
+        re.IGNORECASE
+    )
+
+
+# Matches wherever any of the sequential artifacts would; text without a match
+# is left unchanged by all of them
+ARTIFACT_PATTERN = _combined_artifacts(REVIEW_ARTIFACTS[2:])
+
+
+def remove_artifacts(text: str) -> str:
+    """
+    Strip every Amazon review artifact from whitespace-normalized text
+    One search to truncate and one to skip clean text; only text that contains
+    an artifact goes through the substitutions one by one
+    """
+    match = TRUNCATION_PATTERN.search(text)
+    if match:
+        text = text[:match.start()]
+    if not ARTIFACT_PATTERN.search(text):
+        return text
+    for pattern in SEQUENTIAL_ARTIFACTS:
+        text = pattern.sub('', text)
+    return text
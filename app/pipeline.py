@@ -0,0 +1,199 @@
+# pipeline.py - Per-review aspect sentiment pipeline shared by the Streamlit app and batch jobs
+import os
+import sys
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    from .sentiment import analyze_sentiment, analyze_sentiment_batch, combine_sentiments
+    from .aspect_extractor import extract_aspects, build_aspect_context_index, analyze_aspect_sentiment_context
+    from .tokenizer import TokenArray, tokenize
+except ImportError:
+    from sentiment import analyze_sentiment, analyze_sentiment_batch, combine_sentiments
+    from aspect_extractor import extract_aspects, build_aspect_context_index, analyze_aspect_sentiment_context
+    from tokenizer import TokenArray, tokenize
+
+# Columns of one result row (one row per review aspect), in display/export order
+RESULT_COLUMNS = ["Source", "Review", "Aspect", "Context", "Sentiment", "Score", "Confidence", "ML_Model"]
+
+# How analyze_review scores a review
+# - "context": the whole review for the overall label, plus every aspect context
+# - "sentence": every unique sentence once; aspect labels come from the same
+#   batch and the overall label from the sentence scores (combine_sentiments)
+SCORING_MODES = ("context", "sentence")
+SCORING_MODE = os.getenv('SENTIMENT_SCORING', 'context')
+
+
+@dataclass(slots=True, eq=False)
+class AspectResult(Mapping):
+    """
+    One result row (one review aspect) as a compact __slots__ record
+    - fields are the RESULT_COLUMNS, so row['Aspect'], row.get(...), dict(row)
+      and comparisons with plain row dicts keep working
+    - no per-row dict: 96 bytes per record against 272 for the 8-key dict
+    - build_rows shares the review string between a review's rows and interns
+      the repeating labels, so each distinct value is stored once
+    """
+    Source: str
+    Review: str
+    Aspect: str
+    Context: str
+    Sentiment: str
+    Score: float
+    Confidence: str
+    ML_Model: str
+
+    def __getitem__(self, column: str):
+        if column not in _RESULT_FIELDS:
+            raise KeyError(column)
+        return getattr(self, column)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(RESULT_COLUMNS)
+
+    def __len__(self) -> int:
+        return len(RESULT_COLUMNS)
+
+    def as_tuple(self) -> Tuple:
+        """Values in RESULT_COLUMNS order"""
+        return (self.Source, self.Review, self.Aspect, self.Context,
+                self.Sentiment, self.Score, self.Confidence, self.ML_Model)
+
+
+_RESULT_FIELDS = frozenset(RESULT_COLUMNS)
+
+
+class ReviewAnalysis(NamedTuple):
+    """Everything the pipeline learned about one review"""
+    review: str
+    aspects: List[str]
+    overall: Dict
+    rows: List[AspectResult]
+
+
+def aspect_contexts(review: str, tokens: TokenArray, aspects: List[str]) -> List[str]:
+    """Context of every aspect, using one context index for the whole review"""
+    if not aspects:
+        return []
+    context_index = build_aspect_context_index(review, aspects, tokens)
+    return [analyze_aspect_sentiment_context(review, aspect, index=context_index) for aspect in aspects]
+
+
+def review_sentences(tokens: TokenArray) -> List[str]:
+    """Unique sentences of a review (stripped, 3+ characters), in order of appearance"""
+    sentences = {}
+    for sentence in tokens.sentences():
+        sentence = sentence.strip()
+        if len(sentence) >= 3:
+            sentences.setdefault(sentence, None)
+    return list(sentences)
+
+
+def build_rows(review: str, source: str, aspects: List[str], contexts: List[str], sentiments: List[Dict],
+               context_chars: Optional[int] = None) -> List[AspectResult]:
+    """
+    One AspectResult per aspect
+    context_chars shortens the stored Context (with "...") without changing what was scored
+    """
+    intern = sys.intern
+    source = intern(source)
+    rows = []
+    for aspect, context, aspect_sentiment in zip(aspects, contexts, sentiments):
+        if context_chars is not None and len(context) > context_chars:
+            context = context[:context_chars] + "..."
+        rows.append(AspectResult(
+            source,
+            review,
+            intern(aspect),
+            review if context == review else context,
+            intern(aspect_sentiment['label']),
+            aspect_sentiment['score'],
+            intern(aspect_sentiment['confidence']),
+            intern(aspect_sentiment.get('model_used', 'Unknown'))
+        ))
+    return rows
+
+
+def analyze_review(review: str, source: str = "Manual Input",
+                   context_chars: Optional[int] = None, scoring: Optional[str] = None) -> ReviewAnalysis:
+    """
+    Run the full pipeline on one review
+    - tokenize once, extract aspects and find each aspect's context
+    - scoring="context" (default): score the whole review, then all contexts in one batch
+    - scoring="sentence": score the unique sentences and the contexts in a single
+      batch, so a context that is a sentence is scored once. Aspect rows are
+      identical to "context" mode; the overall label is combined from the sentences
+    """
+    scoring = scoring or SCORING_MODE
+    if scoring not in SCORING_MODES:
+        raise ValueError(f"Unknown scoring mode {scoring!r}, expected one of {SCORING_MODES}")
+
+    tokens = tokenize(review)
+    aspects = extract_aspects(review, tokens)
+    contexts = aspect_contexts(review, tokens, aspects)
+
+    if scoring == "sentence":
+        sentences = review_sentences(tokens)
+        scored = analyze_sentiment_batch(sentences + contexts) if sentences or contexts else []
+        sentiments = scored[len(sentences):]
+        overall = combine_sentiments(scored[:len(sentences)], [len(sentence) for sentence in sentences]) \
+            if sentences else analyze_sentiment(review)
+    else:
+        overall = analyze_sentiment(review)
+        sentiments = analyze_sentiment_batch(contexts) if contexts else []
+    rows = build_rows(review, source, aspects, contexts, sentiments, context_chars)
+
+    return ReviewAnalysis(review, aspects, overall, rows)
+
+
+class BackgroundAnalysis:
+    """
+    Analyze a list of reviews on a background thread
+    - results[i] is filled in (in order) as each review finishes, so a UI can
+      render progressively while the work continues
+    - the job object outlives UI reruns; cancel() stops it between reviews
+    """
+
+    def __init__(self, reviews: Sequence[str], source_prefix: str = "Review #",
+                 context_chars: Optional[int] = None):
+        self.reviews = list(reviews)
+        self.source_prefix = source_prefix
+        self.context_chars = context_chars
+        self.results: List[Optional[ReviewAnalysis]] = [None] * len(self.reviews)
+        self.completed = 0
+        self.error: Optional[Exception] = None
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="review-analysis", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            for i, review in enumerate(self.reviews):
+                if self._cancelled.is_set():
+                    return
+                self.results[i] = analyze_review(review, source=f"{self.source_prefix}{i + 1}",
+                                                 context_chars=self.context_chars)
+                self.completed = i + 1
+        except Exception as e:
+            self.error = e
+
+    @property
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job finishes (or timeout); True when it is done"""
+        self._thread.join(timeout)
+        return self.done
+
+
+if __name__ == "__main__":
+    analysis = analyze_review("The battery life is outstanding but the display is dull.")
+    print(f"Overall: {analysis.overall['label']} ({analysis.overall['score']:.2f})")
+    for row in analysis.rows:
+        print(f"  {row['Aspect']}: {row['Sentiment']} ({row['Score']:.2f}) - {row['Context']}")
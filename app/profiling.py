@@ -0,0 +1,229 @@
+# profiling.py - Lightweight per-stage instrumentation for the analysis pipeline
+#
+#   @profiled("extract_aspects")            # decorator: times every call
+#   with stage("fetch_page", len(html)):    # context manager for ad-hoc blocks
+#
+# Each stage keeps a call count, error count, total time, bytes processed and a
+# log-scale latency histogram (p50/p95/p99 within ~10%). Stats are per process:
+# pool workers in parallel.py keep their own.
+import functools
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+# PIPELINE_PROFILING=0 turns recording off (the wrappers then cost one flag check)
+ENABLED = os.getenv('PIPELINE_PROFILING', '1') != '0'
+
+# Histogram resolution: 4 buckets per doubling from 1 µs, up to ~70 minutes
+_BUCKETS_PER_OCTAVE = 4
+_MIN_SECONDS = 1e-6
+_BUCKET_COUNT = _BUCKETS_PER_OCTAVE * 32
+
+# Bucket bounds of the exported Prometheus histogram
+PROMETHEUS_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                      0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _bucket(seconds: float) -> int:
+    if seconds <= _MIN_SECONDS:
+        return 0
+    index = int(math.log2(seconds / _MIN_SECONDS) * _BUCKETS_PER_OCTAVE) + 1
+    return min(index, _BUCKET_COUNT - 1)
+
+
+def _bucket_upper(index: int) -> float:
+    return _MIN_SECONDS * 2 ** (index / _BUCKETS_PER_OCTAVE)
+
+
+def text_size(value) -> int:
+    """Bytes of a str (UTF-8), bytes value or list of them; 0 for anything else"""
+    if isinstance(value, str):
+        return len(value) if value.isascii() else len(value.encode('utf-8'))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(map(text_size, value))
+    return 0
+
+
+class StageStats:
+    """Counters and latency histogram of one stage"""
+
+    __slots__ = ('name', 'count', 'errors', 'seconds', 'bytes', 'max_seconds', 'buckets')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.bytes = 0
+        self.max_seconds = 0.0
+        self.buckets = [0] * _BUCKET_COUNT
+
+    def record(self, seconds: float, nbytes: int = 0, error: bool = False):
+        self.count += 1
+        self.errors += error
+        self.seconds += seconds
+        self.bytes += nbytes
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+        self.buckets[_bucket(seconds)] += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the histogram bucket holding the q-quantile (seconds)"""
+        if not self.count:
+            return math.nan
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return min(_bucket_upper(index), self.max_seconds)
+        return self.max_seconds
+
+    def cumulative(self, bound: float) -> int:
+        """Calls that took at most about bound seconds (for the Prometheus buckets)"""
+        return sum(count for index, count in enumerate(self.buckets) if _bucket_upper(index) <= bound * 1.000001)
+
+    def summary(self) -> Dict:
+        return {
+            'stage': self.name,
+            'calls': self.count,
+            'errors': self.errors,
+            'total_s': self.seconds,
+            'mean_ms': self.seconds / self.count * 1000 if self.count else math.nan,
+            'p50_ms': self.quantile(0.5) * 1000,
+            'p95_ms': self.quantile(0.95) * 1000,
+            'p99_ms': self.quantile(0.99) * 1000,
+            'max_ms': self.max_seconds * 1000,
+            'bytes': self.bytes,
+            'mb_per_s': self.bytes / self.seconds / 1e6 if self.seconds else 0.0,
+        }
+
+
+class Profiler:
+    """Thread-safe registry of StageStats by stage name"""
+
+    def __init__(self):
+        self.stages: Dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, nbytes: int = 0, error: bool = False):
+        with self._lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = StageStats(name)
+            stats.record(seconds, nbytes, error)
+
+    def reset(self):
+        with self._lock:
+            self.stages.clear()
+
+    def summary(self) -> List[Dict]:
+        """One dict per stage, slowest total time first"""
+        with self._lock:
+            stages = list(self.stages.values())
+            return [stats.summary() for stats in sorted(stages, key=lambda s: s.seconds, reverse=True)]
+
+    def prometheus_text(self, prefix: str = 'pipeline_stage') -> str:
+        """Stats in the Prometheus text exposition format"""
+        lines = [
+            f"# HELP {prefix}_seconds Latency of each pipeline stage",
+            f"# TYPE {prefix}_seconds histogram",
+        ]
+        with self._lock:
+            stages = sorted(self.stages.values(), key=lambda s: s.name)
+            for stats in stages:
+                label = f'stage="{stats.name}"'
+                for bound in PROMETHEUS_BUCKETS:
+                    lines.append(f'{prefix}_seconds_bucket{{{label},le="{bound}"}} {stats.cumulative(bound)}')
+                lines.append(f'{prefix}_seconds_bucket{{{label},le="+Inf"}} {stats.count}')
+                lines.append(f"{prefix}_seconds_sum{{{label}}} {stats.seconds}")
+                lines.append(f"{prefix}_seconds_count{{{label}}} {stats.count}")
+
+            for name, help_text, metric_type, value in (
+                ('latency_quantile_seconds', "p50/p95/p99 latency from the stage histogram", 'gauge', None),
+                ('errors_total', "Calls that raised", 'counter', 'errors'),
+                ('bytes_total', "Input bytes processed", 'counter', 'bytes'),
+            ):
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+                for stats in stages:
+                    if value is None:
+                        lines.extend(f'{prefix}_{name}{{stage="{stats.name}",quantile="{q}"}} {stats.quantile(q)}'
+                                     for q in QUANTILES)
+                    else:
+                        lines.append(f'{prefix}_{name}{{stage="{stats.name}"}} {getattr(stats, value)}')
+        return "\n".join(lines) + "\n"
+
+
+PROFILER = Profiler()
+
+
+def profiled(name: str, size_arg: Optional[int] = 0) -> Callable:
+    """
+    Decorator recording every call of the function as stage name
+    size_arg: position of the argument whose size counts as bytes processed
+    (None to record no bytes)
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            nbytes = text_size(args[size_arg]) if size_arg is not None and len(args) > size_arg else 0
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                PROFILER.record(name, time.perf_counter() - start, nbytes, error=True)
+                raise
+            PROFILER.record(name, time.perf_counter() - start, nbytes)
+            return result
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def stage(name: str, nbytes: int = 0):
+    """Record the enclosed block as one call of stage name"""
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        PROFILER.record(name, time.perf_counter() - start, nbytes, error=True)
+        raise
+    PROFILER.record(name, time.perf_counter() - start, nbytes)
+
+
+def get_stage_stats() -> List[Dict]:
+    return PROFILER.summary()
+
+
+def prometheus_text() -> str:
+    return PROFILER.prometheus_text()
+
+
+def reset_stats():
+    PROFILER.reset()
+
+
+if __name__ == "__main__":
+    @profiled("demo")
+    def work(text: str) -> int:
+        return sum(map(ord, text))
+
+    for i in range(1000):
+        work("review text " * (i % 50 + 1))
+    for row in get_stage_stats():
+        print(f"⏱️ {row['stage']}: {row['calls']} calls, p50 {row['p50_ms']:.3f} ms, "
+              f"p95 {row['p95_ms']:.3f} ms, p99 {row['p99_ms']:.3f} ms, {row['bytes']} bytes")
+    print(prometheus_text())
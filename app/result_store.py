@@ -0,0 +1,232 @@
+# result_store.py - Columnar, dictionary-encoded store for aspect result rows
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .pipeline import RESULT_COLUMNS
+except ImportError:
+    from pipeline import RESULT_COLUMNS
+
+# Columns kept as integer codes into a per-store dictionary of distinct values.
+# Review text and contexts repeat on every aspect row of a review, so they are
+# stored once and referenced by id like the low-cardinality label columns.
+ENCODED_COLUMNS = ("Source", "Review", "Aspect", "Context", "Sentiment", "Confidence", "ML_Model")
+
+# Rows per sealed chunk; the open chunk grows in compact arrays until it is full
+DEFAULT_CHUNK_ROWS = 65536
+
+
+class _Dictionary:
+    """Distinct values of one column, in first-seen order"""
+
+    __slots__ = ('values', 'codes')
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def encode(self, value) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class ResultStore:
+    """
+    Append-only columnar store for result rows (one row per review aspect)
+
+    - Text columns are dictionary-encoded: every distinct value (including
+      the review text) is stored once and rows hold int32 codes
+    - Rows accumulate in an open chunk of compact arrays; full chunks are
+      sealed into numpy arrays and never change again
+    - Behaves like the list of row dicts it replaces (len, iteration,
+      append/extend), and to_frame() gives a categorical DataFrame for the
+      stats functions in utils
+    - to_parquet / from_parquet persist it (needs pyarrow)
+    """
+
+    def __init__(self, rows: Optional[Iterable[Dict]] = None, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        self.chunk_rows = max(1, chunk_rows)
+        self.dictionaries: Dict[str, _Dictionary] = {column: _Dictionary() for column in ENCODED_COLUMNS}
+        self.chunks: List[Dict[str, np.ndarray]] = []
+        self._sealed_rows = 0
+        self._new_chunk()
+        if rows is not None:
+            self.extend(rows)
+
+    def _new_chunk(self):
+        self._open = {column: array('i') for column in ENCODED_COLUMNS}
+        self._open['Score'] = array('d')
+
+    def _seal(self):
+        if not len(self._open['Score']):
+            return
+        chunk = {column: np.frombuffer(values, dtype=np.int32 if column != 'Score' else np.float64).copy()
+                 for column, values in self._open.items()}
+        self.chunks.append(chunk)
+        self._sealed_rows += len(chunk['Score'])
+        self._new_chunk()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    def append(self, row: Dict):
+        """Add one result row (a dict with the RESULT_COLUMNS keys)"""
+        open_chunk = self._open
+        for column in ENCODED_COLUMNS:
+            open_chunk[column].append(self.dictionaries[column].encode(row.get(column, '')))
+        open_chunk['Score'].append(float(row.get('Score', 0.0)))
+        if len(open_chunk['Score']) >= self.chunk_rows:
+            self._seal()
+
+    def extend(self, rows: Iterable[Dict]):
+        for row in rows:
+            self.append(row)
+
+    def clear(self):
+        self.__init__(chunk_rows=self.chunk_rows)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self._sealed_rows + len(self._open['Score'])
+
+    def _all_chunks(self) -> List[Dict[str, np.ndarray]]:
+        chunks = list(self.chunks)
+        if len(self._open['Score']):
+            # Copies, so the open chunk can keep growing while these are in use
+            chunks.append({column: np.array(values, dtype=np.int32 if column != 'Score' else np.float64)
+                           for column, values in self._open.items()})
+        return chunks
+
+    def codes(self, column: str) -> np.ndarray:
+        """All codes (or scores, for Score) of a column as one array"""
+        chunks = self._all_chunks()
+        dtype = np.float64 if column == 'Score' else np.int32
+        if not chunks:
+            return np.empty(0, dtype=dtype)
+        return np.concatenate([chunk[column] for chunk in chunks])
+
+    def categories(self, column: str) -> List[str]:
+        return self.dictionaries[column].values
+
+    def column(self, column: str) -> pd.Series:
+        """One column as a pandas Series (categorical for the encoded columns)"""
+        if column == 'Score':
+            return pd.Series(self.codes('Score'), name='Score')
+        categorical = pd.Categorical.from_codes(self.codes(column), categories=self._category_index(column))
+        return pd.Series(categorical, name=column)
+
+    def _category_index(self, column: str) -> pd.Index:
+        # Distinct values are unique by construction; object dtype keeps them plain str
+        return pd.Index(self.dictionaries[column].values, dtype=object)
+
+    def value_counts(self, column: str) -> Dict[str, int]:
+        """Counts per distinct value, most common first (like Series.value_counts)"""
+        counts = np.bincount(self.codes(column), minlength=len(self.dictionaries[column]))
+        order = np.argsort(-counts, kind='stable')
+        values = self.dictionaries[column].values
+        return {values[code]: int(counts[code]) for code in order if counts[code]}
+
+    def unique_count(self, column: str) -> int:
+        """Number of distinct values present (rows are never removed, so all are present)"""
+        return len(self.dictionaries[column])
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame with the RESULT_COLUMNS, text columns as pandas categoricals"""
+        if not len(self):
+            return pd.DataFrame(columns=RESULT_COLUMNS)
+        return pd.DataFrame({column: self.column(column) for column in RESULT_COLUMNS})
+
+    def iter_frames(self, chunk_rows: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """The rows as categorical DataFrames of at most chunk_rows rows, chunk by chunk"""
+        chunk_rows = chunk_rows or self.chunk_rows
+        categories = {column: self._category_index(column) for column in ENCODED_COLUMNS}
+        for chunk in self._all_chunks():
+            for start in range(0, len(chunk['Score']), chunk_rows):
+                stop = start + chunk_rows
+                yield pd.DataFrame({
+                    column: chunk['Score'][start:stop] if column == 'Score'
+                    else pd.Categorical.from_codes(chunk[column][start:stop], categories=categories[column])
+                    for column in RESULT_COLUMNS
+                })
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Rows as plain dicts, decoded chunk by chunk"""
+        values = {column: self.dictionaries[column].values for column in ENCODED_COLUMNS}
+        for chunk in self._all_chunks():
+            for i in range(len(chunk['Score'])):
+                row = {column: values[column][chunk[column][i]] for column in ENCODED_COLUMNS}
+                row['Score'] = float(chunk['Score'][i])
+                yield {column: row[column] for column in RESULT_COLUMNS}
+
+    def memory_usage(self) -> int:
+        """Approximate bytes held: codes, scores and each distinct string once"""
+        total = sum(values.nbytes for chunk in self.chunks for values in chunk.values())
+        total += sum(values.itemsize * len(values) for values in self._open.values())
+        for dictionary in self.dictionaries.values():
+            total += sum(len(value.encode('utf-8')) for value in dictionary.values if isinstance(value, str))
+        return total
+
+    # ------------------------------------------------------------------
+    # Parquet
+    # ------------------------------------------------------------------
+    def to_parquet(self, path: str, compression: str = 'zstd'):
+        """
+        Write the store to Parquet, one row group per chunk
+        Text columns are written as Arrow dictionary arrays, so each
+        distinct value is stored once per row group
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        dictionaries = {column: pa.array(self.dictionaries[column].values, type=pa.string())
+                        for column in ENCODED_COLUMNS}
+        schema = pa.schema([
+            (column, pa.float64() if column == 'Score' else pa.dictionary(pa.int32(), pa.string()))
+            for column in RESULT_COLUMNS
+        ])
+        with pq.ParquetWriter(path, schema, compression=compression) as writer:
+            for chunk in self._all_chunks():
+                arrays = [
+                    pa.array(chunk['Score']) if column == 'Score'
+                    else pa.DictionaryArray.from_arrays(pa.array(chunk[column]), dictionaries[column])
+                    for column in RESULT_COLUMNS
+                ]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+
+    @classmethod
+    def from_parquet(cls, path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> "ResultStore":
+        """Load a store written by to_parquet (or any Parquet file with the RESULT_COLUMNS)"""
+        import pyarrow.parquet as pq
+
+        store = cls(chunk_rows=chunk_rows)
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=store.chunk_rows, columns=RESULT_COLUMNS):
+            chunk = {'Score': batch.column('Score').to_numpy(zero_copy_only=False).astype(np.float64)}
+            for column in ENCODED_COLUMNS:
+                values = batch.column(column)
+                if not hasattr(values, 'indices'):
+                    values = values.dictionary_encode()
+                # Map the dictionary entries the batch uses onto the store's codes, then
+                # remap all rows at once; unused entries (a filtered categorical, a shared
+                # dictionary) would otherwise become categories without rows
+                indices = values.indices.to_numpy(zero_copy_only=False)
+                dictionary = values.dictionary.to_pylist()
+                used = np.flatnonzero(np.bincount(indices, minlength=len(dictionary)))
+                mapping = np.zeros(len(dictionary), dtype=np.int32)
+                mapping[used] = [store.dictionaries[column].encode(dictionary[i]) for i in used]
+                chunk[column] = mapping[indices]
+            store.chunks.append(chunk)
+            store._sealed_rows += len(chunk['Score'])
+        return store
+
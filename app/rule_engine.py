@@ -0,0 +1,122 @@
+# rule_engine.py - Sparse term-matrix engine behind the rule-based sentiment backend
+#
+# A batch of texts becomes one sparse (texts x vocabulary) presence matrix over
+# the fixed sentiment lexicon. The batch is scanned at once as a NumPy byte
+# array: a lookup table of the words' first two bytes picks the candidate
+# offsets, which are then checked byte by byte per word. The scan has a fixed
+# cost of a few hundred microseconds, so it only pays off above
+# VECTORIZED_MIN_CHARS; smaller inputs go through text_counts(), plain
+# substring tests with the same counting rule. Positive and negative
+# counts are one sparse mat-vec with a (vocabulary x 2) weight matrix;
+# scipy.sparse is used when installed, the NumPy fallback computes the same
+# product from prefix sums.
+import importlib.util
+from typing import Iterable, List, NamedTuple, Tuple
+
+import numpy as np
+
+SCIPY_AVAILABLE = importlib.util.find_spec("scipy") is not None
+
+# Separates texts in the joined batch; never part of a lexicon word
+_BOUNDARY = "\x00"
+
+# Batches with fewer characters are scored text by text with text_counts()
+# (measured crossover ~10k characters, about 128 aspect contexts: see
+# benchmarks/bench_rule_engine.py)
+VECTORIZED_MIN_CHARS = 12000
+
+
+def _byte_pairs(data: np.ndarray) -> np.ndarray:
+    """uint16 code of the two bytes starting at each offset (but the last)"""
+    return data[:-1] | (data[1:].astype(np.uint16) << 8)
+
+
+class TermMatrix(NamedTuple):
+    """Binary CSR matrix: row i holds the vocabulary ids present in text i"""
+    indptr: np.ndarray
+    indices: np.ndarray
+    shape: Tuple[int, int]
+
+    def to_scipy(self):
+        from scipy.sparse import csr_matrix
+        data = np.ones(len(self.indices), dtype=np.float64)
+        return csr_matrix((data, self.indices, self.indptr), shape=self.shape)
+
+
+class LexiconScorer:
+    """
+    Positive / negative lexicon counts for whole batches of texts
+    A word counts once per text when it occurs anywhere in the lowercased text,
+    as a substring (the same rule as `word in text.lower()`)
+    """
+
+    def __init__(self, positive_words: Iterable[str], negative_words: Iterable[str]):
+        positive_words, negative_words = set(positive_words), set(negative_words)
+        self.vocabulary: List[str] = sorted(positive_words | negative_words)
+        if any(len(word.encode('utf-8')) < 2 or _BOUNDARY in word for word in self.vocabulary):
+            raise ValueError("Lexicon words need at least two bytes and no NUL character")
+
+        self.positive_words = tuple(sorted(positive_words))
+        self.negative_words = tuple(sorted(negative_words))
+
+        self.weights = np.zeros((len(self.vocabulary), 2), dtype=np.float64)
+        for i, word in enumerate(self.vocabulary):
+            if word in positive_words:
+                self.weights[i, 0] = 1.0
+            if word in negative_words:
+                self.weights[i, 1] = 1.0
+
+        self._words = [np.frombuffer(word.encode('utf-8'), dtype=np.uint8) for word in self.vocabulary]
+        self._prefixes = np.array([_byte_pairs(word)[0] for word in self._words], dtype=np.uint16)
+        self._prefix_table = np.zeros(1 << 16, dtype=bool)
+        self._prefix_table[self._prefixes] = True
+
+    def text_counts(self, text: str) -> Tuple[int, int]:
+        """(positive, negative) distinct lexicon words in one text, without NumPy"""
+        lowered = text.lower()
+        return (sum(word in lowered for word in self.positive_words),
+                sum(word in lowered for word in self.negative_words))
+
+    def term_matrix(self, texts: List[str]) -> TermMatrix:
+        """Presence matrix of the vocabulary words in each text"""
+        joined = _BOUNDARY.join(texts)
+        if joined.count(_BOUNDARY) >= len(texts):  # a text contains the separator itself
+            joined = _BOUNDARY.join(text.replace(_BOUNDARY, ' ') for text in texts)
+        # UTF-8 is self-synchronizing, so byte matches are exactly character matches
+        data = np.frombuffer((joined + _BOUNDARY).lower().encode('utf-8', 'surrogatepass'), dtype=np.uint8)
+
+        # Offset of the separator after each text: a match before it belongs to that text
+        ends = np.flatnonzero(data == 0)
+        pairs = _byte_pairs(data)
+        candidates = np.flatnonzero(self._prefix_table[pairs])
+        candidate_pairs = pairs[candidates]
+
+        starts, ids = [], []
+        for i, (word, prefix) in enumerate(zip(self._words, self._prefixes)):
+            offsets = candidates[candidate_pairs == prefix]
+            for k in range(2, len(word)):
+                # Never reads past the end: a match stops before the final separator
+                offsets = offsets[data[offsets + k] == word[k]]
+            starts.append(offsets)
+            ids.append(np.full(len(offsets), i, dtype=np.int64))
+        starts, ids = np.concatenate(starts), np.concatenate(ids)
+
+        # Each word once per text, sorted by (row, id)
+        vocabulary_size = len(self.vocabulary)
+        keys = np.unique(np.searchsorted(ends, starts) * vocabulary_size + ids)
+        rows, ids = keys // vocabulary_size, keys % vocabulary_size
+        indptr = np.searchsorted(rows, np.arange(len(texts) + 1))
+        return TermMatrix(indptr, ids.astype(np.int32), (len(texts), vocabulary_size))
+
+    def counts(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """(positive, negative) distinct lexicon words per text"""
+        matrix = self.term_matrix(texts)
+        if SCIPY_AVAILABLE:
+            totals = matrix.to_scipy() @ self.weights
+        else:
+            # CSR mat-vec as differences of prefix sums over each row's slice
+            prefix = np.zeros((len(matrix.indices) + 1, 2))
+            np.cumsum(self.weights[matrix.indices], axis=0, out=prefix[1:])
+            totals = prefix[matrix.indptr[1:]] - prefix[matrix.indptr[:-1]]
+        totals = totals.astype(np.int64)
+        return totals[:, 0], totals[:, 1]
@@ -1,33 +1,216 @@
 # sentiment.py - ML-based sentiment analysis for CV showcase
-import re
-from typing import Dict, List
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+import importlib.util
 import warnings
-warnings.filterwarnings("ignore")
+from functools import lru_cache
 
-# Try to import ML libraries
 try:
-    from textblob import TextBlob
-    TEXTBLOB_AVAILABLE = True
-    print("✅ Using TextBlob ML model")
+    from .profiling import profiled
 except ImportError:
-    TEXTBLOB_AVAILABLE = False
-    print("⚠️ TextBlob not available")
+    from profiling import profiled
 
-try:
-    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-    VADER_AVAILABLE = True
-    print("✅ Using VADER sentiment model")
-except ImportError:
-    VADER_AVAILABLE = False
-    print("⚠️ VADER not available")
+# ML libraries are imported on first use, not at import time: transformers
+# pulls in torch, and most processes only ever need one backend
+def _module_available(name: str) -> bool:
+    """Check that a module is installed without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
 
-try:
-    from transformers import pipeline
-    TRANSFORMERS_AVAILABLE = True
-    print("✅ Transformers available for advanced models")
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
-    print("⚠️ Transformers not available")
+TEXTBLOB_AVAILABLE = _module_available("textblob")
+VADER_AVAILABLE = _module_available("vaderSentiment")
+TRANSFORMERS_AVAILABLE = _module_available("transformers")
+
+@lru_cache(maxsize=None)
+def _load_textblob():
+    """Import TextBlob on first use"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        from textblob import TextBlob
+    return TextBlob
+
+@lru_cache(maxsize=None)
+def _load_vader():
+    """Import the VADER analyzer class on first use"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer
+
+@lru_cache(maxsize=None)
+def _load_transformer_backend():
+    """Import the bucketed transformer backend (transformers, torch / onnxruntime) on first use"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            from .transformer_backend import TransformerBackend
+        except ImportError:
+            from transformer_backend import TransformerBackend
+    return TransformerBackend
+
+@lru_cache(maxsize=None)
+def _rule_engine():
+    """Import the sparse term-matrix engine (NumPy, scipy if installed) on first use"""
+    try:
+        from . import rule_engine
+    except ImportError:
+        import rule_engine
+    return rule_engine
+
+@lru_cache(maxsize=None)
+def _load_lexicon_scorer():
+    """LexiconScorer over the rule-based lexicon, built on first use"""
+    return _rule_engine().LexiconScorer(POSITIVE_WORDS, NEGATIVE_WORDS)
+
+# Lexicon for the rule-based fallback
+POSITIVE_WORDS = frozenset({
+    'excellent', 'great', 'good', 'amazing', 'fantastic', 'wonderful',
+    'perfect', 'love', 'like', 'best', 'awesome', 'outstanding',
+    'recommend', 'satisfied', 'happy', 'pleased', 'fast', 'quick'
+})
+
+NEGATIVE_WORDS = frozenset({
+    'terrible', 'awful', 'bad', 'horrible', 'worst', 'hate',
+    'disappointing', 'poor', 'useless', 'broken', 'slow',
+    'expensive', 'overpriced', 'waste', 'regret', 'avoid'
+})
+
+# Rule-based label by sign(pos - neg) + 1, confidence by min(|pos - neg|, 2)
+_RULE_LABELS = ("NEGATIVE", "NEUTRAL", "POSITIVE")
+_RULE_CONFIDENCES = ("low", "medium", "high")
+
+# Transformer label mapping
+TRANSFORMER_LABELS = {
+    'LABEL_0': 'NEGATIVE',
+    'LABEL_1': 'NEUTRAL', 
+    'LABEL_2': 'POSITIVE',
+    'NEGATIVE': 'NEGATIVE',
+    'POSITIVE': 'POSITIVE',
+    'NEUTRAL': 'NEUTRAL'
+}
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace runs so equivalent texts share one cache entry"""
+    return ' '.join(text.split())
+
+class SentimentCache:
+    """
+    Content-addressed cache for sentiment results
+    - Keyed by a hash of the normalized text plus the model type
+    - Bounded in-memory LRU tier
+    - Optional on-disk sqlite tier that survives restarts
+    - Hit/miss counters for monitoring
+    """
+    
+    def __init__(self, maxsize: int = 10000, path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        
+        if path:
+            # Worker processes may share one file; wait for their writes instead of failing
+            self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment_cache (key TEXT PRIMARY KEY, result TEXT NOT NULL)"
+            )
+            self._db.commit()
+    
+    @staticmethod
+    def make_key(text: str, model_type: str) -> str:
+        """Hash of the model type and the normalized text"""
+        payload = f"{model_type}\0{normalize_text(text)}".encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Cached result for key (a copy), or None on a miss"""
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return dict(result)
+            
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT result FROM sentiment_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    result = json.loads(row[0])
+                    self._remember(key, result)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return dict(result)
+            
+            self.misses += 1
+            return None
+    
+    def put(self, key: str, result: Dict):
+        """Store one result in both tiers"""
+        self.put_many([(key, result)])
+    
+    def put_many(self, items: Iterable[Tuple[str, Dict]]):
+        """Store many results, writing the disk tier in one transaction"""
+        rows = []
+        with self._lock:
+            for key, result in items:
+                self._remember(key, dict(result))
+                if self._db is not None:
+                    rows.append((key, json.dumps(result, default=float)))
+            
+            if rows:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO sentiment_cache (key, result) VALUES (?, ?)", rows
+                )
+                self._db.commit()
+    
+    def _remember(self, key: str, result: Dict):
+        """Insert into the LRU tier, evicting the least recently used entries"""
+        if self.maxsize <= 0:
+            return
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+    
+    def clear(self):
+        """Drop all cached results and reset the counters"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM sentiment_cache")
+                self._db.commit()
+            self.hits = self.misses = self.disk_hits = 0
+    
+    def stats(self) -> Dict:
+        """Hit/miss counters and tier sizes"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "maxsize": self.maxsize,
+            "disk_path": self.path
+        }
+    
+    def close(self):
+        """Close the sqlite tier"""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
 
 class MLSentimentAnalyzer:
     """
@@ -35,49 +218,52 @@ class MLSentimentAnalyzer:
     Shows ML skills while being interview-friendly
     """
     
-    def __init__(self, model_type="auto"):
+    def __init__(self, model_type="auto", cache: Optional["SentimentCache"] = None):
         self.model_type = model_type
         self.model = None
+        self.cache = cache
         self._initialize_model()
     
     def _initialize_model(self):
         """Initialize the best available ML model"""
         if self.model_type == "auto":
             # Auto-select best available model
-            if VADER_AVAILABLE:
-                self.model_type = "vader"
-                self.model = SentimentIntensityAnalyzer()
-                print("🤖 Initialized VADER sentiment model")
-            elif TEXTBLOB_AVAILABLE:
-                self.model_type = "textblob"
+            self.model_type = _auto_model_type()
+            if self.model_type == "vader" and not self._init_vader():
+                self.model_type = "textblob" if TEXTBLOB_AVAILABLE else "rule_based"
+            if self.model_type == "textblob":
                 print("🤖 Initialized TextBlob ML model")
-            else:
-                self.model_type = "rule_based"
+            elif self.model_type == "rule_based":
                 print("🤖 Using rule-based fallback")
         
         elif self.model_type == "vader" and VADER_AVAILABLE:
-            self.model = SentimentIntensityAnalyzer()
-            print("🤖 Initialized VADER sentiment model")
+            self._init_vader()
         
         elif self.model_type == "textblob" and TEXTBLOB_AVAILABLE:
             print("🤖 Initialized TextBlob ML model")
         
         elif self.model_type == "transformers" and TRANSFORMERS_AVAILABLE:
             try:
-                self.model = pipeline(
-                    "sentiment-analysis",
-                    model="cardiffnlp/twitter-roberta-base-sentiment-latest",
-                    return_all_scores=False
-                )
-                print("🤖 Initialized RoBERTa transformer model")
+                # Model path, runtime (torch / int8 / onnx) and token limit come from
+                # SENTIMENT_MODEL_PATH, SENTIMENT_RUNTIME and SENTIMENT_MAX_TOKENS
+                self.model = _load_transformer_backend()()
+                print(f"🤖 Initialized RoBERTa transformer model ({self.model.runtime})")
             except Exception as e:
                 print(f"⚠️ Transformer failed: {e}, falling back to VADER")
-                if VADER_AVAILABLE:
-                    self.model_type = "vader"
-                    self.model = SentimentIntensityAnalyzer()
-                else:
+                self.model_type = "vader"
+                if not (VADER_AVAILABLE and self._init_vader()):
                     self.model_type = "rule_based"
     
+    def _init_vader(self) -> bool:
+        """Load VADER; False if the installed package cannot be imported"""
+        try:
+            self.model = _load_vader()()
+        except ImportError as e:
+            print(f"⚠️ VADER not available: {e}")
+            return False
+        print("🤖 Initialized VADER sentiment model")
+        return True
+    
     def analyze_sentiment(self, text: str) -> Dict:
         """
         Analyze sentiment using ML models
@@ -86,25 +272,109 @@ class MLSentimentAnalyzer:
             Dict with label, score, confidence, and model_used
         """
         if not text or len(text.strip()) < 3:
-            return {
-                "label": "NEUTRAL", 
-                "score": 0.5, 
-                "confidence": "low",
-                "model_used": self.model_type
-            }
+            return self._empty_result()
+        
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(text, self.model_type)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+            text = normalize_text(text)
         
         try:
-            if self.model_type == "vader":
-                return self._analyze_with_vader(text)
-            elif self.model_type == "textblob":
-                return self._analyze_with_textblob(text)
-            elif self.model_type == "transformers":
-                return self._analyze_with_transformers(text)
-            else:
-                return self._analyze_rule_based(text)
+            result = self._dispatch(text)
         except Exception as e:
             print(f"ML model error: {e}, falling back to rule-based")
             return self._analyze_rule_based(text)
+        
+        if key is not None:
+            self.cache.put(key, result)
+        return result
+    
+    def analyze_sentiment_batch(self, texts: List[str], batch_size: int = 32) -> List[Dict]:
+        """
+        Analyze sentiment for many texts in one call
+        
+        Each backend gets a batched path, and the results are identical to
+        calling analyze_sentiment on every text (in the same order). Cached
+        and repeated texts are only scored once.
+        
+        Returns:
+            List of dicts with label, score, confidence, and model_used
+        """
+        results = [None] * len(texts)
+        pending: Dict[str, List[int]] = {}  # text to score -> positions in texts
+        keys: Dict[str, str] = {}
+        
+        for i, text in enumerate(texts):
+            if not text or len(text.strip()) < 3:
+                results[i] = self._empty_result()
+            elif self.cache is None:
+                pending.setdefault(text, []).append(i)
+            else:
+                key = self.cache.make_key(text, self.model_type)
+                cached = self.cache.get(key)
+                if cached is not None:
+                    results[i] = cached
+                else:
+                    text = normalize_text(text)
+                    pending.setdefault(text, []).append(i)
+                    keys[text] = key
+        
+        if not pending:
+            return results
+        
+        batch = list(pending)
+        
+        try:
+            scored = self._dispatch_batch(batch, batch_size)
+        except Exception as e:
+            # Fall back text by text so every result matches analyze_sentiment
+            print(f"ML batch error: {e}, scoring texts one at a time")
+            scored = [self.analyze_sentiment(text) for text in batch]
+        else:
+            if self.cache is not None:
+                self.cache.put_many((keys[text], result) for text, result in zip(batch, scored))
+        
+        for text, result in zip(batch, scored):
+            positions = pending[text]
+            results[positions[0]] = result
+            for i in positions[1:]:
+                results[i] = dict(result)
+        
+        return results
+    
+    def _dispatch(self, text: str) -> Dict:
+        """Score one text with the configured backend"""
+        if self.model_type == "vader":
+            return self._analyze_with_vader(text)
+        elif self.model_type == "textblob":
+            return self._analyze_with_textblob(text)
+        elif self.model_type == "transformers":
+            return self._analyze_with_transformers(text)
+        else:
+            return self._analyze_rule_based(text)
+    
+    def _dispatch_batch(self, texts: List[str], batch_size: int) -> List[Dict]:
+        """Score a batch of texts with the configured backend's batched path"""
+        if self.model_type == "vader":
+            return self._analyze_batch_with_vader(texts)
+        elif self.model_type == "textblob":
+            return [self._analyze_with_textblob(text) for text in texts]
+        elif self.model_type == "transformers":
+            return self._analyze_batch_with_transformers(texts, batch_size)
+        else:
+            return self._analyze_rule_based_batch(texts)
+    
+    def _empty_result(self) -> Dict:
+        """Neutral result for empty or too-short texts"""
+        return {
+            "label": "NEUTRAL", 
+            "score": 0.5, 
+            "confidence": "low",
+            "model_used": self.model_type
+        }
     
     def _analyze_with_vader(self, text: str) -> Dict:
         """
@@ -113,7 +383,17 @@ class MLSentimentAnalyzer:
         - Handles negations, intensifiers, and punctuation
         - Good for product reviews
         """
-        scores = self.model.polarity_scores(text)
+        return self._vader_result(self.model.polarity_scores(text))
+    
+    def _analyze_batch_with_vader(self, texts: List[str]) -> List[Dict]:
+        """VADER over a batch, reusing one analyzer and one bound method"""
+        polarity_scores = self.model.polarity_scores
+        vader_result = self._vader_result
+        return [vader_result(polarity_scores(text)) for text in texts]
+    
+    @staticmethod
+    def _vader_result(scores: Dict) -> Dict:
+        """Convert VADER polarity scores into a sentiment result"""
         compound = scores['compound']
         
         # VADER returns compound score from -1 to 1
@@ -144,7 +424,7 @@ class MLSentimentAnalyzer:
         - Uses Naive Bayes classifier trained on movie reviews
         - Simple but effective ML approach
         """
-        blob = TextBlob(text)
+        blob = _load_textblob()(text)
         polarity = blob.sentiment.polarity  # -1 to 1
         
         # Convert polarity to label and score
@@ -175,21 +455,18 @@ class MLSentimentAnalyzer:
         - State-of-the-art deep learning model
         - Pre-trained on large Twitter dataset
         """
-        # Truncate text for transformer limits
-        text = text[:512]
-        result = self.model(text)[0]
-        
-        # Map transformer labels
-        label_mapping = {
-            'LABEL_0': 'NEGATIVE',
-            'LABEL_1': 'NEUTRAL', 
-            'LABEL_2': 'POSITIVE',
-            'NEGATIVE': 'NEGATIVE',
-            'POSITIVE': 'POSITIVE',
-            'NEUTRAL': 'NEUTRAL'
-        }
-        
-        label = label_mapping.get(result['label'], result['label'])
+        # Truncated to the model's token limit inside the backend
+        return self._transformer_result(self.model.predict([text])[0])
+    
+    def _analyze_batch_with_transformers(self, texts: List[str], batch_size: int) -> List[Dict]:
+        """Score the texts in length-bucketed batches instead of one at a time"""
+        predictions = self.model.predict(texts, batch_size=batch_size)
+        return [self._transformer_result(result) for result in predictions]
+    
+    @staticmethod
+    def _transformer_result(result: Dict) -> Dict:
+        """Convert a transformer prediction into a sentiment result"""
+        label = TRANSFORMER_LABELS.get(result['label'], result['label'])
         score = result['score']
         confidence = "high" if score > 0.8 else "medium" if score > 0.6 else "low"
         
@@ -203,53 +480,134 @@ class MLSentimentAnalyzer:
     
     def _analyze_rule_based(self, text: str) -> Dict:
         """Fallback rule-based analysis"""
-        text_lower = text.lower()
-        
-        positive_words = {
-            'excellent', 'great', 'good', 'amazing', 'fantastic', 'wonderful',
-            'perfect', 'love', 'like', 'best', 'awesome', 'outstanding',
-            'recommend', 'satisfied', 'happy', 'pleased', 'fast', 'quick'
-        }
-        
-        negative_words = {
-            'terrible', 'awful', 'bad', 'horrible', 'worst', 'hate',
-            'disappointing', 'poor', 'useless', 'broken', 'slow',
-            'expensive', 'overpriced', 'waste', 'regret', 'avoid'
-        }
-        
-        pos_count = sum(1 for word in positive_words if word in text_lower)
-        neg_count = sum(1 for word in negative_words if word in text_lower)
+        pos_count, neg_count = _load_lexicon_scorer().text_counts(text)
+        return _rule_based_result(pos_count, neg_count)
+    
+    def _analyze_rule_based_batch(self, texts: List[str]) -> List[Dict]:
+        """
+        Rule-based analysis of a batch
+        Small batches are scored text by text; from VECTORIZED_MIN_CHARS on,
+        the whole batch goes through the sparse term-matrix scan
+        """
+        scorer = _load_lexicon_scorer()
+        if sum(map(len, texts)) < _rule_engine().VECTORIZED_MIN_CHARS:
+            return [_rule_based_result(*scorer.text_counts(text)) for text in texts]
+        return self._vectorized_rule_based(texts)
+    
+    def _vectorized_rule_based(self, texts: List[str]) -> List[Dict]:
+        """
+        Vectorized rule-based analysis
+        - One lexicon scan over the whole batch into a sparse term-count matrix
+        - Positive / negative counts from one sparse mat-vec (rule_engine.py)
+        - Labels, scores and confidences computed with NumPy over the batch,
+          with the thresholds of _rule_based_result
+        """
+        import numpy as np
         
-        if pos_count > neg_count:
-            label = "POSITIVE"
-            score = min(0.6 + (pos_count * 0.1), 0.95)
-        elif neg_count > pos_count:
-            label = "NEGATIVE"
-            score = min(0.6 + (neg_count * 0.1), 0.95)
-        else:
-            label = "NEUTRAL"
-            score = 0.5
+        if not texts:
+            return []
+        pos, neg = _load_lexicon_scorer().counts(texts)
         
-        difference = abs(pos_count - neg_count)
-        confidence = "high" if difference >= 2 else "medium" if difference >= 1 else "low"
+        diff = pos - neg
+        # Labels and confidences as small integer codes, mapped to strings once per row
+        labels = np.sign(diff) + 1
+        scores = np.where(diff == 0, 0.5, np.minimum(0.6 + (np.maximum(pos, neg) * 0.1), 0.95))
+        confidences = np.minimum(np.abs(diff), 2)
         
-        return {
-            "label": label,
-            "score": score,
-            "confidence": confidence,
-            "model_used": "Rule-based (Fallback)"
-        }
+        return [
+            {
+                "label": _RULE_LABELS[label],
+                "score": score,
+                "confidence": _RULE_CONFIDENCES[confidence],
+                "model_used": "Rule-based (Fallback)"
+            }
+            for label, score, confidence in zip(labels.tolist(), scores.tolist(), confidences.tolist())
+        ]
+
+def _rule_based_result(pos_count: int, neg_count: int) -> Dict:
+    """Rule-based result for one text's positive / negative lexicon counts"""
+    if pos_count > neg_count:
+        label = "POSITIVE"
+        score = min(0.6 + (pos_count * 0.1), 0.95)
+    elif neg_count > pos_count:
+        label = "NEGATIVE"
+        score = min(0.6 + (neg_count * 0.1), 0.95)
+    else:
+        label = "NEUTRAL"
+        score = 0.5
+    
+    difference = abs(pos_count - neg_count)
+    confidence = "high" if difference >= 2 else "medium" if difference >= 1 else "low"
+    
+    return {
+        "label": label,
+        "score": score,
+        "confidence": confidence,
+        "model_used": "Rule-based (Fallback)"
+    }
+
+def combine_sentiments(results: List[Dict], weights: Optional[List[float]] = None) -> Dict:
+    """
+    One review-level result from sentence results
+    - each result becomes a signed strength in [-1, 1] (2 * score - 1, negated
+      for NEGATIVE, 0 for NEUTRAL); for VADER this is the compound score again
+    - the weighted mean strength (weights: e.g. sentence lengths) is labelled
+      with VADER's +/-0.05 thresholds and 0.5 / 0.1 confidence cut-offs
+    A single result is returned as it is.
+    """
+    if len(results) == 1:
+        return dict(results[0])
+    weights = weights or [1.0] * len(results)
+    total_weight = sum(weights) or 1.0
+    polarity = 0.0
+    for result, weight in zip(results, weights):
+        strength = 2 * result['score'] - 1
+        if result['label'] == 'NEGATIVE':
+            polarity -= strength * weight
+        elif result['label'] == 'POSITIVE':
+            polarity += strength * weight
+    polarity /= total_weight
+    
+    if polarity >= 0.05:
+        label = "POSITIVE"
+    elif polarity <= -0.05:
+        label = "NEGATIVE"
+    else:
+        label = "NEUTRAL"
+    score = (abs(polarity) + 1) / 2 if label != "NEUTRAL" else 0.5
+    confidence = "high" if abs(polarity) > 0.5 else "medium" if abs(polarity) > 0.1 else "low"
+    
+    return {
+        "label": label,
+        "score": float(score),
+        "confidence": confidence,
+        "model_used": results[0].get('model_used', 'Unknown') if results else 'Unknown',
+        "sentences": len(results)
+    }
 
 # Global analyzer instance
 analyzer = None
 
+def get_default_cache() -> Optional[SentimentCache]:
+    """
+    Cache for the global analyzer, configured from the environment
+    - SENTIMENT_CACHE_SIZE: in-memory entries (0 disables caching, default 10000)
+    - SENTIMENT_CACHE_PATH: sqlite file for the on-disk tier (optional)
+    """
+    maxsize = int(os.getenv('SENTIMENT_CACHE_SIZE', '10000'))
+    path = os.getenv('SENTIMENT_CACHE_PATH') or None
+    if maxsize <= 0 and not path:
+        return None
+    return SentimentCache(maxsize=maxsize, path=path)
+
 def get_analyzer():
     """Get global ML analyzer instance"""
     global analyzer
     if analyzer is None:
-        analyzer = MLSentimentAnalyzer()
+        analyzer = MLSentimentAnalyzer(cache=get_default_cache())
     return analyzer
 
+@profiled("analyze_sentiment")
 def analyze_sentiment(text: str) -> Dict:
     """
     Main sentiment analysis function
@@ -257,16 +615,36 @@ def analyze_sentiment(text: str) -> Dict:
     """
     return get_analyzer().analyze_sentiment(text)
 
+@profiled("analyze_sentiment_batch")
+def analyze_sentiment_batch(texts: List[str], batch_size: int = 32) -> List[Dict]:
+    """
+    Batch version of analyze_sentiment
+    Scores all texts with the best available ML model in one call
+    """
+    return get_analyzer().analyze_sentiment_batch(texts, batch_size=batch_size)
+
+def _auto_model_type() -> str:
+    """Backend that "auto" resolves to, decided without importing anything"""
+    if VADER_AVAILABLE:
+        return "vader"
+    if TEXTBLOB_AVAILABLE:
+        return "textblob"
+    return "rule_based"
+
 def get_model_info() -> Dict:
-    """Get information about the current model"""
-    current_analyzer = get_analyzer()
+    """
+    Get information about the current model
+    Availability comes from importlib.util.find_spec, so no backend is loaded
+    """
+    current_analyzer = analyzer
     return {
-        "model_type": current_analyzer.model_type,
+        "model_type": current_analyzer.model_type if current_analyzer is not None else _auto_model_type(),
         "available_models": {
             "VADER": VADER_AVAILABLE,
             "TextBlob": TEXTBLOB_AVAILABLE, 
             "Transformers": TRANSFORMERS_AVAILABLE
-        }
+        },
+        "cache": current_analyzer.cache.stats() if current_analyzer is not None and current_analyzer.cache is not None else None
     }
 
 # Test the implementation
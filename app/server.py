@@ -0,0 +1,388 @@
+# server.py - Local micro-batching inference server for sentiment scoring
+#
+#   python -m app.server --port 8765                 # HTTP on localhost
+#   python -m app.server --unix /tmp/sentiment.sock  # HTTP over a Unix socket
+#
+# One warm MLSentimentAnalyzer per host. Concurrent requests are queued and
+# coalesced into micro-batches for analyze_sentiment_batch:
+#   POST /sentiment   {"text": "..."}              -> sentiment result
+#   POST /analyze     {"review": "...", "source"}  -> aspect result rows
+#   GET  /metrics                                  -> Prometheus text format
+#   GET  /health
+import argparse
+import asyncio
+import contextlib
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .sentiment import MLSentimentAnalyzer, get_default_cache
+    from .pipeline import aspect_contexts, build_rows
+    from .aspect_extractor import extract_aspects
+    from .tokenizer import tokenize
+    from .profiling import prometheus_text
+except ImportError:
+    from sentiment import MLSentimentAnalyzer, get_default_cache
+    from pipeline import aspect_contexts, build_rows
+    from aspect_extractor import extract_aspects
+    from tokenizer import tokenize
+    from profiling import prometheus_text
+
+DEFAULT_MAX_BATCH = 64
+DEFAULT_MAX_WAIT_MS = 5.0
+DEFAULT_MAX_QUEUE = 2048
+
+# Upper bounds of the batch-size histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+MAX_BODY_BYTES = 1 << 20
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class Overloaded(Exception):
+    """The queue is full; the client should back off and retry"""
+
+
+class Histogram:
+    """Cumulative Prometheus-style histogram"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def lines(self, name: str) -> List[str]:
+        lines = [f'{name}_bucket{{le="{bound}"}} {count}' for bound, count in zip(self.buckets, self.counts)]
+        lines.append(f'{name}_bucket{{le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum {self.sum}")
+        lines.append(f"{name}_count {self.count}")
+        return lines
+
+
+class MicroBatcher:
+    """
+    Coalesces single-text scoring requests into batches
+    - a batch is sent as soon as max_batch texts are waiting, or max_wait_ms
+      after its first text arrived, whichever comes first
+    - at most max_queue texts wait; beyond that submit_many() raises Overloaded
+    - batches run one at a time on a dedicated thread, so the event loop keeps
+      accepting (and rejecting) requests while the model works
+    """
+
+    def __init__(self, analyzer: MLSentimentAnalyzer, max_batch: int = DEFAULT_MAX_BATCH,
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS, max_queue: int = DEFAULT_MAX_QUEUE):
+        self.analyzer = analyzer
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.max_queue = max(1, max_queue)
+        self._pending: deque = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sentiment-batch")
+        self._task: Optional[asyncio.Task] = None
+        self.texts_total = 0
+        self.rejected_total = 0
+        self.batches = Histogram(BATCH_SIZE_BUCKETS)
+        self.batch_seconds = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    def start(self):
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        self._executor.shutdown(wait=True)
+
+    def submit_many(self, texts: List[str]) -> List[asyncio.Future]:
+        """Queue texts for scoring; all of them are accepted or none is"""
+        if len(self._pending) + len(texts) > self.max_queue:
+            self.rejected_total += len(texts)
+            raise Overloaded(f"{len(self._pending)} texts queued (limit {self.max_queue})")
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self._pending.append((text, future))
+            futures.append(future)
+        self.texts_total += len(texts)
+        self._wakeup.set()
+        return futures
+
+    async def score(self, text: str) -> Dict:
+        return await self.submit_many([text])[0]
+
+    async def score_many(self, texts: List[str]) -> List[Dict]:
+        return list(await asyncio.gather(*self.submit_many(texts)))
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+
+            # Latency window: give concurrent requests a chance to join the batch
+            deadline = loop.time() + self.max_wait
+            while len(self._pending) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                self._wakeup.clear()
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), remaining)
+
+            batch = [self._pending.popleft() for _ in range(min(self.max_batch, len(self._pending)))]
+            batch = [(text, future) for text, future in batch if not future.cancelled()]
+            if not batch:
+                continue
+
+            start = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(
+                    self._executor, self.analyzer.analyze_sentiment_batch, [text for text, _ in batch]
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+            self.batch_seconds += time.perf_counter() - start
+            self.batches.observe(len(batch))
+
+
+def _aspects_and_contexts(review: str) -> Tuple[List[str], List[str]]:
+    tokens = tokenize(review)
+    aspects = extract_aspects(review, tokens)
+    return aspects, aspect_contexts(review, tokens, aspects)
+
+
+class SentimentServer:
+    """Minimal HTTP/1.1 front end (keep-alive, JSON bodies) for a MicroBatcher"""
+
+    def __init__(self, batcher: MicroBatcher):
+        self.batcher = batcher
+        self.requests_total: Dict[Tuple[str, int], int] = {}
+        self.started = time.time()
+
+    # ------------------------------------------------------------------
+    # Handlers
+    # ------------------------------------------------------------------
+    async def handle_sentiment(self, body: Dict) -> Tuple[int, object]:
+        text = body.get('text')
+        if not isinstance(text, str):
+            return 400, {'error': '"text" must be a string'}
+        return 200, await self.batcher.score(text)
+
+    async def handle_analyze(self, body: Dict) -> Tuple[int, object]:
+        """
+        Aspects and contexts are found on a worker thread (the event loop keeps
+        serving other connections); the contexts are scored in the shared batches
+        """
+        review = body.get('review')
+        if not isinstance(review, str):
+            return 400, {'error': '"review" must be a string'}
+        source = str(body.get('source') or 'API')
+        aspects, contexts = await asyncio.get_running_loop().run_in_executor(None, _aspects_and_contexts, review)
+        scored = await self.batcher.score_many([review] + contexts)
+        overall, sentiments = scored[0], scored[1:]
+        return 200, {'overall': overall, 'aspects': aspects,
+                     'rows': [dict(row) for row in build_rows(review, source, aspects, contexts, sentiments)]}
+
+    def metrics_text(self) -> str:
+        batcher = self.batcher
+        lines = [
+            "# HELP sentiment_queue_depth Texts waiting for a batch",
+            "# TYPE sentiment_queue_depth gauge",
+            f"sentiment_queue_depth {batcher.queue_depth}",
+            "# HELP sentiment_texts_total Texts accepted for scoring",
+            "# TYPE sentiment_texts_total counter",
+            f"sentiment_texts_total {batcher.texts_total}",
+            "# HELP sentiment_rejected_total Texts rejected with 503 because the queue was full",
+            "# TYPE sentiment_rejected_total counter",
+            f"sentiment_rejected_total {batcher.rejected_total}",
+            "# HELP sentiment_batch_seconds_total Time spent scoring batches",
+            "# TYPE sentiment_batch_seconds_total counter",
+            f"sentiment_batch_seconds_total {batcher.batch_seconds}",
+            "# HELP sentiment_batch_size Texts per scored batch",
+            "# TYPE sentiment_batch_size histogram",
+            *batcher.batches.lines("sentiment_batch_size"),
+            "# HELP sentiment_http_requests_total HTTP requests by path and status",
+            "# TYPE sentiment_http_requests_total counter",
+        ]
+        for (path, status), count in sorted(self.requests_total.items()):
+            lines.append(f'sentiment_http_requests_total{{path="{path}",status="{status}"}} {count}')
+        # Per-stage latency of the pipeline functions behind the handlers
+        return "\n".join(lines) + "\n" + prometheus_text()
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, object]:
+        if path == '/health':
+            return 200, {'status': 'ok', 'model': self.batcher.analyzer.model_type,
+                         'uptime_seconds': time.time() - self.started}
+        if path == '/metrics':
+            return 200, self.metrics_text()
+        handler = {'/sentiment': self.handle_sentiment, '/analyze': self.handle_analyze}.get(path)
+        if handler is None:
+            return 404, {'error': f'unknown path {path}'}
+        if method != 'POST':
+            return 405, {'error': 'use POST'}
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError as e:
+            return 400, {'error': f'invalid JSON: {e}'}
+        if not isinstance(payload, dict):
+            return 400, {'error': 'body must be a JSON object'}
+        try:
+            return await handler(payload)
+        except Overloaded as e:
+            return 503, {'error': f'overloaded: {e}'}
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, {'error': 'malformed request line'}, keep_alive=False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                raw_length = headers.get('content-length') or '0'
+                if not (raw_length.isascii() and raw_length.isdigit()):
+                    await self._respond(writer, 400, {'error': f'invalid Content-Length: {raw_length!r}'},
+                                        keep_alive=False)
+                    break
+                length = int(raw_length)
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {'error': 'body too large'}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                path = target.split('?', 1)[0]
+                try:
+                    status, payload = await self.dispatch(method.upper(), path, body)
+                except Exception as e:
+                    status, payload = 500, {'error': str(e)}
+                key = (path, status)
+                self.requests_total[key] = self.requests_total.get(key, 0) + 1
+
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload, keep_alive: bool):
+        if isinstance(payload, str):
+            data = payload.encode('utf-8')
+            content_type = 'text/plain; version=0.0.4'
+        else:
+            data = json.dumps(payload).encode('utf-8')
+            content_type = 'application/json'
+        head = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+                f"Content-Type: {content_type}",
+                f"Content-Length: {len(data)}",
+                f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if status == 503:
+            head.append("Retry-After: 1")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode('latin-1') + data)
+        await writer.drain()
+
+
+async def start_server(host: str = '127.0.0.1', port: int = 8765, unix_path: Optional[str] = None,
+                       model_type: str = 'auto', max_batch: int = DEFAULT_MAX_BATCH,
+                       max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+                       max_queue: int = DEFAULT_MAX_QUEUE) -> Tuple[asyncio.AbstractServer, MicroBatcher]:
+    """Load the analyzer once, start batching and listening; returns the server and its batcher"""
+    analyzer = MLSentimentAnalyzer(model_type, cache=get_default_cache())
+    batcher = MicroBatcher(analyzer, max_batch, max_wait_ms, max_queue)
+    app = SentimentServer(batcher)
+    batcher.start()
+
+    if unix_path:
+        server = await asyncio.start_unix_server(app.handle_connection, path=unix_path)
+        where = unix_path
+    else:
+        server = await asyncio.start_server(app.handle_connection, host, port)
+        where = "http://%s:%d" % server.sockets[0].getsockname()[:2]
+    print(f"🚀 Serving {analyzer.model_type} sentiment on {where} "
+          f"(batch ≤ {batcher.max_batch}, window {max_wait_ms:g} ms, queue ≤ {batcher.max_queue})",
+          file=sys.stderr)
+    return server, batcher
+
+
+async def serve(*args, **kwargs):
+    """Run start_server(...) until cancelled"""
+    server, batcher = await start_server(*args, **kwargs)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.server",
+        description="Local sentiment inference server with micro-batching"
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="Listen on this Unix socket instead of TCP")
+    parser.add_argument('--model', default='auto', choices=('auto', 'vader', 'textblob', 'transformers', 'rule_based'))
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH, help="Texts per batch at most")
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help="How long a batch waits for more texts after its first one")
+    parser.add_argument('--max-queue', type=int, default=DEFAULT_MAX_QUEUE,
+                        help="Queued texts before requests are rejected with 503")
+    args = parser.parse_args(argv)
+
+    with contextlib.redirect_stdout(sys.stderr), contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve(args.host, args.port, args.unix, args.model,
+                          args.max_batch, args.max_wait_ms, args.max_queue))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
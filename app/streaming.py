@@ -0,0 +1,357 @@
+# streaming.py - Bounded-memory streaming pipeline for very large review dumps
+#
+#   python -m app.streaming reviews.jsonl -o results.csv
+#   python -m app.streaming reviews.jsonl -o results.csv --resume   # continue after an interruption
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, TextIO
+
+try:
+    from .batch import ExportWriter, _detect_format, review_text_from_record
+    from .pipeline import aspect_contexts, build_rows
+    from .aspect_extractor import extract_aspects
+    from .sentiment import analyze_sentiment_batch
+    from .tokenizer import tokenize
+    from .utils import preprocess_text_for_ml, validate_review_text, format_time
+except ImportError:
+    from batch import ExportWriter, _detect_format, review_text_from_record
+    from pipeline import aspect_contexts, build_rows
+    from aspect_extractor import extract_aspects
+    from sentiment import analyze_sentiment_batch
+    from tokenizer import tokenize
+    from utils import preprocess_text_for_ml, validate_review_text, format_time
+
+# Items buffered between two stages; memory stays bounded by this, not by the input size
+DEFAULT_QUEUE_SIZE = 256
+
+# Reviews whose contexts are scored together in one analyze_sentiment_batch call
+DEFAULT_SCORE_BATCH = 64
+
+_DONE = object()
+
+
+class StreamItem:
+    """One review travelling through the stages"""
+
+    __slots__ = ('number', 'position', 'source', 'review', 'text', 'aspects', 'contexts', 'rows')
+
+    def __init__(self, number: int, position: int, source: str, review: str):
+        self.number = number      # 1-based record number in the input
+        self.position = position  # where the next record starts (byte offset, or record count for CSV)
+        self.source = source
+        self.review = review
+        self.text = None          # cleaned text, None when the review was rejected
+        self.aspects = []
+        self.contexts = []
+        self.rows = []
+
+
+class _StageError:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def buffered(items: Iterable, maxsize: int = DEFAULT_QUEUE_SIZE) -> Iterator:
+    """
+    Run an upstream stage in its own thread behind a bounded queue
+    The producer blocks when the queue is full, so a fast stage can never
+    run more than maxsize items ahead of a slow one. Errors are re-raised
+    in the consumer.
+    """
+    buffer = queue.Queue(maxsize)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put(item):
+                    break
+            else:
+                put(_DONE)
+        except BaseException as e:
+            put(_StageError(e))
+        finally:
+            if hasattr(items, 'close'):
+                items.close()
+
+    thread = threading.Thread(target=produce, name="stream-stage", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _StageError):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+# ---------------------------------------------------------------------------
+# Stages
+# ---------------------------------------------------------------------------
+def read_stage(path: str, input_format: str, position: int = 0, records_done: int = 0,
+               text_field: Optional[str] = None, source_field: Optional[str] = None) -> Iterator[StreamItem]:
+    """
+    Stream records from the input, starting at a checkpoint
+    - txt / jsonl: seeks straight to the saved byte offset
+    - csv: quoted fields may span lines, so the saved record count is skipped
+    Input must be UTF-8: invalid bytes raise UnicodeDecodeError, as in batch.read_reviews
+    """
+    name = os.path.basename(path)
+    number = records_done
+
+    if input_format == 'csv':
+        with open(path, encoding='utf-8', newline='') as handle:
+            dialect = 'excel-tab' if name.lower().endswith('.tsv') else 'excel'
+            for record in islice(csv.DictReader(handle, dialect=dialect), position, None):
+                number += 1
+                review = str(review_text_from_record(record, text_field)).strip()
+                source = str(record.get(source_field) or '') if source_field else ''
+                yield StreamItem(number, number, source or f"{name}:{number}", review)
+        return
+
+    with open(path, 'rb') as handle:
+        handle.seek(position)
+        for raw in handle:
+            position += len(raw)
+            line = raw.decode('utf-8').strip()
+            number += 1
+            source = ''
+            if input_format == 'jsonl' and line:
+                record = json.loads(line)
+                review = str(review_text_from_record(record, text_field)).strip()
+                source = str(record.get(source_field) or '') if source_field else ''
+            else:
+                review = line
+            yield StreamItem(number, position, source or f"{name}:{number}", review)
+
+
+def clean_stage(items: Iterable[StreamItem]) -> Iterator[StreamItem]:
+    """Preprocess each review and reject the ones that fail validation"""
+    for item in items:
+        if item.review:
+            text = preprocess_text_for_ml(item.review)
+            is_valid, _ = validate_review_text(text)
+            item.text = text if is_valid else None
+        yield item
+
+
+def extract_stage(items: Iterable[StreamItem]) -> Iterator[StreamItem]:
+    """Aspects and their contexts for every accepted review"""
+    for item in items:
+        if item.text:
+            tokens = tokenize(item.text)
+            item.aspects = extract_aspects(item.text, tokens)
+            item.contexts = aspect_contexts(item.text, tokens, item.aspects)
+        yield item
+
+
+def _score_items(chunk: List[StreamItem], context_chars: Optional[int]):
+    contexts = [context for item in chunk for context in item.contexts]
+    sentiments = analyze_sentiment_batch(contexts) if contexts else []
+    start = 0
+    for item in chunk:
+        end = start + len(item.contexts)
+        if item.contexts:
+            item.rows = build_rows(item.review, item.source, item.aspects, item.contexts,
+                                   sentiments[start:end], context_chars)
+        start = end
+
+
+def score_stage(items: Iterable[StreamItem], context_chars: Optional[int] = None,
+                batch_size: int = DEFAULT_SCORE_BATCH) -> Iterator[StreamItem]:
+    """
+    Score the aspect contexts and turn each item into result rows
+    The contexts of batch_size reviews go through one analyze_sentiment_batch
+    call (vectorized backends, repeated contexts scored once)
+    """
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= batch_size:
+            _score_items(chunk, context_chars)
+            yield from chunk
+            chunk = []
+    if chunk:
+        _score_items(chunk, context_chars)
+        yield from chunk
+
+
+# ---------------------------------------------------------------------------
+# Checkpoints
+# ---------------------------------------------------------------------------
+def load_checkpoint(path: str) -> Optional[dict]:
+    """Saved progress, or None when there is no checkpoint yet"""
+    try:
+        with open(path, encoding='utf-8') as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return None
+
+
+def save_checkpoint(path: str, state: dict):
+    """Write the checkpoint atomically, so a crash never leaves half a file"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as handle:
+        json.dump(state, handle)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temp_path, path)
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+def run_stream(input_path: str, output_path: str, input_format: str = 'auto', output_format: Optional[str] = None,
+               checkpoint_path: Optional[str] = None, resume: bool = False,
+               text_field: Optional[str] = None, source_field: Optional[str] = None,
+               include_metadata: bool = True, chunk_size: int = 1000, queue_size: int = DEFAULT_QUEUE_SIZE,
+               context_chars: Optional[int] = None, progress_every: int = 10000,
+               score_batch: int = DEFAULT_SCORE_BATCH, log: Optional[TextIO] = None) -> dict:
+    """
+    Read -> clean -> extract -> score -> write, one thread per stage with bounded queues
+    - rows are written every chunk_size rows; after each write the checkpoint records
+      the input position of the last written review and the output size
+    - resume=True continues from the checkpoint: the output is cut back to the
+      checkpointed size (dropping rows written after it) and reading restarts
+      at the saved position, so every review appears exactly once; a missing or
+      shorter output discards the checkpoint and the run starts over
+    Returns stats: reviews, skipped, rows, seconds, reviews_per_second
+    """
+    log = log or sys.stderr
+    input_format = input_format if input_format != 'auto' else _detect_format(input_path, 'txt')
+    output_format = output_format or ('jsonl' if _detect_format(output_path, 'csv') == 'jsonl' else 'csv')
+    checkpoint_path = checkpoint_path or f"{output_path}.checkpoint"
+
+    state = {
+        'input': os.path.abspath(input_path),
+        'output': os.path.abspath(output_path),
+        'position': 0,
+        'records': 0,
+        'rows': 0,
+        'output_bytes': 0,
+        'done': False,
+    }
+    saved = load_checkpoint(checkpoint_path) if resume else None
+    if saved:
+        if saved.get('input') != state['input']:
+            raise ValueError(f"Checkpoint {checkpoint_path} belongs to {saved.get('input')}, not {state['input']}")
+        output_size = os.path.getsize(output_path) if os.path.exists(output_path) else -1
+        if output_size < saved.get('output_bytes', 0):
+            # Rows the checkpoint counts as written are gone: resuming would pad the file with NULs
+            print(f"⚠️ {output_path} is missing or shorter than checkpointed, starting from the beginning", file=log)
+            saved = None
+        else:
+            state.update(saved)
+            print(f"⏩ Resuming at record {state['records']} ({state['rows']} rows already written)", file=log)
+
+    mode = 'r+' if saved else 'w'
+    with open(output_path, mode, encoding='utf-8', newline='' if output_format == 'csv' else None) as output:
+        output.truncate(state['output_bytes'])
+        output.seek(0, io.SEEK_END)
+        writer = ExportWriter(output, output_format, include_metadata, header=state['output_bytes'] == 0)
+
+        items = read_stage(input_path, input_format, state['position'], state['records'], text_field, source_field)
+        items = score_stage(buffered(extract_stage(buffered(clean_stage(buffered(items, queue_size)), queue_size)),
+                                     queue_size), context_chars, max(1, score_batch))
+
+        reviews = skipped = 0
+        rows_before = state['rows']
+        pending = []
+        last_item = None
+        start_time = time.time()
+
+        def flush():
+            writer.write(pending)
+            pending.clear()
+            if last_item is not None:
+                state.update(position=last_item.position, records=last_item.number,
+                             rows=rows_before + writer.rows_written,
+                             output_bytes=os.fstat(output.fileno()).st_size)
+            save_checkpoint(checkpoint_path, state)
+
+        for item in buffered(items, queue_size):
+            reviews += 1
+            skipped += item.text is None
+            pending.extend(item.rows)
+            last_item = item
+            if len(pending) >= chunk_size:
+                flush()
+            if progress_every and reviews % progress_every == 0:
+                elapsed = time.time() - start_time
+                print(f"📊 {item.number} records, {rows_before + writer.rows_written + len(pending)} rows "
+                      f"({reviews / elapsed:.1f} reviews/s)", file=log)
+
+        state['done'] = True
+        flush()
+
+    elapsed = time.time() - start_time
+    stats = {
+        'reviews': reviews,
+        'skipped': skipped,
+        'rows': writer.rows_written,
+        'seconds': elapsed,
+        'reviews_per_second': reviews / elapsed if elapsed > 0 else 0.0,
+    }
+    print(f"🎉 Streamed {reviews} reviews ({skipped} skipped) -> {stats['rows']} aspect rows "
+          f"in {format_time(elapsed)} ({stats['reviews_per_second']:.1f} reviews/s)", file=log)
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.streaming",
+        description="Stream a large review dump through the aspect sentiment pipeline in constant memory"
+    )
+    parser.add_argument('input', help="Review dump (JSONL, CSV or one review per line)")
+    parser.add_argument('-o', '--output', required=True, help="Output file (.csv or .jsonl)")
+    parser.add_argument('--input-format', choices=('auto', 'jsonl', 'csv', 'txt'), default='auto')
+    parser.add_argument('--output-format', choices=('csv', 'jsonl'))
+    parser.add_argument('--checkpoint', help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument('--resume', action='store_true', help="Continue from the checkpoint of an interrupted run")
+    parser.add_argument('--text-field', help="JSONL key / CSV column with the review text")
+    parser.add_argument('--source-field', help="JSONL key / CSV column used as the Source value")
+    parser.add_argument('--no-metadata', action='store_true', help="Skip the export metadata columns")
+    parser.add_argument('--chunk-size', type=int, default=1000, help="Rows per write and checkpoint (default 1000)")
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+                        help=f"Reviews buffered between stages (default {DEFAULT_QUEUE_SIZE})")
+    parser.add_argument('--context-chars', type=int, help="Shorten stored contexts to this many characters")
+    parser.add_argument('--score-batch', type=int, default=DEFAULT_SCORE_BATCH,
+                        help=f"Reviews scored per sentiment batch (default {DEFAULT_SCORE_BATCH})")
+    parser.add_argument('--progress-every', type=int, default=10000,
+                        help="Report throughput every N reviews on stderr (0 disables)")
+    args = parser.parse_args(argv)
+
+    with contextlib.redirect_stdout(sys.stderr):
+        run_stream(args.input, args.output, args.input_format, args.output_format,
+                   checkpoint_path=args.checkpoint, resume=args.resume,
+                   text_field=args.text_field, source_field=args.source_field,
+                   include_metadata=not args.no_metadata, chunk_size=max(1, args.chunk_size),
+                   queue_size=max(1, args.queue_size), context_chars=args.context_chars,
+                   progress_every=args.progress_every, score_batch=args.score_batch)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
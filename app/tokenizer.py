@@ -0,0 +1,91 @@
+# tokenizer.py - One-pass review tokenizer shared by all aspect extraction stages
+from array import array
+from bisect import bisect_right
+from typing import List, Tuple
+
+try:
+    from . import patterns
+except ImportError:
+    import patterns
+
+
+class TokenArray:
+    """
+    Compact token array for one review
+
+    Built once per review and handed to every extraction stage, so the text
+    is lowercased, split and stripped of punctuation exactly once.
+
+    - words: lowercased whitespace-separated tokens (same as text.lower().split())
+    - clean: words with non-word characters removed
+    - starts / ends: character offsets of each token in the original text
+    - sentence_ids: index into sentence_spans of the sentence each token starts in
+    - sentence_spans: (start, end) of every piece of re.split(r'[.!?]+', text)
+    """
+
+    __slots__ = ('text', 'lower', 'words', 'clean', 'starts', 'ends', 'sentence_ids', 'sentence_spans')
+
+    def __init__(self, text: str, lower: str, words: List[str], clean: List[str],
+                 starts: array, ends: array, sentence_ids: array,
+                 sentence_spans: List[Tuple[int, int]]):
+        self.text = text
+        self.lower = lower
+        self.words = words
+        self.clean = clean
+        self.starts = starts
+        self.ends = ends
+        self.sentence_ids = sentence_ids
+        self.sentence_spans = sentence_spans
+
+    @property
+    def aligned(self) -> bool:
+        """True when the lowercased text has the same length (and offsets) as the original"""
+        return len(self.lower) == len(self.text)
+
+    def sentences(self) -> List[str]:
+        """Sentence pieces of the original text"""
+        text = self.text
+        return [text[start:end] for start, end in self.sentence_spans]
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+
+def _sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """Spans of the pieces re.split(r'[.!?]+', text) would return"""
+    spans = []
+    start = 0
+    for match in patterns.SENTENCE_SPLIT.finditer(text):
+        spans.append((start, match.start()))
+        start = match.end()
+    spans.append((start, len(text)))
+    return spans
+
+
+def tokenize(text: str) -> TokenArray:
+    """Tokenize a review once: lowercased tokens, offsets and sentence ids"""
+    text = text or ""
+    lower = text.lower()
+
+    # Offsets always index the original text; if lowercasing changed the
+    # length (rare Unicode cases) tokenize the original and lowercase per word
+    aligned = len(lower) == len(text)
+    words = []
+    starts = array('i')
+    ends = array('i')
+    for match in patterns.TOKEN.finditer(lower if aligned else text):
+        words.append(match.group())
+        starts.append(match.start())
+        ends.append(match.end())
+    if not aligned:
+        words = [word.lower() for word in words]
+
+    # Most tokens are plain words; only run the regex on the ones with punctuation
+    strip_non_word = patterns.NON_WORD.sub
+    clean = [word if word.isalnum() else strip_non_word('', word) for word in words]
+
+    sentence_spans = _sentence_spans(text)
+    sentence_starts = [start for start, _ in sentence_spans]
+    sentence_ids = array('i', (bisect_right(sentence_starts, start) - 1 for start in starts))
+
+    return TokenArray(text, lower, words, clean, starts, ends, sentence_ids, sentence_spans)
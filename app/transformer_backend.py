@@ -0,0 +1,185 @@
+# transformer_backend.py - CPU-oriented transformer inference for MLSentimentAnalyzer
+#
+# The transformers pipeline scores one padded batch at a time in input order and
+# truncates nothing by tokens. This backend:
+# - tokenizes everything once, truncating at max_length tokens
+# - sorts texts by token length and packs them into buckets, so each batch is
+#   padded only to its own longest text (bounded by a token budget)
+# - runs the model with plain PyTorch, dynamically quantized int8 PyTorch, or
+#   ONNX Runtime, loading a local model directory without touching the network
+import os
+import time
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_MODEL = "cardiffnlp/twitter-roberta-base-sentiment-latest"
+
+# Configuration read by MLSentimentAnalyzer when model_type="transformers"
+# - SENTIMENT_MODEL_PATH: local model directory (or hub name) to load
+# - SENTIMENT_RUNTIME: torch | int8 | onnx
+# - SENTIMENT_MAX_TOKENS: token-level truncation length
+MODEL_PATH = os.getenv('SENTIMENT_MODEL_PATH', DEFAULT_MODEL)
+RUNTIME = os.getenv('SENTIMENT_RUNTIME', 'torch')
+MAX_LENGTH = int(os.getenv('SENTIMENT_MAX_TOKENS', '256'))
+
+DEFAULT_BATCH_SIZE = 32
+# Padded tokens per batch; short texts get large batches, long texts small ones
+DEFAULT_BATCH_TOKENS = 4096
+
+RUNTIMES = ("torch", "int8", "onnx")
+ONNX_FILES = ("model_quantized.onnx", "model.onnx")
+
+
+def length_buckets(lengths: Sequence[int], batch_size: int = DEFAULT_BATCH_SIZE,
+                   max_batch_tokens: int = DEFAULT_BATCH_TOKENS) -> Iterator[List[int]]:
+    """
+    Positions of the texts grouped into batches of similar length
+    - positions are visited shortest first, so padding inside a batch is small
+    - a batch closes at batch_size texts or when padding every text to the
+      batch's longest one would exceed max_batch_tokens
+    """
+    batch: List[int] = []
+    longest = 0
+    for position in sorted(range(len(lengths)), key=lengths.__getitem__):
+        length = max(1, lengths[position])
+        if batch and (len(batch) >= batch_size or max(longest, length) * (len(batch) + 1) > max_batch_tokens):
+            yield batch
+            batch, longest = [], 0
+        batch.append(position)
+        longest = max(longest, length)
+    if batch:
+        yield batch
+
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class TransformerBackend:
+    """
+    Sequence-classification model with length-bucketed batch inference
+
+    predict() returns {'label', 'score'} dicts in input order, the same shape
+    as the transformers pipeline output, so MLSentimentAnalyzer converts them
+    unchanged.
+
+    runtime:
+    - "torch": the model as loaded
+    - "int8": torch.quantization.quantize_dynamic on the Linear layers
+    - "onnx": ONNX Runtime on model_quantized.onnx / model.onnx in model_path
+    A local model_path is loaded with local_files_only=True (no network).
+    """
+
+    def __init__(self, model_path: str = MODEL_PATH, runtime: str = RUNTIME, max_length: int = MAX_LENGTH,
+                 batch_size: int = DEFAULT_BATCH_SIZE, max_batch_tokens: int = DEFAULT_BATCH_TOKENS,
+                 threads: Optional[int] = None):
+        if runtime not in RUNTIMES:
+            raise ValueError(f"Unknown runtime {runtime!r}, expected one of {RUNTIMES}")
+        self.model_path = model_path
+        self.runtime = runtime
+        self.max_length = max_length
+        self.batch_size = max(1, batch_size)
+        self.max_batch_tokens = max(max_length, max_batch_tokens)
+        self.local_files_only = os.path.isdir(model_path)
+
+        from transformers import AutoConfig, AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_path, local_files_only=self.local_files_only)
+        config = AutoConfig.from_pretrained(model_path, local_files_only=self.local_files_only)
+        self.labels = [config.id2label[i] for i in range(len(config.id2label))]
+
+        if runtime == "onnx":
+            self._load_onnx(threads)
+        else:
+            self._load_torch(threads)
+
+    def _load_torch(self, threads: Optional[int]):
+        import torch
+        from transformers import AutoModelForSequenceClassification
+
+        if threads:
+            torch.set_num_threads(threads)
+        model = AutoModelForSequenceClassification.from_pretrained(
+            self.model_path, local_files_only=self.local_files_only
+        )
+        model.eval()
+        if self.runtime == "int8":
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        self._torch = torch
+        self.model = model
+        self.input_names = None
+
+    def _load_onnx(self, threads: Optional[int]):
+        import onnxruntime
+
+        if not self.local_files_only:
+            raise ValueError("The onnx runtime needs a local model directory containing an .onnx file")
+        onnx_path = next((os.path.join(self.model_path, name) for name in ONNX_FILES
+                          if os.path.exists(os.path.join(self.model_path, name))), None)
+        if onnx_path is None:
+            raise FileNotFoundError(f"No {' or '.join(ONNX_FILES)} in {self.model_path}")
+
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.model = onnxruntime.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {model_input.name for model_input in self.model.get_inputs()}
+
+    def _logits(self, encoded: Dict[str, List[List[int]]]) -> np.ndarray:
+        """Model logits for one batch of token ids"""
+        if self.runtime == "onnx":
+            padded = self.tokenizer.pad(encoded, return_tensors="np")
+            feed = {name: padded[name].astype(np.int64) for name in self.input_names if name in padded}
+            return self.model.run(None, feed)[0]
+
+        padded = self.tokenizer.pad(encoded, return_tensors="pt")
+        with self._torch.inference_mode():
+            return self.model(**padded).logits.float().numpy()
+
+    def predict(self, texts: Sequence[str], batch_size: Optional[int] = None) -> List[Dict]:
+        """Top label and its probability for every text, in input order"""
+        if not texts:
+            return []
+        encoded = self.tokenizer(list(texts), truncation=True, max_length=self.max_length)
+        lengths = [len(ids) for ids in encoded["input_ids"]]
+
+        results: List[Optional[Dict]] = [None] * len(texts)
+        for positions in length_buckets(lengths, batch_size or self.batch_size, self.max_batch_tokens):
+            batch = {name: [values[i] for i in positions] for name, values in encoded.items()}
+            probabilities = softmax(self._logits(batch))
+            best = probabilities.argmax(axis=-1)
+            for position, label_id, row in zip(positions, best, probabilities):
+                results[position] = {'label': self.labels[label_id], 'score': float(row[label_id])}
+        return results
+
+
+def benchmark(texts: Sequence[str], backend: TransformerBackend, repeat: int = 3) -> Dict:
+    """Best-of-repeat throughput of backend.predict over texts"""
+    backend.predict(texts[:backend.batch_size])  # warm-up
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        backend.predict(texts)
+        best = min(best, time.perf_counter() - start)
+    return {
+        'texts': len(texts),
+        'seconds': best,
+        'texts_per_second': len(texts) / best if best > 0 else 0.0,
+        'runtime': backend.runtime,
+    }
+
+
+if __name__ == "__main__":
+    try:
+        from .amazon_scraper import get_sample_reviews
+    except ImportError:
+        from amazon_scraper import get_sample_reviews
+
+    samples = get_sample_reviews() * 20
+    stats = benchmark(samples, TransformerBackend())
+    print(f"⚡ {stats['runtime']}: {stats['texts']} texts in {stats['seconds']:.2f}s "
+          f"({stats['texts_per_second']:.1f} texts/s)")
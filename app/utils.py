@@ -1,9 +1,23 @@
 # utils.py - Enhanced for ML integration
 import re
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import streamlit as st
 
+try:
+    from . import patterns
+    from .aggregator import HIGH_SCORE, MEDIUM_SCORE
+    from .aspect_extractor import get_aspect_category
+    from . import profiling
+    from .pipeline import RESULT_COLUMNS, AspectResult
+except ImportError:
+    import patterns
+    from aggregator import HIGH_SCORE, MEDIUM_SCORE
+    from aspect_extractor import get_aspect_category
+    import profiling
+    from pipeline import RESULT_COLUMNS, AspectResult
+
 def colored_chip(sentiment: str, score: float) -> str:
     """Create a colored chip for sentiment display with enhanced ML styling"""
     # Enhanced color mapping with gradients based on ML confidence
@@ -97,31 +111,15 @@ def preprocess_text_for_ml(text: str) -> str:
     text = text.strip()
     
     # Normalize whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = patterns.WHITESPACE.sub(' ', text)
     
     # Handle contractions for better ML processing
-    contractions = {
-        "won't": "will not",
-        "can't": "cannot",
-        "don't": "do not",
-        "doesn't": "does not",
-        "isn't": "is not",
-        "wasn't": "was not",
-        "weren't": "were not",
-        "haven't": "have not",
-        "hasn't": "has not",
-        "wouldn't": "would not",
-        "couldn't": "could not",
-        "shouldn't": "should not"
-    }
-    
-    for contraction, expansion in contractions.items():
-        text = re.sub(r'\b' + contraction + r'\b', expansion, text, flags=re.IGNORECASE)
+    text = patterns.expand_contractions(text)
     
     # Remove excessive punctuation but keep sentence structure
-    text = re.sub(r'[!]{2,}', '!', text)
-    text = re.sub(r'[?]{2,}', '?', text)
-    text = re.sub(r'[.]{3,}', '...', text)
+    text = patterns.REPEATED_EXCLAMATION.sub('!', text)
+    text = patterns.REPEATED_QUESTION.sub('?', text)
+    text = patterns.REPEATED_DOTS.sub('...', text)
     
     return text.strip()
 
@@ -150,12 +148,37 @@ def validate_review_text(text: str) -> tuple:
     
     return True, "Valid text for ML analysis"
 
+def _rows_frame(rows) -> pd.DataFrame:
+    """DataFrame of a list of AspectResult records and/or row dicts"""
+    records = sum(type(row) is AspectResult for row in rows)
+    if not records:
+        return pd.DataFrame(rows)
+    if records == len(rows):
+        return pd.DataFrame.from_records([row.as_tuple() for row in rows], columns=RESULT_COLUMNS)
+    return pd.DataFrame([dict(row) for row in rows])
+
+def _results_frame(results) -> pd.DataFrame:
+    """
+    DataFrame of results given as AspectResult records, row dicts, a DataFrame
+    (copied) or a ResultStore (categorical columns)
+    """
+    if isinstance(results, pd.DataFrame):
+        # Callers add columns to the frame: never to the caller's own
+        return results.copy(deep=False)
+    to_frame = getattr(results, 'to_frame', None)
+    return to_frame() if to_frame is not None else _rows_frame(results)
+
 def create_ml_summary_stats(results: List[Dict]) -> Dict:
-    """Create enhanced summary statistics with ML model insights"""
-    if not results:
+    """
+    Create enhanced summary statistics with ML model insights
+    Accepts result rows, a ResultStore, or a ResultAggregator (read without a rescan)
+    """
+    if results is None or len(results) == 0:
         return {}
+    if hasattr(results, 'summary'):
+        return results.summary()
     
-    df = pd.DataFrame(results)
+    df = _results_frame(results)
     
     # Basic counts
     total_aspects = len(df)
@@ -193,8 +216,8 @@ def create_ml_summary_stats(results: List[Dict]) -> Dict:
     }
 
 def display_ml_metrics(results: List[Dict]):
-    """Display enhanced metrics with ML insights in Streamlit"""
-    if not results:
+    """Display enhanced metrics with ML insights in Streamlit (rows, ResultStore or ResultAggregator)"""
+    if results is None or len(results) == 0:
         return
     
     stats = create_ml_summary_stats(results)
@@ -235,6 +258,25 @@ def display_ml_metrics(results: List[Dict]):
                 percentage = (high_conf / total) * 100
                 st.metric("🎯 High Confidence", f"{high_conf} ({percentage:.1f}%)")
 
+def display_diagnostics():
+    """Per-stage call counts, latency percentiles and throughput from the profiling hooks"""
+    stats = profiling.get_stage_stats()
+    if not stats:
+        st.caption("No pipeline stages recorded yet")
+        return
+    
+    table = pd.DataFrame(stats)[['stage', 'calls', 'errors', 'p50_ms', 'p95_ms', 'p99_ms', 'total_s', 'mb_per_s']]
+    st.dataframe(table.round(3), hide_index=True, use_container_width=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("📥 Prometheus", profiling.prometheus_text(), "pipeline_metrics.txt", "text/plain",
+                           use_container_width=True)
+    with col2:
+        if st.button("Reset", key="reset_profiling", use_container_width=True):
+            profiling.reset_stats()
+            st.rerun()
+
 def format_time(seconds: float) -> str:
     """Format time in human readable format"""
     if seconds < 1:
@@ -253,46 +295,117 @@ def safe_get(dictionary: dict, key: str, default=None):
     except (AttributeError, KeyError):
         return default
 
-def create_ml_export_data(results: List[Dict], include_metadata: bool = True) -> pd.DataFrame:
-    """Create DataFrame for export with ML model metadata"""
-    if not results:
+# Confidence_Category labels indexed by bucket (0: <= 0.6, 1: <= 0.8, 2: above)
+_CONFIDENCE_CATEGORIES = np.array(['Low', 'Medium', 'High'], dtype=object)
+
+def _map_distinct(series: pd.Series, func) -> pd.Series:
+    """Apply func once per distinct value (once per category for categorical columns)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        mapped = np.array([func(value) for value in series.cat.categories] + [func(np.nan)], dtype=object)
+        # Code -1 (missing) picks the trailing func(nan) entry
+        return pd.Series(mapped[series.cat.codes.to_numpy()], index=series.index)
+    return series.map({value: func(value) for value in series.unique()})
+
+def _aspect_category(aspect) -> str:
+    return get_aspect_category(aspect) if isinstance(aspect, str) else 'Other'
+
+def _context_length(context) -> int:
+    return len(str(context))
+
+def create_ml_export_data(results: List[Dict], include_metadata: bool = True,
+                          timestamp: Optional[str] = None) -> pd.DataFrame:
+    """
+    Create DataFrame for export with ML model metadata
+    Metadata columns are vectorized; per-value work (aspect category,
+    context length) runs once per distinct value
+    """
+    if results is None or len(results) == 0:
         return pd.DataFrame()
     
-    df = pd.DataFrame(results)
+    df = _results_frame(results)
     
     if include_metadata:
         # Add ML-specific metadata
-        df['Analysis_Timestamp'] = pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+        df['Analysis_Timestamp'] = timestamp or pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
         
         if 'Context' in df.columns:
-            df['Context_Length'] = df['Context'].astype(str).str.len()
+            context = df['Context']
+            df['Context_Length'] = (
+                _map_distinct(context, _context_length).astype('int64')
+                if isinstance(context.dtype, pd.CategoricalDtype) else context.astype(str).str.len()
+            )
         
         if 'Score' in df.columns:
-            df['Confidence_Category'] = df['Score'].apply(
-                lambda x: 'High' if x > 0.8 else 'Medium' if x > 0.6 else 'Low'
-            )
+            scores = df['Score'].to_numpy(dtype=float)
+            buckets = np.select([scores > HIGH_SCORE, scores > MEDIUM_SCORE], [2, 1], default=0)
+            df['Confidence_Category'] = _CONFIDENCE_CATEGORIES[buckets]
         
-        # Add aspect categories
+        # Add aspect categories (memoized per aspect)
         if 'Aspect' in df.columns:
-            from aspect_extractor import get_aspect_categories
-            unique_aspects = df['Aspect'].unique().tolist()
-            categories = get_aspect_categories(unique_aspects)
-            
-            aspect_to_category = {}
-            for category, aspects in categories.items():
-                for aspect in aspects:
-                    aspect_to_category[aspect] = category
-            
-            df['Aspect_Category'] = df['Aspect'].map(aspect_to_category).fillna('Other')
+            df['Aspect_Category'] = _map_distinct(df['Aspect'], _aspect_category)
     
     return df
 
+def _iter_result_frames(results, chunk_rows: int):
+    """Results as DataFrames of at most chunk_rows rows"""
+    iter_frames = getattr(results, 'iter_frames', None)
+    if iter_frames is not None:
+        yield from iter_frames(chunk_rows)
+        return
+    for start in range(0, len(results), chunk_rows):
+        yield _rows_frame(results[start:start + chunk_rows])
+
+def write_ml_export(results, path, file_format: Optional[str] = None, include_metadata: bool = True,
+                    chunk_rows: int = 100000) -> int:
+    """
+    Stream the export to CSV or Parquet chunk by chunk
+    - never builds the whole export (or one big CSV string) in memory
+    - file_format defaults from the extension of path; Parquet needs pyarrow
+    Returns the number of rows written
+    """
+    if file_format is None:
+        file_format = 'parquet' if str(path).lower().endswith('.parquet') else 'csv'
+    timestamp = pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+    frames = (create_ml_export_data(frame, include_metadata, timestamp)
+              for frame in _iter_result_frames(results, max(1, chunk_rows)))
+    rows_written = 0
+    
+    if file_format == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        writer = None
+        try:
+            for export_df in frames:
+                table = pa.Table.from_pandas(export_df, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table.cast(writer.schema))
+                rows_written += len(export_df)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows_written
+    
+    owns_handle = not hasattr(path, 'write')
+    handle = open(path, 'w', encoding='utf-8', newline='') if owns_handle else path
+    try:
+        for export_df in frames:
+            export_df.to_csv(handle, index=False, header=rows_written == 0)
+            rows_written += len(export_df)
+    finally:
+        if owns_handle:
+            handle.close()
+    return rows_written
+
 def calculate_ml_performance_metrics(results: List[Dict]) -> Dict[str, Any]:
-    """Calculate ML model performance metrics"""
-    if not results:
+    """Calculate ML model performance metrics (rows, ResultStore or ResultAggregator)"""
+    if results is None or len(results) == 0:
         return {}
+    if hasattr(results, 'performance_metrics'):
+        return results.performance_metrics()
     
-    df = pd.DataFrame(results)
+    df = _results_frame(results)
     
     metrics = {}
     
@@ -0,0 +1,86 @@
+# bench_html.py - Parse-time benchmark for _extract_reviews_from_html
+#
+# Builds a synthetic ~1.5 MB product page (navigation, scripts, product
+# details and a handful of review bodies) and compares a full
+# BeautifulSoup('html.parser') tree against every installed parser backend.
+#
+#   python benchmarks/bench_html.py [--size-kb 1500] [--reviews 10] [--repeat 5]
+import argparse
+import contextlib
+import io
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app'))
+
+import amazon_scraper  # noqa: E402
+from amazon_scraper import BeautifulSoup, get_sample_reviews  # noqa: E402
+
+
+def build_page(size_kb: int, review_count: int) -> str:
+    """A product page padded with non-review markup up to roughly size_kb"""
+    reviews = get_sample_reviews()
+    filler_block = (
+        '<div class="a-section"><ul>' + '<li><a href="/dp/B0000">Related product</a></li>' * 20 + '</ul>'
+        '<script>window.ue_t0 = window.ue_t0 || +new Date(); var data = {"a": [1, 2, 3]};</script>'
+        '<table class="prodDetTable">' + '<tr><th>Detail</th><td>Value</td></tr>' * 10 + '</table></div>'
+    )
+    body = ''.join(
+        f'<div data-hook="review" class="a-section review"><span class="a-profile-name">Customer {i}</span>'
+        f'<span data-hook="review-body" class="a-size-base review-text"><span>{reviews[i % len(reviews)]}</span></span>'
+        f'<span class="cr-vote">Helpful Report abuse</span></div>'
+        for i in range(review_count)
+    )
+    head, tail = '<html><head><title>Product</title></head><body>', '</body></html>'
+    filler = filler_block * max(1, (size_kb * 1024 - len(body)) // len(filler_block) // 2)
+    return head + filler + body + filler + tail
+
+
+def legacy_extract(html: str, max_reviews: int) -> list:
+    soup = BeautifulSoup(html, 'html.parser')
+    reviews = []
+    for selector, _ in amazon_scraper.REVIEW_SELECTORS:
+        for element in soup.select(selector):
+            if len(reviews) >= max_reviews:
+                break
+            text = element.get_text(strip=True)
+            if text and len(text) > 50:
+                cleaned = amazon_scraper._clean_review_text(text)
+                if cleaned and len(cleaned) > 30 and not any(cleaned[:100] in r[:100] for r in reviews):
+                    reviews.append(cleaned)
+        if reviews:
+            break
+    return reviews
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size-kb', type=int, default=1500)
+    parser.add_argument('--reviews', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    html = build_page(args.size_kb, args.reviews)
+    backends = [name for name, module in (('selectolax', 'selectolax'), ('lxml', 'lxml'))
+                if amazon_scraper.importlib.util.find_spec(module)] + ['html.parser']
+    print(f"page: {len(html) / 1024:.0f} KB, {args.reviews} reviews")
+
+    def run(func):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func()
+
+    expected = legacy_extract(html, args.reviews)
+    baseline = min(timeit.repeat(lambda: legacy_extract(html, args.reviews), number=1, repeat=args.repeat))
+    print(f"{'backend':<28}{'ms/page':>10}{'speedup':>10}")
+    print(f"{'full tree (html.parser)':<28}{baseline * 1e3:>10.1f}{1:>9.2f}x")
+    for backend in backends:
+        amazon_scraper.HTML_PARSER = backend
+        assert run(lambda: amazon_scraper._extract_reviews_from_html(html, args.reviews)) == expected, backend
+        best = min(timeit.repeat(lambda: run(lambda: amazon_scraper._extract_reviews_from_html(html, args.reviews)),
+                                 number=1, repeat=args.repeat))
+        print(f"{backend:<28}{best * 1e3:>10.1f}{baseline / best:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
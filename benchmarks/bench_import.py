@@ -0,0 +1,61 @@
+# bench_import.py - Cold-start cost of `import app.sentiment`
+#
+# Each measurement runs in a fresh interpreter and reports wall time and peak
+# RSS. "eager" reproduces the old module behaviour by importing every installed
+# backend up front; "lazy" is the plain import, where backends load on first use.
+#
+#   python benchmarks/bench_import.py [--runs 5]
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+for name in {preload!r}:
+    try:
+        __import__(name)
+    except ImportError:
+        pass
+import app.sentiment
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == "darwin":
+    rss_kb //= 1024
+print(json.dumps({{"seconds": elapsed, "rss_mb": rss_kb / 1024}}))
+"""
+
+MODES = {
+    "eager": ["textblob", "vaderSentiment.vaderSentiment", "transformers"],
+    "lazy": [],
+}
+
+
+def measure(preload: list) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(preload=preload)],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'mode':<8}{'median ms':>12}{'peak RSS MB':>14}")
+    for mode, preload in MODES.items():
+        samples = [measure(preload) for _ in range(args.runs)]
+        seconds = statistics.median(sample["seconds"] for sample in samples)
+        rss = statistics.median(sample["rss_mb"] for sample in samples)
+        print(f"{mode:<8}{seconds * 1000:>12.1f}{rss:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
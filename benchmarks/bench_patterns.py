@@ -0,0 +1,110 @@
+# bench_patterns.py - Microbenchmark for the precompiled regex registry
+#
+# Compares the per-call regex approach (patterns rebuilt or re-looked-up inside
+# every call, one pass per contraction/artifact) against app/patterns.py.
+#
+#   python benchmarks/bench_patterns.py [--docs 2000] [--repeat 5]
+import argparse
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app'))
+
+import patterns  # noqa: E402
+from amazon_scraper import get_sample_reviews  # noqa: E402
+
+LEGACY_CONTRACTIONS = dict(patterns.CONTRACTIONS)
+LEGACY_ARTIFACTS = list(patterns.REVIEW_ARTIFACTS)
+
+
+def legacy_preprocess(text: str) -> str:
+    text = re.sub(r'\s+', ' ', text.strip())
+    for contraction, expansion in LEGACY_CONTRACTIONS.items():
+        text = re.sub(r'\b' + contraction + r'\b', expansion, text, flags=re.IGNORECASE)
+    text = re.sub(r'[!]{2,}', '!', text)
+    text = re.sub(r'[?]{2,}', '?', text)
+    text = re.sub(r'[.]{3,}', '...', text)
+    return text.strip()
+
+
+def compiled_preprocess(text: str) -> str:
+    text = patterns.WHITESPACE.sub(' ', text.strip())
+    text = patterns.expand_contractions(text)
+    text = patterns.REPEATED_EXCLAMATION.sub('!', text)
+    text = patterns.REPEATED_QUESTION.sub('?', text)
+    text = patterns.REPEATED_DOTS.sub('...', text)
+    return text.strip()
+
+
+def legacy_clean(text: str) -> str:
+    text = re.sub(r'\s+', ' ', text).strip()
+    for artifact in LEGACY_ARTIFACTS:
+        text = re.sub(artifact, '', text, flags=re.IGNORECASE)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def compiled_clean(text: str) -> str:
+    text = patterns.WHITESPACE.sub(' ', text).strip()
+    text = patterns.remove_artifacts(text)
+    return patterns.WHITESPACE.sub(' ', text).strip()
+
+
+def legacy_word_strip(text: str) -> list:
+    return [re.sub(r'[^\w]', '', word.lower()) for word in text.lower().split()]
+
+
+def compiled_word_strip(text: str) -> list:
+    strip_non_word = patterns.NON_WORD.sub
+    return [strip_non_word('', word.lower()) for word in text.lower().split()]
+
+
+def legacy_aspect_patterns(text: str) -> list:
+    return [m.group(group) for pattern, group in [(p.pattern, g) for p, g in patterns.ASPECT_PATTERNS]
+            for m in re.finditer(pattern, text, re.IGNORECASE)]
+
+
+def compiled_aspect_patterns(text: str) -> list:
+    return [m.group(group) for pattern, group in patterns.ASPECT_PATTERNS for m in pattern.finditer(text)]
+
+
+def build_documents(count: int) -> list:
+    """Sample reviews decorated with contractions and scraped-page artifacts"""
+    base = get_sample_reviews()
+    extras = ["I can't believe it!!!", "Verified Purchase", "Don't buy... seriously??",
+              "Top 500 Reviewer", "Show more", "Report abuse", "It doesn't fit."]
+    docs = []
+    for i in range(count):
+        review = base[i % len(base)]
+        docs.append(f"{extras[i % len(extras)]}  {review}  {extras[(i + 3) % len(extras)]} Read more")
+    return docs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--docs', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    docs = build_documents(args.docs)
+    cases = [
+        ('preprocess_text_for_ml', legacy_preprocess, compiled_preprocess),
+        ('_clean_review_text', legacy_clean, compiled_clean),
+        ('per-word punctuation strip', legacy_word_strip, compiled_word_strip),
+        ('_extract_pattern_aspects', legacy_aspect_patterns, compiled_aspect_patterns),
+    ]
+
+    print(f"{'stage':<30}{'legacy us/doc':>15}{'compiled us/doc':>17}{'speedup':>10}")
+    for name, legacy, compiled in cases:
+        for doc in docs[:50]:
+            assert legacy(doc) == compiled(doc), name
+        timings = []
+        for func in (legacy, compiled):
+            best = min(timeit.repeat(lambda: [func(doc) for doc in docs], number=1, repeat=args.repeat))
+            timings.append(best / len(docs) * 1e6)
+        print(f"{name:<30}{timings[0]:>15.2f}{timings[1]:>17.2f}{timings[0] / timings[1]:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# bench_result_store.py - Memory of list-of-dicts results vs AspectResult records vs the columnar ResultStore
+#
+# Builds result rows the way the pipeline does (one review string shared by
+# all of its aspect rows, one context per aspect) and measures the Python heap
+# with tracemalloc for each representation.
+#
+#   python benchmarks/bench_result_store.py [--rows 1000000]
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app'))
+
+from amazon_scraper import get_sample_reviews  # noqa: E402
+from pipeline import AspectResult  # noqa: E402
+from result_store import ResultStore  # noqa: E402
+
+ASPECTS = ["battery", "sound", "quality", "delivery", "price", "design", "camera", "display", "packaging"]
+LABELS = [("POSITIVE", "high"), ("NEGATIVE", "medium"), ("NEUTRAL", "low")]
+# Columns build_rows interns for AspectResult records
+INTERNED = ("Source", "Aspect", "Sentiment", "Confidence", "ML_Model")
+
+
+def generate_rows(count: int, aspects_per_review: int = 6, records: bool = False):
+    """Result rows (dicts, or AspectResult records) for count // aspects_per_review distinct reviews"""
+    random.seed(0)
+    samples = get_sample_reviews()
+    row = 0
+    review_number = 0
+    while row < count:
+        review_number += 1
+        review = f"{random.choice(samples)} (order {review_number})"
+        source = f"Amazon Review #{review_number % 100}"
+        for aspect in random.sample(ASPECTS, aspects_per_review):
+            if row >= count:
+                return
+            label, confidence = random.choice(LABELS)
+            sentence = review.split('.')[0]
+            values = {
+                "Source": source,
+                "Review": review,
+                "Aspect": aspect,
+                "Context": sentence[:100] + "..." if len(sentence) > 100 else sentence,
+                "Sentiment": label,
+                "Score": random.random(),
+                "Confidence": confidence,
+                "ML_Model": "VADER (ML)",
+            }
+            yield AspectResult(**{column: sys.intern(value) if column in INTERNED else value
+                                  for column, value in values.items()}) if records else values
+            row += 1
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rows, list_bytes, list_time = measure(lambda: list(generate_rows(args.rows)))
+    del rows
+    rows, record_bytes, record_time = measure(lambda: list(generate_rows(args.rows, records=True)))
+    del rows
+    store, store_bytes, store_time = measure(lambda: ResultStore(generate_rows(args.rows)))
+
+    print(f"{'representation':<22}{'MB':>10}{'bytes/row':>12}{'build s':>10}{'vs dicts':>10}")
+    for name, size, elapsed in (("list of dicts", list_bytes, list_time),
+                                ("list of AspectResult", record_bytes, record_time),
+                                ("ResultStore", store_bytes, store_time)):
+        print(f"{name:<22}{size / 2**20:>10.1f}{size / args.rows:>12.0f}{elapsed:>10.2f}{list_bytes / size:>9.1f}x")
+    print(f"{len(store)} rows, {store.unique_count('Review')} distinct reviews")
+
+
+if __name__ == "__main__":
+    main()
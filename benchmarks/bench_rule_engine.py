@@ -0,0 +1,58 @@
+# bench_rule_engine.py - Where the vectorized rule-based scan starts to pay off
+#
+# Scores growing batches of real aspect contexts (from the synthetic corpus)
+# text by text (LexiconScorer.text_counts) and with the sparse term-matrix scan,
+# and prints the crossover that rule_engine.VECTORIZED_MIN_CHARS is set from.
+#
+#   python benchmarks/bench_rule_engine.py [--reviews 1500] [--repeat 5]
+import argparse
+import contextlib
+import io
+import os
+import sys
+import timeit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), 'app'))
+
+from corpus import generate_reviews  # noqa: E402
+import rule_engine  # noqa: E402
+import sentiment  # noqa: E402
+from aspect_extractor import analyze_aspect_sentiment_context, extract_aspects  # noqa: E402
+
+BATCH_SIZES = (1, 8, 32, 64, 128, 256, 512, 1024, 4096)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-text vs vectorized rule-based scoring by batch size")
+    parser.add_argument('--reviews', type=int, default=1500, help="Synthetic reviews the contexts come from")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        reviews = generate_reviews(args.reviews, seed=5)
+        contexts = [analyze_aspect_sentiment_context(review, aspect)
+                    for review in reviews for aspect in extract_aspects(review)]
+        analyzer = sentiment.MLSentimentAnalyzer('rule_based')
+    per_text = lambda texts: [analyzer._analyze_rule_based(text) for text in texts]  # noqa: E731
+    vectorized = analyzer._vectorized_rule_based
+
+    print(f"{'contexts':>8}{'chars':>9}{'per-text us':>13}{'vectorized us':>15}{'speedup':>9}")
+    crossover = None
+    for size in BATCH_SIZES:
+        texts = contexts[:size]
+        assert per_text(texts) == vectorized(texts)
+        number = max(1, 2000 // size)
+        timings = [min(timeit.repeat(lambda: func(texts), number=number, repeat=args.repeat)) / number * 1e6
+                   for func in (per_text, vectorized)]
+        chars = sum(map(len, texts))
+        if crossover is None and timings[1] < timings[0]:
+            crossover = chars
+        print(f"{len(texts):>8}{chars:>9}{timings[0]:>13.0f}{timings[1]:>15.0f}{timings[0] / timings[1]:>8.2f}x")
+
+    print(f"📐 vectorized scan wins from ~{crossover} characters per batch "
+          f"(VECTORIZED_MIN_CHARS = {rule_engine.VECTORIZED_MIN_CHARS})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# bench_transformer.py - Throughput of the transformer backend per runtime
+#
+# Scores the same review corpus with each requested runtime (torch, int8, onnx)
+# and reports texts/s, plus how much padding length bucketing saves compared
+# with batching the texts in input order.
+#
+#   python benchmarks/bench_transformer.py --model /models/roberta-sentiment --runtimes torch int8 onnx
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app'))
+
+from amazon_scraper import get_sample_reviews  # noqa: E402
+from transformer_backend import (DEFAULT_BATCH_SIZE, MAX_LENGTH, MODEL_PATH, RUNTIMES,  # noqa: E402
+                                 TransformerBackend, benchmark, length_buckets)
+
+
+def build_corpus(count: int):
+    """Reviews of mixed length: single sentences up to several joined samples"""
+    random.seed(0)
+    samples = get_sample_reviews()
+    sentences = [sentence.strip() + '.' for review in samples for sentence in review.split('.') if sentence.strip()]
+    corpus = []
+    for _ in range(count):
+        if random.random() < 0.5:
+            corpus.append(random.choice(sentences))
+        else:
+            corpus.append(' '.join(random.sample(samples, random.randint(1, 4))))
+    return corpus
+
+
+def padded_tokens(lengths, batches):
+    return sum(max(lengths[i] for i in batch) * len(batch) for batch in batches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--model', default=MODEL_PATH, help="Local model directory (or hub name)")
+    parser.add_argument('--runtimes', nargs='+', choices=RUNTIMES, default=['torch', 'int8'])
+    parser.add_argument('--texts', type=int, default=512)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--max-length', type=int, default=MAX_LENGTH)
+    parser.add_argument('--threads', type=int, help="Intra-op threads (default: library default)")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.texts)
+
+    print(f"{'runtime':<10}{'texts/s':>10}{'seconds':>10}")
+    backend = None
+    for runtime in args.runtimes:
+        try:
+            backend = TransformerBackend(args.model, runtime, max_length=args.max_length,
+                                         batch_size=args.batch_size, threads=args.threads)
+        except (ImportError, OSError, ValueError) as e:
+            print(f"{runtime:<10}{'skipped':>10}  ({e})")
+            continue
+        stats = benchmark(corpus, backend, repeat=args.repeat)
+        print(f"{runtime:<10}{stats['texts_per_second']:>10.1f}{stats['seconds']:>10.2f}")
+
+    if backend is not None:
+        encoded = backend.tokenizer(corpus, truncation=True, max_length=args.max_length)
+        lengths = [len(ids) for ids in encoded['input_ids']]
+        in_order = [list(range(start, min(start + args.batch_size, len(lengths))))
+                    for start in range(0, len(lengths), args.batch_size)]
+        bucketed = list(length_buckets(lengths, args.batch_size, backend.max_batch_tokens))
+        real = sum(lengths)
+        print(f"padding: {padded_tokens(lengths, in_order) / real:.2f}x tokens in input order, "
+              f"{padded_tokens(lengths, bucketed) / real:.2f}x with length buckets")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# corpus.py - Reproducible synthetic review corpora for benchmarks
+#
+# Reviews are assembled from the vocabularies the pipeline already knows: the
+# aspect keywords in aspect_extractor.DOMAIN_ASPECTS, the opinion words of the
+# sentiment lexicon and the sentences of get_sample_reviews(). The same seed
+# always gives the same corpus.
+#
+#   python benchmarks/corpus.py --reviews 100000 -o reviews.jsonl
+import argparse
+import json
+import os
+import random
+import sys
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app'))
+
+from amazon_scraper import get_sample_reviews  # noqa: E402
+from aspect_extractor import DOMAIN_ASPECTS, TECH_KEYWORDS  # noqa: E402
+from sentiment import NEGATIVE_WORDS, POSITIVE_WORDS  # noqa: E402
+
+TEMPLATES = [
+    "The {keyword} is {opinion}.",
+    "{Keyword} was {opinion} and the {other} {verb} {opinion2}.",
+    "I found the {keyword} {opinion}, {connector} the {other} is {opinion2}.",
+    "Honestly the {keyword} {verb} {opinion} for the price.",
+    "After two weeks the {keyword} still {verb} {opinion}.",
+    "{Keyword}: {opinion}. {Other}: {opinion2}.",
+]
+CONNECTORS = ["but", "and", "although", "while", "however"]
+VERBS = ["is", "was", "feels", "seems", "looks", "works"]
+NEUTRAL_WORDS = ["okay", "average", "fine", "acceptable", "as expected", "nothing special"]
+
+KEYWORDS = sorted({keyword for keywords in DOMAIN_ASPECTS.values() for keyword in keywords} | TECH_KEYWORDS)
+OPINIONS = sorted(POSITIVE_WORDS) + sorted(NEGATIVE_WORDS) + NEUTRAL_WORDS
+SAMPLE_SENTENCES = [sentence.strip() + '.' for review in get_sample_reviews()
+                    for sentence in review.split('.') if len(sentence.strip()) > 10]
+
+
+def _sentence(rng: random.Random) -> str:
+    if rng.random() < 0.3:
+        return rng.choice(SAMPLE_SENTENCES)
+    keyword, other = rng.sample(KEYWORDS, 2)
+    return rng.choice(TEMPLATES).format(
+        keyword=keyword, Keyword=keyword.capitalize(), other=other, Other=other.capitalize(),
+        opinion=rng.choice(OPINIONS), opinion2=rng.choice(OPINIONS),
+        verb=rng.choice(VERBS), connector=rng.choice(CONNECTORS),
+    )
+
+
+def generate_reviews(count: int, seed: int = 0, min_sentences: int = 1, max_sentences: int = 8) -> List[str]:
+    """count synthetic reviews of min_sentences..max_sentences sentences each"""
+    rng = random.Random(seed)
+    return [' '.join(_sentence(rng) for _ in range(rng.randint(min_sentences, max_sentences)))
+            for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic review corpus (JSONL or one review per line)")
+    parser.add_argument('--reviews', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', required=True, help="Output file (.jsonl or .txt)")
+    args = parser.parse_args()
+
+    reviews = generate_reviews(args.reviews, args.seed)
+    with open(args.output, 'w', encoding='utf-8') as handle:
+        for i, review in enumerate(reviews, 1):
+            if args.output.endswith('.jsonl'):
+                handle.write(json.dumps({'id': f"synthetic-{i}", 'text': review}) + '\n')
+            else:
+                handle.write(review + '\n')
+    print(f"📝 Wrote {len(reviews)} reviews to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# load_server.py - Load test for the sentiment inference server on localhost
+#
+# Opens --concurrency keep-alive connections, sends --requests POST /sentiment
+# requests spread over them and reports throughput, latency percentiles, 503s
+# and the server's batch-size histogram from /metrics.
+#
+#   python -m app.server --port 8765 &
+#   python benchmarks/load_server.py --port 8765 --concurrency 64 --requests 20000
+#
+# --spawn starts a server in this process first (handy for a quick comparison
+# of --max-batch / --max-wait-ms settings).
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app'))
+
+from amazon_scraper import get_sample_reviews  # noqa: E402
+
+
+async def request(reader, writer, method, path, payload=None):
+    """One HTTP/1.1 request on an open keep-alive connection: (status, body bytes)"""
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def client(args, texts, counter, latencies, statuses):
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    try:
+        while counter[0] < args.requests:
+            counter[0] += 1
+            start = time.perf_counter()
+            status, _ = await request(reader, writer, 'POST', '/sentiment', {'text': random.choice(texts)})
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))] if ordered else float('nan')
+
+
+async def run(args):
+    server = None
+    if args.spawn:
+        from server import start_server
+        server, batcher = await start_server(args.host, args.port, max_batch=args.max_batch,
+                                             max_wait_ms=args.max_wait_ms, max_queue=args.max_queue)
+        args.port = server.sockets[0].getsockname()[1]
+
+    random.seed(0)
+    texts = [f"{review} (#{i})" for i, review in enumerate(get_sample_reviews() * 200)] if args.unique \
+        else get_sample_reviews()
+    counter, latencies, statuses = [0], [], {}
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(args, texts, counter, latencies, statuses) for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    _, metrics = await request(reader, writer, 'GET', '/metrics')
+    writer.close()
+    await writer.wait_closed()
+
+    print(f"{len(latencies)} requests in {elapsed:.2f}s: {len(latencies) / elapsed:.0f} req/s "
+          f"with {args.concurrency} connections")
+    print("latency ms: " + "  ".join(f"p{q}={percentile(latencies, q) * 1000:.2f}" for q in (50, 95, 99)))
+    print(f"status codes: {dict(sorted(statuses.items()))}")
+    print("\n".join(line for line in metrics.decode('utf-8').splitlines()
+                    if line.startswith(('sentiment_batch_size', 'sentiment_rejected_total'))))
+
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+        await batcher.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--unique', action='store_true', help="Send distinct texts, so the cache never hits")
+    parser.add_argument('--spawn', action='store_true', help="Start a server in-process (use --port 0)")
+    parser.add_argument('--max-batch', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    parser.add_argument('--max-queue', type=int, default=2048)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
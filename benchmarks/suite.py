@@ -0,0 +1,199 @@
+# suite.py - Per-stage benchmark suite for the analysis pipeline
+#
+# Times every stage separately on a reproducible synthetic corpus (corpus.py)
+# and on the saved HTML pages in benchmarks/fixtures, then appends the run to
+# a JSON history file and compares it with the previous comparable run.
+#
+#   python benchmarks/suite.py                          # all benchmarks, 2000 reviews
+#   python benchmarks/suite.py --reviews 20000 -k sentiment
+#   python benchmarks/suite.py --no-save                # don't touch the history
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), 'app'))
+
+from corpus import generate_reviews  # noqa: E402
+import amazon_scraper  # noqa: E402
+import sentiment  # noqa: E402
+from aspect_extractor import analyze_aspect_sentiment_context, extract_aspects  # noqa: E402
+from pipeline import analyze_review  # noqa: E402
+from utils import (calculate_ml_performance_metrics, create_ml_export_data,  # noqa: E402
+                   create_ml_summary_stats, preprocess_text_for_ml)
+
+FIXTURE_DIR = os.path.join(BENCH_DIR, 'fixtures')
+DEFAULT_HISTORY = os.path.join(BENCH_DIR, 'history.json')
+
+
+class Benchmark(NamedTuple):
+    name: str
+    func: Callable[[], object]
+    items: int      # work items per call, for the items/s column
+    unit: str
+
+
+def build_benchmarks(reviews: List[str]) -> List[Benchmark]:
+    """Every stage, set up on the same corpus"""
+    quiet = contextlib.redirect_stdout(io.StringIO())
+    with quiet:
+        aspects = [extract_aspects(review) for review in reviews]
+        pairs = [(review, aspect) for review, review_aspects in zip(reviews, aspects) for aspect in review_aspects]
+        contexts = [analyze_aspect_sentiment_context(review, aspect) for review, aspect in pairs]
+        analyses = [analyze_review(review, source=f"Synthetic #{i}") for i, review in enumerate(reviews, 1)]
+    rows = [row for analysis in analyses for row in analysis.rows]
+
+    benchmarks = [
+        Benchmark('preprocess_text_for_ml', lambda: [preprocess_text_for_ml(r) for r in reviews], len(reviews), 'reviews'),
+        Benchmark('extract_aspects', lambda: [extract_aspects(r) for r in reviews], len(reviews), 'reviews'),
+        Benchmark('analyze_aspect_sentiment_context',
+                  lambda: [analyze_aspect_sentiment_context(r, a) for r, a in pairs], len(pairs), 'aspects'),
+    ]
+
+    backends = ['rule_based']
+    backends += ['vader'] if sentiment.VADER_AVAILABLE else []
+    backends += ['textblob'] if sentiment.TEXTBLOB_AVAILABLE else []
+    backends += ['transformers'] if sentiment.TRANSFORMERS_AVAILABLE else []
+    for backend in backends:
+        with quiet:
+            analyzer = sentiment.MLSentimentAnalyzer(backend)  # no cache: every call scores
+        if analyzer.model_type != backend:
+            continue
+        benchmarks.append(Benchmark(f'sentiment[{backend}]', lambda a=analyzer: a.analyze_sentiment_batch(contexts),
+                                    len(contexts), 'contexts'))
+
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, '*.html'))):
+        with open(path, encoding='utf-8') as handle:
+            html = handle.read()
+        name = os.path.splitext(os.path.basename(path))[0]
+        benchmarks.append(Benchmark(f'extract_reviews_from_html[{name}]',
+                                    lambda h=html: amazon_scraper._extract_reviews_from_html(h, 10), 1, 'pages'))
+
+    benchmarks += [
+        Benchmark('analyze_review', lambda: [analyze_review(r) for r in reviews], len(reviews), 'reviews'),
+        Benchmark('create_ml_summary_stats', lambda: create_ml_summary_stats(rows), len(rows), 'rows'),
+        Benchmark('calculate_ml_performance_metrics', lambda: calculate_ml_performance_metrics(rows), len(rows), 'rows'),
+        Benchmark('create_ml_export_data', lambda: create_ml_export_data(rows), len(rows), 'rows'),
+    ]
+    return benchmarks
+
+
+def time_benchmark(benchmark: Benchmark, repeat: int) -> Dict:
+    """min / median seconds per call over repeat calls (after one warm-up call)"""
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        benchmark.func()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            benchmark.func()
+            timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return {
+        'min_s': best,
+        'median_s': statistics.median(timings),
+        'items': benchmark.items,
+        'unit': benchmark.unit,
+        'items_per_s': benchmark.items / best if best > 0 else 0.0,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path: str) -> List[Dict]:
+    try:
+        with open(path, encoding='utf-8') as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return []
+
+
+def previous_run(history: List[Dict], run: Dict) -> Optional[Dict]:
+    """Latest earlier run on the same corpus and machine"""
+    for candidate in reversed(history):
+        if all(candidate.get(key) == run[key] for key in ('reviews', 'seed', 'machine')):
+            return candidate
+    return None
+
+
+def run_suite(reviews: int = 2000, seed: int = 0, repeat: int = 5, pattern: Optional[str] = None) -> Dict:
+    """
+    Time the benchmarks on a fresh corpus
+    The global analyzer (used by analyze_review) is swapped for an uncached one
+    meanwhile, so the timings measure scoring rather than SentimentCache hits
+    """
+    corpus = generate_reviews(reviews, seed)
+    global_analyzer = sentiment.analyzer
+    with contextlib.redirect_stdout(io.StringIO()):
+        sentiment.analyzer = sentiment.MLSentimentAnalyzer(cache=None)
+    try:
+        benchmarks = [b for b in build_benchmarks(corpus) if not pattern or pattern in b.name]
+        results = {benchmark.name: time_benchmark(benchmark, repeat) for benchmark in benchmarks}
+    finally:
+        sentiment.analyzer = global_analyzer
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'machine': f"{platform.machine()}-{os.cpu_count()}cpu",
+        'reviews': reviews,
+        'seed': seed,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def print_report(run: Dict, previous: Optional[Dict]):
+    print(f"{run['reviews']} reviews (seed {run['seed']}), commit {run['commit']}, python {run['python']}")
+    header = f"{'benchmark':<46}{'min ms':>10}{'median ms':>11}{'items/s':>12}"
+    if previous:
+        header += f"{'vs ' + str(previous.get('commit')):>14}"
+    print(header)
+    for name, result in run['results'].items():
+        line = (f"{name:<46}{result['min_s'] * 1e3:>10.2f}{result['median_s'] * 1e3:>11.2f}"
+                f"{result['items_per_s']:>12.0f}")
+        before = (previous or {}).get('results', {}).get(name)
+        if before:
+            change = (result['min_s'] / before['min_s'] - 1) * 100
+            line += f"{change:>+13.1f}%"
+        print(line)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Per-stage benchmarks of the analysis pipeline")
+    parser.add_argument('--reviews', type=int, default=2000, help="Synthetic corpus size")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('-k', dest='pattern', help="Only benchmarks whose name contains this")
+    parser.add_argument('--history', default=DEFAULT_HISTORY, help="JSON history file")
+    parser.add_argument('--no-save', action='store_true', help="Compare with the history but don't append")
+    args = parser.parse_args(argv)
+
+    run = run_suite(args.reviews, args.seed, max(1, args.repeat), args.pattern)
+    history = load_history(args.history)
+    print_report(run, previous_run(history, run))
+
+    if not args.no_save:
+        history.append(run)
+        with open(args.history, 'w', encoding='utf-8') as handle:
+            json.dump(history, handle, indent=1)
+        print(f"💾 Appended to {args.history} ({len(history)} runs)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,30 @@
+import math
+
+from app.aggregator import ResultAggregator
+from app.amazon_scraper import get_sample_reviews
+from app.pipeline import analyze_review
+from app.utils import calculate_ml_performance_metrics, create_ml_summary_stats
+
+
+def _close(a, b):
+    if isinstance(a, dict):
+        return list(a) == list(b) and all(_close(a[key], b[key]) for key in a)
+    if isinstance(a, float):
+        return math.isclose(a, b, rel_tol=1e-9)
+    return a == b
+
+
+def test_aggregator_matches_dataframe_stats_and_merges():
+    rows = []
+    for i, review in enumerate(get_sample_reviews()):
+        rows.extend(analyze_review(review, source=f"Amazon Review #{i}").rows)
+
+    aggregator = ResultAggregator(rows)
+    assert _close(create_ml_summary_stats(aggregator), create_ml_summary_stats(rows))
+    assert _close(calculate_ml_performance_metrics(aggregator), calculate_ml_performance_metrics(rows))
+
+    half = len(rows) // 2
+    merged = ResultAggregator(rows[:half])
+    merged.merge(ResultAggregator(rows[half:]))
+    assert _close(merged.summary(), aggregator.summary())
+    assert merged.top_aspects(3) == aggregator.top_aspects(3)
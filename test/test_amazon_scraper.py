@@ -0,0 +1,179 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from app import amazon_scraper
+
+REVIEW = "This is a genuinely detailed review about sound quality, battery life and delivery speed number {n}."
+
+
+class _StubScraperAPI(BaseHTTPRequestHandler):
+    requests_seen = []
+    in_flight = 0
+    max_in_flight = 0
+    last_page = 100
+    failures = {}       # page number -> requests that still get HTTP 500 (-1: all of them)
+    lock = threading.Lock()
+
+    def do_GET(self):
+        target = parse_qs(urlparse(self.path).query).get("url", [""])[0]
+        cls = type(self)
+        with cls.lock:
+            cls.requests_seen.append(target)
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        time.sleep(0.05)
+        page = int(parse_qs(urlparse(target).query).get("pageNumber", ["1"])[0])
+        with cls.lock:
+            failing = cls.failures.get(page, 0) != 0 and "httpbin" not in target
+            if failing and cls.failures[page] > 0:
+                cls.failures[page] -= 1
+        if failing:
+            with cls.lock:
+                cls.in_flight -= 1
+            self.send_response(500)
+            self.end_headers()
+            return
+        body = "ok" if "httpbin" in target else "".join(
+            f'<div data-hook="review-body"><span>Page {page} review {n}: {REVIEW.format(n=n)}</span></div>'
+            for n in range(3 if page <= cls.last_page else 0)
+        )
+        with cls.lock:
+            cls.in_flight -= 1
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.end_headers()
+        self.wfile.write(body.encode("utf-8"))
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_api(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubScraperAPI)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    _StubScraperAPI.requests_seen = []
+    _StubScraperAPI.max_in_flight = 0
+    _StubScraperAPI.failures = {}
+    monkeypatch.setattr(amazon_scraper, "SCRAPERAPI_ENDPOINT", f"http://127.0.0.1:{server.server_port}/")
+    monkeypatch.setattr(amazon_scraper, "get_scraperapi_key", lambda: "test-key")
+    monkeypatch.setattr(amazon_scraper, "PAGE_RETRY_BACKOFF", 0.01)
+    amazon_scraper.clear_key_status_cache()
+    yield _StubScraperAPI
+    server.shutdown()
+    amazon_scraper.clear_key_status_cache()
+
+
+def test_fetch_reviews_concurrently_validates_key_once(stub_api):
+    urls = [f"https://www.amazon.in/dp/B0000000{n:02d}" for n in range(6)]
+    results = amazon_scraper.fetch_reviews_concurrently(urls, max_reviews=2, concurrency=3)
+
+    assert list(results) == urls
+    assert all(len(reviews) == 2 for reviews in results.values())
+    assert sum("httpbin" in target for target in stub_api.requests_seen) == 1
+    assert 1 < stub_api.max_in_flight <= 3
+
+
+def test_iter_review_pages_streams_and_stops_early(stub_api):
+    review_url, product_id = amazon_scraper.convert_to_review_url("https://www.amazon.in/dp/B08N5WRWNW")
+    stream = amazon_scraper.iter_review_pages(review_url, product_id, max_reviews=7, concurrency=2, max_pages=10)
+
+    first = next(stream)
+    assert first.startswith("Page ")
+    reviews = [first] + list(stream)
+    assert len(reviews) == 7
+    assert len(set(reviews)) == 7
+    assert len(stub_api.requests_seen) <= 5
+
+
+def test_iter_review_pages_stops_after_last_page(stub_api, monkeypatch):
+    monkeypatch.setattr(stub_api, "last_page", 2)
+    review_url, product_id = amazon_scraper.convert_to_review_url("https://www.amazon.in/dp/B08N5WRWNW")
+    reviews = list(amazon_scraper.iter_review_pages(review_url, product_id, max_reviews=50, concurrency=2))
+
+    assert len(reviews) == 6
+    assert len(stub_api.requests_seen) < 7
+
+
+def test_iter_review_pages_crawls_one_listing_from_page_one():
+    review_url, product_id = amazon_scraper.convert_to_review_url("https://www.amazon.in/dp/B08N5WRWNW")
+    urls = amazon_scraper.review_page_urls(review_url, product_id, 3)
+
+    assert [parse_qs(urlparse(url).query)["pageNumber"] for url in urls] == [["1"], ["2"], ["3"]]
+    assert all(f"/product-reviews/{product_id}/" in url and "sortBy=recent" in url for url in urls)
+
+
+def test_iter_review_pages_retries_and_skips_failing_pages(stub_api, monkeypatch):
+    monkeypatch.setattr(stub_api, "last_page", 4)
+    monkeypatch.setattr(stub_api, "failures", {1: 1, 3: -1})  # page 1 fails once, page 3 always
+    review_url, product_id = amazon_scraper.convert_to_review_url("https://www.amazon.in/dp/B08N5WRWNW")
+    reviews = list(amazon_scraper.iter_review_pages(review_url, product_id, max_reviews=50, concurrency=2))
+
+    pages = sorted({review.split(" review ")[0] for review in reviews})
+    assert pages == ["Page 1", "Page 2", "Page 4"]
+    assert len(reviews) == 9
+
+
+
+def test_iter_review_pages_gives_up_after_consecutive_failed_pages(stub_api, monkeypatch):
+    monkeypatch.setattr(stub_api, "failures", {page: -1 for page in range(2, 101)})  # API down after page 1
+    review_url, product_id = amazon_scraper.convert_to_review_url("https://www.amazon.in/dp/B08N5WRWNW")
+    reviews = list(amazon_scraper.iter_review_pages(review_url, product_id, max_reviews=50, concurrency=2))
+
+    assert {review.split(" review ")[0] for review in reviews} == {"Page 1"}
+    pages_requested = {parse_qs(urlparse(url).query)["pageNumber"][0] for url in stub_api.requests_seen}
+    assert len(pages_requested) <= amazon_scraper.MAX_FAILED_PAGES + 2
+
+def test_extract_reviews_from_html_parses_review_containers_only():
+    html = (
+        '<html><head><script>var s = "<div data-hook=\'x\'>";</script></head><body>'
+        '<div id="nav"><span>' + 'Navigation text that is long enough to look like a review. ' * 2 + '</span></div>'
+        + ''.join(
+            f'<div data-hook="review"><span data-hook="review-body"><span>Page 1 review {n}: '
+            f'{REVIEW.format(n=n)}</span></span><span>Verified Purchase</span></div>'
+            for n in (1, 2, 2, 3)
+        )
+        + '<div class="a-row review-text">Backup selector text that is only used when nothing else matches at all.</div>'
+        '</body></html>'
+    )
+
+    reviews = amazon_scraper._extract_reviews_from_html(html, max_reviews=10)
+
+    assert reviews == [f"Page 1 review {n}: {REVIEW.format(n=n)}" for n in (1, 2, 3)]
+
+
+def test_extract_reviews_from_html_falls_back_to_review_text_class():
+    html = '<div><p class="a-row review-text big">' + REVIEW.format(n=7) + '</p></div>'
+
+    assert amazon_scraper._extract_reviews_from_html(html, max_reviews=5) == [REVIEW.format(n=7)]
+
+
+def test_key_status_caches_failures_only_briefly(monkeypatch):
+    results = iter([(False, "Request timeout - API might be slow"), (True, "API key is working")])
+    calls = []
+    monkeypatch.setattr(amazon_scraper, "get_scraperapi_key", lambda: "test-key")
+    monkeypatch.setattr(amazon_scraper, "test_scraperapi_key", lambda: calls.append(1) or next(results))
+    monkeypatch.setattr(amazon_scraper, "KEY_FAILURE_TTL", 0.0)
+    amazon_scraper.clear_key_status_cache()
+
+    assert amazon_scraper.get_scraperapi_key_status()[0] is False
+    assert amazon_scraper.get_scraperapi_key_status()[0] is True   # failure not reused
+    assert amazon_scraper.get_scraperapi_key_status()[0] is True   # success cached
+    assert len(calls) == 2
+    amazon_scraper.clear_key_status_cache()
+
+
+@pytest.mark.parametrize("url, domain, product_id", [
+    ("https://www.amazon.in/Boat-Rockerz/dp/b08n5wrwnw/ref=sr_1_1", "amazon.in", "B08N5WRWNW"),
+    ("https://www.amazon.com/gp/product/B08N5WRWNW?th=1", "amazon.com", "B08N5WRWNW"),
+    ("https://www.amazon.de/product-reviews/B08N5WRWNW", "amazon.de", "B08N5WRWNW"),
+    ("https://www.amazon.co.uk/s?asin=B08N5WRWNW", "amazon.co.uk", "B08N5WRWNW"),
+])
+def test_convert_to_review_url_extracts_product_id(url, domain, product_id):
+    assert amazon_scraper.convert_to_review_url(url) == (
+        f"https://www.{domain}/dp/{product_id}#customerReviews", product_id)
@@ -0,0 +1,54 @@
+from app.aspect_extractor import ASPECT_CATEGORIES, extract_aspects, get_aspect_categories, get_aspect_category
+from app.keyword_matcher import KeywordMatcher
+
+
+def test_keyword_matcher_matches_substring_checks():
+    keywords = ["battery", "battery life", "life", "coverage expired", "expired", "pack", "packaging", "box"]
+    matcher = KeywordMatcher(keywords)
+    for text in ["battery life is short", "coverage expired!", "xbox packaging", "nothing here", ""]:
+        assert matcher.find(text) == {k for k in keywords if k in text}
+
+
+def test_extract_aspects_finds_domain_and_product_aspects():
+    aspects = extract_aspects("The headphone bass is great but the seller sent bad packaging.")
+    assert "audio quality" in aspects
+    assert "seller" in aspects
+    assert "bass" in aspects
+
+
+def test_tokenize_offsets_and_sentence_ids():
+    from app.tokenizer import tokenize
+
+    tokens = tokenize("Great BASS! The battery, sadly, died.")
+    assert tokens.words == "great bass! the battery, sadly, died.".split()
+    assert tokens.clean[1] == "bass"
+    assert [tokens.text[s:e] for s, e in zip(tokens.starts, tokens.ends)][1] == "BASS!"
+    assert list(tokens.sentence_ids) == [0, 0, 1, 1, 1, 1]
+
+
+def test_aspect_context_index_returns_sentence_and_offsets():
+    from app.aspect_extractor import analyze_aspect_sentiment_context, build_aspect_context_index
+
+    review = "Great sound. The battery dies fast! Seller was fine."
+    index = build_aspect_context_index(review, ["battery", "seller", "zzz"])
+    context = index.lookup("battery")
+    assert context.text == "The battery dies fast"
+    assert review[context.start:context.end] == context.text
+    assert index.lookup("zzz").text == review
+    assert analyze_aspect_sentiment_context(review, "seller") == "Seller was fine"
+
+
+def test_aspect_category_index_matches_substring_rule():
+    def brute_force(aspect):
+        for category, terms in ASPECT_CATEGORIES.items():
+            if any(term in aspect or aspect in term for term in terms):
+                return category
+        return 'Other'
+
+    terms = [term for category_terms in ASPECT_CATEGORIES.values() for term in category_terms]
+    aspects = terms + [term[1:-1] for term in terms] + ['', 'soundbar', 'wifi6', 'ery l', 'zipper', 'a\0b', 'pros']
+    for aspect in aspects:
+        assert get_aspect_category(aspect) == brute_force(aspect), aspect
+
+    categories = get_aspect_categories(['zipper', 'bass', 'delivery', 'sound'])
+    assert categories == {'Audio & Sound': ['bass', 'sound'], 'Delivery & Packaging': ['delivery'], 'Other': ['zipper']}
@@ -0,0 +1,70 @@
+import io
+import json
+
+from app.aspect_extractor import analyze_aspect_sentiment_context, extract_aspects
+from app.batch import run_batch
+from app.pipeline import RESULT_COLUMNS, BackgroundAnalysis, analyze_review
+from app.sentiment import analyze_sentiment
+
+
+def test_analyze_review_matches_inline_pipeline():
+    review = "The battery life is outstanding but the display is dull. Delivery was slow."
+
+    analysis = analyze_review(review, source="Test")
+
+    assert analysis.aspects == extract_aspects(review)
+    assert analysis.overall == analyze_sentiment(review)
+    for aspect, row in zip(analysis.aspects, analysis.rows):
+        context = analyze_aspect_sentiment_context(review, aspect)
+        expected = analyze_sentiment(context)
+        assert list(row) == RESULT_COLUMNS
+        assert (row["Aspect"], row["Context"], row["Sentiment"], row["Score"]) == \
+            (aspect, context, expected["label"], expected["score"])
+
+
+def test_sentence_scoring_keeps_aspect_rows_and_scores_sentences_once():
+    from app.sentiment import MLSentimentAnalyzer, combine_sentiments
+
+    review = "The battery life is outstanding. The display is dull! Battery charging is quick and sound is great."
+
+    context_mode = analyze_review(review, scoring="context")
+    sentence_mode = analyze_review(review, scoring="sentence")
+
+    assert sentence_mode.rows == context_mode.rows
+    sentences = [sentence.strip() for sentence in review.replace("!", ".").split(".") if sentence.strip()]
+    expected = combine_sentiments([analyze_sentiment(sentence) for sentence in sentences],
+                                  [len(sentence) for sentence in sentences])
+    assert sentence_mode.overall == expected
+    assert analyze_review("Battery is great", scoring="sentence").overall == analyze_sentiment("Battery is great")
+
+    analyzer = MLSentimentAnalyzer("rule_based")
+    strong = analyzer.analyze_sentiment("excellent, amazing, perfect")
+    assert combine_sentiments([strong, dict(strong, label="NEGATIVE")])["label"] == "NEUTRAL"
+
+
+def test_background_analysis_fills_results_in_order():
+    reviews = ["The battery life is outstanding.", "Camera quality is poor."]
+
+    job = BackgroundAnalysis(reviews, source_prefix="Bulk #")
+
+    assert job.wait(timeout=60)
+    assert job.error is None and job.completed == 2
+    assert [result.rows for result in job.results] == \
+        [analyze_review(review, source=f"Bulk #{i}").rows for i, review in enumerate(reviews, 1)]
+
+
+def test_run_batch_streams_jsonl_and_text(tmp_path):
+    text_file = tmp_path / "reviews.txt"
+    text_file.write_text("The battery life is outstanding.\n\nCamera quality is poor.\n")
+    jsonl_file = tmp_path / "reviews.jsonl"
+    jsonl_file.write_text(json.dumps({"id": "r1", "body": "Delivery was late and packaging damaged."}) + "\n")
+
+    output = io.StringIO()
+    stats = run_batch([str(text_file), str(jsonl_file)], output, output_format="jsonl",
+                      source_field="id", chunk_size=1, log=io.StringIO())
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert stats["reviews"] == 3
+    assert stats["rows"] == len(records) > 0
+    assert {record["Source"] for record in records} == {"reviews.txt:1", "reviews.txt:3", "r1"}
+    assert {"Confidence_Category", "Aspect_Category", "Context_Length"} <= set(records[0])
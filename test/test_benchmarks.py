@@ -0,0 +1,37 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from corpus import generate_reviews  # noqa: E402
+import suite  # noqa: E402
+from suite import previous_run, run_suite  # noqa: E402
+
+
+def test_corpus_is_reproducible():
+    assert generate_reviews(50, seed=3) == generate_reviews(50, seed=3) != generate_reviews(50, seed=4)
+
+
+def test_suite_times_every_stage():
+    run = run_suite(reviews=20, repeat=1)
+
+    names = set(run['results'])
+    assert {'preprocess_text_for_ml', 'extract_aspects', 'analyze_aspect_sentiment_context',
+            'sentiment[rule_based]', 'extract_reviews_from_html[product_page]', 'create_ml_export_data'} <= names
+    assert all(result['min_s'] > 0 for result in run['results'].values())
+    assert previous_run([dict(run, commit='older'), dict(run, reviews=99)], run)['commit'] == 'older'
+
+
+def test_suite_times_pipeline_without_sentiment_cache(monkeypatch):
+    import sentiment
+
+    caches = []
+    time_benchmark = suite.time_benchmark
+    monkeypatch.setattr(suite, "time_benchmark",
+                        lambda benchmark, repeat: caches.append(sentiment.get_analyzer().cache)
+                        or time_benchmark(benchmark, repeat))
+    before = sentiment.analyzer
+    run_suite(reviews=5, repeat=1, pattern='analyze_review')
+
+    assert caches == [None]
+    assert sentiment.analyzer is before
@@ -0,0 +1,13 @@
+from app.amazon_scraper import get_sample_reviews
+from app.parallel import ParallelAnalyzer
+from app.pipeline import analyze_review
+
+
+def test_parallel_analyzer_keeps_input_order():
+    reviews = [(f"Review #{i}", review) for i, review in enumerate(get_sample_reviews() * 3, 1)]
+    expected = [analyze_review(review, source=source).rows for source, review in reviews]
+
+    with ParallelAnalyzer(workers=2, chunk_size=4) as engine:
+        results = list(engine.imap(reviews))
+
+    assert results == expected
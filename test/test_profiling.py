@@ -0,0 +1,40 @@
+import pytest
+
+from app import profiling
+from app.aspect_extractor import extract_aspects
+from app.profiling import Profiler, StageStats, profiled
+
+
+def test_stage_stats_percentiles_and_prometheus_text():
+    stats = StageStats("demo")
+    for millis in range(1, 101):
+        stats.record(millis / 1000, nbytes=10)
+
+    assert stats.count == 100 and stats.bytes == 1000
+    for q, expected in ((0.5, 0.050), (0.95, 0.095), (0.99, 0.099)):
+        assert expected <= stats.quantile(q) <= expected * 1.2
+    assert stats.cumulative(0.01) <= 10 <= stats.cumulative(0.025)
+
+    profiler = Profiler()
+    profiler.stages["demo"] = stats
+    text = profiler.prometheus_text()
+    assert 'pipeline_stage_seconds_count{stage="demo"} 100' in text
+    assert 'pipeline_stage_bytes_total{stage="demo"} 1000' in text
+    assert 'pipeline_stage_latency_quantile_seconds{stage="demo",quantile="0.99"}' in text
+
+
+def test_profiled_records_calls_bytes_and_errors():
+    profiling.reset_stats()
+
+    @profiled("failing")
+    def failing(text):
+        raise ValueError(text)
+
+    extract_aspects("The battery life is great")
+    with pytest.raises(ValueError):
+        failing("boom")
+
+    stats = {row["stage"]: row for row in profiling.get_stage_stats()}
+    assert stats["extract_aspects"]["calls"] == 1
+    assert stats["extract_aspects"]["bytes"] == len("The battery life is great")
+    assert stats["failing"]["errors"] == 1
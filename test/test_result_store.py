@@ -0,0 +1,73 @@
+import pytest
+
+from app.amazon_scraper import get_sample_reviews
+from app.pipeline import analyze_review
+from app.result_store import ResultStore
+from app.utils import calculate_ml_performance_metrics, create_ml_summary_stats
+
+
+def _rows():
+    rows = []
+    for i, review in enumerate(get_sample_reviews()):
+        rows.extend(analyze_review(review, source=f"Amazon Review #{i % 3}").rows)
+    return rows
+
+
+def test_result_store_matches_list_of_dicts():
+    rows = _rows()
+    store = ResultStore(rows, chunk_rows=7)
+
+    assert len(store) == len(rows)
+    assert list(store) == rows
+    assert store.unique_count("Review") == len({row["Review"] for row in rows})
+    assert create_ml_summary_stats(store) == create_ml_summary_stats(rows)
+    assert calculate_ml_performance_metrics(store) == calculate_ml_performance_metrics(rows)
+
+
+def test_result_store_parquet_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    rows = _rows()
+    store = ResultStore(rows, chunk_rows=5)
+
+    path = tmp_path / "results.parquet"
+    store.to_parquet(str(path))
+    loaded = ResultStore.from_parquet(str(path))
+
+    assert list(loaded) == rows
+    for column in ("Sentiment", "Aspect"):
+        assert loaded.to_frame()[column].value_counts().equals(store.to_frame()[column].value_counts())
+    loaded.append(rows[0])
+    assert len(loaded) == len(rows) + 1
+
+
+
+def test_result_store_parquet_keeps_only_used_categories(tmp_path):
+    pytest.importorskip("pyarrow")
+    frame = ResultStore(_rows()).to_frame()
+    positive = frame[frame["Sentiment"] == "POSITIVE"]  # categoricals keep the filtered-out values
+
+    path = tmp_path / "positive.parquet"
+    positive.to_parquet(str(path))
+    loaded = ResultStore.from_parquet(str(path), chunk_rows=4).to_frame()
+
+    for column in ("Sentiment", "Aspect", "Review"):
+        expected = positive[column].astype(str).value_counts()
+        counts = loaded[column].value_counts()
+        assert (counts > 0).all()
+        assert counts.sort_index().to_dict() == expected.sort_index().to_dict()
+
+def test_aspect_result_records_behave_like_row_dicts():
+    import pickle
+
+    from app.pipeline import AspectResult
+    from app.utils import create_ml_export_data
+
+    rows = _rows()
+    dicts = [dict(row) for row in rows]
+
+    assert all(type(row) is AspectResult and not hasattr(row, '__dict__') for row in rows)
+    assert rows == dicts and pickle.loads(pickle.dumps(rows)) == dicts
+    assert rows[0]["Aspect"] == rows[0].Aspect and rows[0].get("Missing") is None
+    assert rows[0].Review is rows[1].Review
+    assert create_ml_export_data(rows, timestamp="t").equals(create_ml_export_data(dicts, timestamp="t"))
+    assert create_ml_summary_stats(rows) == create_ml_summary_stats(dicts)
@@ -0,0 +1,51 @@
+import numpy as np
+
+from app import rule_engine
+from app.rule_engine import LexiconScorer
+from app.sentiment import NEGATIVE_WORDS, POSITIVE_WORDS
+
+
+def test_counts_match_substring_rule():
+    texts = [
+        "GREAT sound, fast delivery, great price",
+        "Slow, overpriced and broken. Unlike the last one.",
+        "",
+        "slowaste",                     # overlapping words both count
+        "Très bon — good\x00bad",       # non-ASCII text, separator byte inside a text
+        "ok",
+    ]
+    scorer = LexiconScorer(POSITIVE_WORDS, NEGATIVE_WORDS)
+    expected_pos = [sum(w in t.lower() for w in POSITIVE_WORDS) for t in texts]
+    expected_neg = [sum(w in t.lower() for w in NEGATIVE_WORDS) for t in texts]
+
+    pos, neg = scorer.counts(texts)
+    assert pos.tolist() == expected_pos
+    assert neg.tolist() == expected_neg
+    assert [scorer.text_counts(text) for text in texts] == list(zip(expected_pos, expected_neg))
+
+    matrix = scorer.term_matrix(texts)
+    assert matrix.shape == (len(texts), len(scorer.vocabulary))
+    assert np.diff(matrix.indptr).tolist() == [p + n for p, n in zip(expected_pos, expected_neg)]
+
+
+def test_numpy_fallback_matches(monkeypatch):
+    texts = ["good but slow", "", "awful, bad, poor", "fine"]
+    scorer = LexiconScorer(POSITIVE_WORDS, NEGATIVE_WORDS)
+    monkeypatch.setattr(rule_engine, "SCIPY_AVAILABLE", False)
+
+    pos, neg = scorer.counts(texts)
+    assert pos.tolist() == [1, 0, 0, 0]
+    assert neg.tolist() == [1, 0, 3, 0]
+
+
+def test_single_and_batch_scores_agree_on_both_scan_paths():
+    from app.sentiment import MLSentimentAnalyzer
+
+    analyzer = MLSentimentAnalyzer("rule_based")
+    texts = ["Great sound but slow delivery.", "Awful, broken and overpriced!", "It is fine.",
+             "Love it, best purchase, highly recommend", ""] * 400
+    assert sum(map(len, texts)) > rule_engine.VECTORIZED_MIN_CHARS  # vectorized scan
+
+    singles = [analyzer.analyze_sentiment(text) for text in texts[:5]]
+    assert analyzer.analyze_sentiment_batch(texts) == singles * 400
+    assert analyzer.analyze_sentiment_batch(texts[:5]) == singles  # per-text scan
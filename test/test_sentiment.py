@@ -3,3 +3,43 @@ from app.sentiment import analyze_sentiment
 def test_analyze_sentiment():
     result = analyze_sentiment("Battery life is great.")
     assert result["label"] in ["POSITIVE", "NEGATIVE"]
+
+def test_analyze_sentiment_batch_matches_single_calls():
+    from app.sentiment import MLSentimentAnalyzer
+
+    texts = [
+        "Battery life is great.",
+        "Terrible quality, waste of money. Very disappointed.",
+        "It's okay, nothing special but does the job.",
+        "",
+        "ok",
+    ]
+    for model_type in ["vader", "rule_based"]:
+        analyzer = MLSentimentAnalyzer(model_type)
+        assert analyzer.analyze_sentiment_batch(texts) == [analyzer.analyze_sentiment(t) for t in texts]
+
+
+def test_sentiment_cache_hits_and_disk_tier(tmp_path):
+    from app.sentiment import MLSentimentAnalyzer, SentimentCache
+
+    path = str(tmp_path / "sentiment.db")
+    analyzer = MLSentimentAnalyzer("rule_based", cache=SentimentCache(maxsize=2, path=path))
+    first = analyzer.analyze_sentiment("Great sound, fast delivery")
+    assert analyzer.analyze_sentiment("Great  sound,\nfast delivery") == first
+    assert analyzer.cache.stats()["hits"] == 1
+
+    reloaded = MLSentimentAnalyzer("rule_based", cache=SentimentCache(maxsize=2, path=path))
+    assert reloaded.analyze_sentiment("Great sound, fast delivery") == first
+    assert reloaded.cache.stats()["disk_hits"] == 1
+
+
+def test_import_does_not_load_backends():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, app.sentiment as s; s.get_model_info(); "
+        "print(any(m in sys.modules for m in ('textblob', 'vaderSentiment', 'transformers')))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "False"
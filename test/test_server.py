@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+from app.sentiment import MLSentimentAnalyzer
+from app.server import start_server
+
+
+async def _post(port, path, payload):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    body = json.dumps(payload).encode()
+    writer.write(f"POST {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+    response = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    head, _, data = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), data
+
+
+def test_server_batches_concurrent_requests_and_rejects_overload():
+    texts = ["Battery life is great.", "Terrible quality, waste of money.", "It's okay, nothing special."] * 10
+    expected = MLSentimentAnalyzer("rule_based").analyze_sentiment_batch(texts)
+
+    async def scenario():
+        server, batcher = await start_server(port=0, model_type="rule_based", max_wait_ms=50, max_queue=40)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            responses = await asyncio.gather(*(_post(port, "/sentiment", {"text": text}) for text in texts))
+            analyzed, data = await _post(port, "/analyze", {"review": "The battery is great but delivery was slow."})
+            batcher.max_queue = 2  # review + 2 aspect contexts no longer fit
+            overloaded, _ = await _post(port, "/analyze", {"review": "The battery is great but delivery was slow."})
+            return responses, overloaded, analyzed, json.loads(data), batcher
+        finally:
+            server.close()
+            await server.wait_closed()
+            await batcher.stop()
+
+    responses, overloaded, analyzed, analysis, batcher = asyncio.run(scenario())
+
+    assert [status for status, _ in responses] == [200] * len(texts)
+    assert [json.loads(data) for _, data in responses] == expected
+    assert batcher.batches.count < len(texts)
+    assert overloaded == 503 and batcher.rejected_total > 0
+    assert analyzed == 200 and {row["Aspect"] for row in analysis["rows"]} == set(analysis["aspects"]) != set()
+
+
+def test_server_rejects_invalid_content_length():
+    async def send(port, content_length):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(f"POST /sentiment HTTP/1.1\r\nContent-Length: {content_length}\r\n\r\n".encode())
+        response = await reader.read()
+        writer.close()
+        await writer.wait_closed()
+        return int(response.split()[1])
+
+    async def scenario():
+        server, batcher = await start_server(port=0, model_type="rule_based")
+        port = server.sockets[0].getsockname()[1]
+        try:
+            statuses = [await send(port, value) for value in ("abc", "-5", "1.5")]
+            healthy, _ = await _post(port, "/sentiment", {"text": "still serving"})
+            return statuses, healthy
+        finally:
+            server.close()
+            await server.wait_closed()
+            await batcher.stop()
+
+    statuses, healthy = asyncio.run(scenario())
+
+    assert statuses == [400, 400, 400]
+    assert healthy == 200
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from app import streaming
+from app.amazon_scraper import get_sample_reviews
+
+
+def test_run_stream_resumes_after_interruption(tmp_path, monkeypatch):
+    reviews = get_sample_reviews() + ["", "ok"]
+    source = tmp_path / "reviews.txt"
+    source.write_text("\n".join(reviews) + "\n")
+    expected_path = tmp_path / "expected.csv"
+    streaming.run_stream(str(source), str(expected_path), include_metadata=False, chunk_size=3)
+
+    output = tmp_path / "out.csv"
+    calls = {"count": 0}
+    analyze = streaming.analyze_sentiment_batch
+
+    def failing_analyze(texts):
+        calls["count"] += 1
+        if calls["count"] > 3:
+            raise KeyboardInterrupt
+        return analyze(texts)
+
+    monkeypatch.setattr(streaming, "analyze_sentiment_batch", failing_analyze)
+    with pytest.raises(KeyboardInterrupt):
+        streaming.run_stream(str(source), str(output), include_metadata=False, chunk_size=3, score_batch=2)
+    monkeypatch.setattr(streaming, "analyze_sentiment_batch", analyze)
+
+    checkpoint = streaming.load_checkpoint(f"{output}.checkpoint")
+    assert 0 < checkpoint["records"] < len(reviews) and not checkpoint["done"]
+
+    stats = streaming.run_stream(str(source), str(output), include_metadata=False, chunk_size=3, resume=True)
+
+    assert output.read_text() == expected_path.read_text()
+    assert stats["reviews"] == len(reviews) - checkpoint["records"]
+    assert streaming.load_checkpoint(f"{output}.checkpoint")["done"]
+
+
+
+@pytest.mark.parametrize("damage", ["missing", "shorter"])
+def test_run_stream_restarts_when_checkpointed_output_is_lost(tmp_path, damage):
+    source = tmp_path / "reviews.txt"
+    source.write_text("\n".join(get_sample_reviews()) + "\n")
+    output = tmp_path / "out.csv"
+    streaming.run_stream(str(source), str(output), include_metadata=False, chunk_size=3)
+    expected = output.read_text()
+
+    checkpoint_path = f"{output}.checkpoint"
+    checkpoint = streaming.load_checkpoint(checkpoint_path)
+    checkpoint["done"] = False
+    streaming.save_checkpoint(checkpoint_path, checkpoint)
+    if damage == "missing":
+        output.unlink()
+    else:
+        output.write_text(expected[:len(expected) // 2])
+
+    stats = streaming.run_stream(str(source), str(output), include_metadata=False, chunk_size=3, resume=True)
+
+    assert output.read_text() == expected
+    assert "\x00" not in output.read_text()
+    assert stats["reviews"] == len(get_sample_reviews())
+
+def test_stream_rows_match_batch_pipeline(tmp_path):
+    from app.pipeline import analyze_review
+
+    reviews = get_sample_reviews()
+    source = tmp_path / "reviews.txt"
+    source.write_text("\n".join(reviews) + "\n")
+    output = tmp_path / "out.jsonl"
+    streaming.run_stream(str(source), str(output), include_metadata=False, score_batch=3)
+
+    streamed = [json.loads(line) for line in output.read_text().splitlines()]
+    expected = [dict(row) for n, review in enumerate(reviews, 1)
+                for row in analyze_review(review, source=f"reviews.txt:{n}").rows]
+    assert [(r["Aspect"], r["Sentiment"]) for r in streamed] == [(r["Aspect"], r["Sentiment"]) for r in expected]
+    assert [r["Score"] for r in streamed] == pytest.approx([r["Score"] for r in expected])
+
+
+def test_read_stage_decodes_strictly(tmp_path):
+    source = tmp_path / "reviews.txt"
+    source.write_bytes(b"fine review\n\xff broken\n")
+
+    with pytest.raises(UnicodeDecodeError):
+        list(streaming.read_stage(str(source), "txt"))
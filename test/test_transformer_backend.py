@@ -0,0 +1,21 @@
+import numpy as np
+
+from app.transformer_backend import length_buckets, softmax
+
+
+def test_length_buckets_cover_every_text_and_respect_limits():
+    lengths = [120, 5, 64, 7, 250, 9, 33, 6, 128, 12]
+
+    batches = list(length_buckets(lengths, batch_size=3, max_batch_tokens=300))
+
+    assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+    for batch in batches:
+        assert len(batch) <= 3
+        assert len(batch) == 1 or max(lengths[i] for i in batch) * len(batch) <= 300
+    # shortest texts are batched together
+    assert batches[0] == [1, 7, 3]
+
+
+def test_softmax_rows_sum_to_one():
+    probabilities = softmax(np.array([[0.0, 0.0], [1000.0, 0.0]]))
+    assert probabilities.tolist() == [[0.5, 0.5], [1.0, 0.0]]
@@ -0,0 +1,91 @@
+import io
+
+import pandas as pd
+
+from app.utils import (calculate_ml_performance_metrics, create_ml_export_data, create_ml_summary_stats,
+                       preprocess_text_for_ml, write_ml_export)
+
+ROWS = [
+    {"Source": "A", "Review": "r1", "Aspect": "battery life", "Context": "ctx one", "Sentiment": "POSITIVE",
+     "Score": 0.9, "Confidence": "high", "ML_Model": "VADER (ML)"},
+    {"Source": "A", "Review": "r1", "Aspect": "zipper", "Context": "ctx", "Sentiment": "NEGATIVE",
+     "Score": 0.7, "Confidence": "medium", "ML_Model": "VADER (ML)"},
+    {"Source": "B", "Review": "r2", "Aspect": "delivery", "Context": "c", "Sentiment": "NEUTRAL",
+     "Score": 0.6, "Confidence": "low", "ML_Model": "VADER (ML)"},
+]
+
+
+def test_preprocess_text_for_ml_expands_contractions_and_punctuation():
+    text = "  I Can't   believe it!!! Don't buy.... WON'T work??  "
+    assert preprocess_text_for_ml(text) == "I cannot believe it! do not buy... will not work?"
+
+
+def test_export_data_vectorized_and_streamed(tmp_path):
+    rows = ROWS
+
+    export_df = create_ml_export_data(rows, timestamp="2024-01-01 00:00:00")
+    assert export_df["Confidence_Category"].tolist() == ["High", "Medium", "Low"]
+    assert export_df["Aspect_Category"].tolist() == ["Performance", "Other", "Delivery & Packaging"]
+    assert export_df["Context_Length"].tolist() == [7, 3, 1]
+
+    path = tmp_path / "export.csv"
+    assert write_ml_export(rows, str(path), chunk_rows=2) == 3
+    streamed = pd.read_csv(path)
+    assert streamed.drop(columns="Analysis_Timestamp").equals(
+        pd.read_csv(io.StringIO(export_df.to_csv(index=False))).drop(columns="Analysis_Timestamp")
+    )
+
+
+def test_export_data_leaves_dataframe_input_untouched():
+    frame = pd.DataFrame(ROWS)
+
+    export_df = create_ml_export_data(frame, timestamp="2024-01-01 00:00:00")
+
+    assert list(frame.columns) == list(ROWS[0])
+    assert "Aspect_Category" in export_df.columns
+
+
+def test_summary_stats_accepts_dataframe():
+    assert create_ml_summary_stats(pd.DataFrame(ROWS)) == create_ml_summary_stats(ROWS)
+    assert create_ml_summary_stats(pd.DataFrame()) == {}
+
+
+def test_performance_metrics_accepts_dataframe():
+    assert calculate_ml_performance_metrics(pd.DataFrame(ROWS)) == calculate_ml_performance_metrics(ROWS)
+    assert calculate_ml_performance_metrics(pd.DataFrame()) == {}
+
+
+def test_remove_artifacts_byline_cuts_before_lazy_color_size_match():
+    from app.patterns import remove_artifacts
+
+    # The sequential substitutions drop everything from "by my mom ... on" onwards
+    # before "Color:.*?Size:" runs; a lazy match must not reach past it
+    text = "Color: Red bought by my mom great sound Size: works on weekends"
+    assert remove_artifacts(text) == " Red bought "
+
+
+def test_remove_artifacts_matches_sequential_substitutions_on_glued_fragments():
+    import random
+    import re
+
+    from app.patterns import REVIEW_ARTIFACTS, remove_artifacts
+
+    def sequential(text):
+        for artifact in REVIEW_ARTIFACTS:
+            text = re.sub(artifact, '', text, flags=re.IGNORECASE)
+        return text
+
+    fragments = ['Read more', 'Was this review helpful?', '12 people found this helpful', 'Verified Purchase',
+                 'Top 500 Reviewer', 'By John on 3 May', 'by', ' on ', 'Color: Red', 'Size:M', 'Style: Classic',
+                 'Pattern Name:Single', 'Color:', 'Size:', 'See all photos', 'Helpful', 'Report', 'Report abuse',
+                 'Show', ' more', ' less', 'Show more', '…', '…Read more', 'great sound', 'the bass is deep', ' ']
+    assert (remove_artifacts("Really nice sound overall, Size:MPattern Name:Single and the bass is deep")
+            == "Really nice sound overall,  and the bass is deep")
+    assert remove_artifacts("ShowSee all photos less") == ""
+
+    rng = random.Random(3)
+    for _ in range(5000):
+        parts = [rng.choice(fragments) for _ in range(rng.randint(1, 8))]
+        text = ''.join(parts) if rng.random() < 0.5 else ' '.join(parts)
+        text = re.sub(r'\s+', ' ', text).strip()
+        assert remove_artifacts(text) == sequential(text), text